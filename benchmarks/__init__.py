@@ -0,0 +1,5 @@
+"""
+로컬 데이터베이스와 공공데이터 api를 대신하는 구현 위에서, 레포지토리와 수집 파이프라인, 라우트의 성능을 재는 벤치마크입니다.
+
+    python -m benchmarks run --scale small
+"""
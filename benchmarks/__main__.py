@@ -0,0 +1,119 @@
+import argparse
+import sys
+
+from benchmarks.check import BaselinePath, compare, failed, loadBaseline, render
+from benchmarks.generators import Scales
+from benchmarks.load import DefaultUsers, Journeys, loadTable, loadTest, resultPath, serve
+from benchmarks.openapi import record
+from benchmarks.runner import combine, run, save, table
+from benchmarks.scenarios import Scenarios
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="seoul_opendata 벤치마크")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="시나리오를 측정하고 결과를 JSON으로 저장합니다.")
+    runner.add_argument("--scale", choices=list(Scales), default="small", help="합성 데이터 크기")
+    runner.add_argument("--only", nargs="*", default=[], help="이름에 주어진 문자열이 포함된 시나리오만 측정합니다.")
+    runner.add_argument("--seed", type=int, default=0, help="난수 시드")
+    runner.add_argument("--latency-ms", type=float, default=0.0, help="데이터베이스 호출마다 기다릴 시간(ms)")
+    runner.add_argument("--duration", type=float, default=1.0, help="시나리오마다 반복할 최소 시간(초)")
+    runner.add_argument("--min-iterations", type=int, default=5, help="시나리오마다 반복할 최소 횟수")
+    runner.add_argument("--rounds", type=int, default=3, help="시간을 나눠 잴 라운드 수")
+    runner.add_argument("--out", default=None, help="결과를 저장할 경로. 기본 값은 benchmarks/results/{크기}-{시각}.json")
+
+    checker = commands.add_parser("check", help="기준 결과와 같은 조건으로 측정하고, 느려지거나 데이터베이스 호출이 늘어난 시나리오가 있으면 실패합니다.")
+    checker.add_argument("--baseline", default=BaselinePath, help="기준 결과 파일")
+    checker.add_argument("--tolerance", type=float, default=0.25, help="허용할 p50 증가율. 측정 잡음만큼 더 허용합니다.")
+    checker.add_argument("--floor-ms", type=float, default=0.05, help="이보다 작은 p50 증가는 무시합니다(ms).")
+    checker.add_argument("--repeats", type=int, default=3, help="측정을 반복할 횟수. 시나리오마다 p50의 중앙값을 비교합니다.")
+    checker.add_argument("--update", action="store_true", help="비교하지 않고, 모든 시나리오를 small 크기로 측정해 기준 결과를 새로 씁니다.")
+    checker.add_argument("--out", default=None, help="현재 결과도 저장할 경로")
+
+    loader = commands.add_parser("load", help="동시 사용자 수를 늘려 가며 앱에 부하를 보내고, 처리량과 지연 시간, 포화 지점을 잽니다.")
+    loader.add_argument("--scale", choices=list(Scales), default="small", help="합성 데이터 크기")
+    loader.add_argument("--only", nargs="*", choices=list(Journeys), default=[], help="실행할 부하 시나리오")
+    loader.add_argument("--seed", type=int, default=0, help="난수 시드")
+    loader.add_argument("--latency-ms", type=float, default=0.0, help="데이터베이스 호출마다 기다릴 시간(ms)")
+    loader.add_argument("--users", default=",".join(map(str, DefaultUsers)), help="단계별 동시 사용자 수. 쉼표로 구분합니다.")
+    loader.add_argument("--step-seconds", type=float, default=5.0, help="단계마다 부하를 보낼 시간(초)")
+    loader.add_argument("--slo-ms", type=float, default=1000.0, help="건강한 단계의 p99 상한(ms)")
+    loader.add_argument("--max-error-rate", type=float, default=0.01, help="건강한 단계의 오류율 상한")
+    loader.add_argument("--transport", choices=("asgi", "http"), default="asgi", help="asgi는 프로세스 안에서, http는 localhost의 서버로 요청합니다.")
+    loader.add_argument("--url", default=None, help="http일 때 요청할 서버 주소. 없으면 `serve`로 서버를 띄웁니다.")
+    loader.add_argument("--out", default=None, help="결과를 저장할 경로. 기본 값은 benchmarks/results/load-{크기}-{시각}.json")
+
+    server = commands.add_parser("serve", help="로컬 데이터베이스와 고정 응답을 사용하는 앱을 띄웁니다.")
+    server.add_argument("--scale", choices=list(Scales), default="small", help="합성 데이터 크기")
+    server.add_argument("--seed", type=int, default=0, help="난수 시드")
+    server.add_argument("--latency-ms", type=float, default=0.0, help="데이터베이스 호출마다 기다릴 시간(ms)")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8000)
+
+    commands.add_parser("list", help="시나리오 목록을 출력합니다.")
+    commands.add_parser("record", help="실제 공공데이터 api 응답을 고정 응답으로 저장합니다. SEOUL_OPENDATA_KEY가 필요합니다.")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        print("\n".join(Scenarios))
+    elif args.command == "record":
+        print(f"Recorded {', '.join(record())}")
+    elif args.command == "check":
+        return check(args.baseline, args.tolerance, args.floor_ms, args.repeats, args.update, args.out)
+    elif args.command == "load":
+        report = loadTest(
+            args.only or list(Journeys), args.scale, Scales[args.scale],
+            seed=args.seed, latency=args.latency_ms / 1000, users=[int(count) for count in args.users.split(",")],
+            duration=args.step_seconds, sloMs=args.slo_ms, maxErrorRate=args.max_error_rate, transport=args.transport, url=args.url
+        )
+        print(loadTable(report))
+        print(f"Saved to {save(report, args.out or resultPath(report))}", file=sys.stderr)
+    elif args.command == "serve":
+        serve(Scales[args.scale], args.seed, args.latency_ms / 1000, args.host, args.port)
+    else:
+        scenarios = [scenario for name, scenario in Scenarios.items() if not args.only or any(part in name for part in args.only)]
+        report = run(
+            scenarios, args.scale, Scales[args.scale],
+            seed=args.seed, latency=args.latency_ms / 1000, duration=args.duration, minIterations=args.min_iterations, rounds=args.rounds
+        )
+        print(table(report))
+        print(f"Saved to {save(report, args.out)}", file=sys.stderr)
+    return 0
+
+
+def check(path: str, tolerance: float, floorMs: float, repeats: int, update: bool, out: str | None) -> int:
+    """
+    기준 결과와 같은 시나리오, 크기, 시드, 반복 횟수로 `repeats`번 측정해 합친 결과를 비교합니다. 회귀가 있으면 1을 반환합니다.
+    기준 결과도 같은 방법으로 기록합니다.
+    """
+    if update:
+        report = combine([run(Scenarios.values(), "small", Scales["small"]) for _ in range(max(1, repeats))])
+        print(table(report))
+        print(f"Saved baseline to {save(report, path)}", file=sys.stderr)
+        return 0
+
+    baseline = loadBaseline(path)
+    if baseline is None:
+        print(f"Baseline {path} does not exist. Create it with `python -m benchmarks check --update`.", file=sys.stderr)
+        return 2
+    meta = baseline["meta"]
+    missing = [name for name in baseline["results"] if name not in Scenarios]
+    report = combine([
+        run(
+            [Scenarios[name] for name in baseline["results"] if name in Scenarios], meta["scale"], Scales[meta["scale"]],
+            seed=meta["seed"], latency=meta["latencyMs"] / 1000, duration=meta["duration"], minIterations=meta["minIterations"], rounds=meta["rounds"]
+        )
+        for _ in range(max(1, repeats))
+    ])
+    if out is not None:
+        save(report, out)
+    differences = compare(baseline, report, tolerance, floorMs)
+    print(render(differences, baseline, report))
+    if missing:
+        print(f"Scenarios removed since the baseline: {', '.join(missing)}", file=sys.stderr)
+    return 1 if failed(differences) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import json
+import os
+from typing import Any, Final, Literal, NamedTuple
+
+BaselinePath: Final[str] = os.path.join(os.path.dirname(__file__), "baseline.json")
+Status = Literal["fail", "ok", "better", "new", "missing"]
+
+
+class Difference(NamedTuple):
+    """시나리오 하나의 지표를 기준 결과와 비교한 결과입니다."""
+    scenario: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    limit: float | None         # 이 값을 넘으면 실패합니다.
+    status: Status
+
+
+def loadBaseline(path: str = BaselinePath) -> dict[str, Any] | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.25, floorMs: float = 0.05) -> list[Difference]:
+    """
+    현재 결과를 기준 결과와 비교합니다.
+    데이터베이스 호출 수는 결정적인 값이므로 조금이라도 늘면 실패합니다.
+    p50은 두 결과의 보정 작업 시간 비율로 머신 사이의 속도 차이를 보정한 뒤,
+    `tolerance`에 두 결과 중 큰 잡음(라운드와 반복 측정 사이의 차이)과 큰 보정 잡음을 더한 비율보다 느려지고,
+    그 차이가 `floorMs`보다 크면 실패합니다.
+
+    Args:
+        baseline (dict[str, Any]): 기준 결과
+        current (dict[str, Any]): 현재 결과
+        tolerance (float, optional): 허용할 p50 증가율
+        floorMs (float, optional): 이보다 작은 p50 증가는 잡음으로 보고 무시합니다(ms).
+
+    Returns:
+        list[Difference]: 시나리오와 지표별 비교 결과
+    """
+    speed: float = current["meta"]["calibrationMs"] / baseline["meta"]["calibrationMs"]
+    calibrationNoise: float = max(baseline["meta"].get("calibrationSpread", 0.0), current["meta"].get("calibrationSpread", 0.0))
+    differences: list[Difference] = []
+    for name, base in baseline["results"].items():
+        result: dict[str, Any] | None = current["results"].get(name)
+        if result is None:
+            differences.append(Difference(name, "-", None, None, None, "missing"))
+            continue
+
+        calls: Status = "fail" if result["dbCalls"] > base["dbCalls"] else "better" if result["dbCalls"] < base["dbCalls"] else "ok"
+        differences.append(Difference(name, "dbCalls", base["dbCalls"], result["dbCalls"], base["dbCalls"], calls))
+
+        expected: float = base["p50Ms"] * speed
+        margin: float = tolerance + max(base["noise"], result["noise"]) + calibrationNoise
+        limit: float = max(expected * (1 + margin), expected + floorMs)
+        latency: Status = "fail" if result["p50Ms"] > limit else "better" if result["p50Ms"] * (1 + margin) < expected else "ok"
+        differences.append(Difference(name, "p50Ms", round(expected, 3), result["p50Ms"], round(limit, 3), latency))
+    for name in current["results"].keys() - baseline["results"].keys():
+        differences.append(Difference(name, "-", None, None, None, "new"))
+    return differences
+
+
+def failed(differences: list[Difference]) -> list[Difference]:
+    return [difference for difference in differences if difference.status in ("fail", "missing")]
+
+
+def render(differences: list[Difference], baseline: dict[str, Any], current: dict[str, Any]) -> str:
+    """비교 결과를 실패한 항목부터 표로 보여줍니다."""
+    def number(value: float | None) -> str:
+        return "-" if value is None else f"{value:.3f}"
+
+    def change(difference: Difference) -> str:
+        if not difference.baseline or difference.current is None:
+            return "-"
+        return f"{(difference.current / difference.baseline - 1) * 100:+.1f}%"
+
+    order: dict[Status, int] = {"fail": 0, "missing": 1, "better": 2, "new": 3, "ok": 4}
+    speed: float = current["meta"]["calibrationMs"] / baseline["meta"]["calibrationMs"]
+    lines: list[str] = [
+        f"Baseline {baseline['meta'].get('revision')} ({baseline['meta']['createdAt']}), "
+        f"{baseline['meta']['scale']} scale. Machine speed factor {speed:.2f} applied to baseline latencies.",
+        f"{'status':<8} {'scenario':<52} {'metric':<8} {'baseline':>10} {'current':>10} {'limit':>10} {'change':>9}"
+    ]
+    for difference in sorted(differences, key=lambda difference: (order[difference.status], difference.scenario, difference.metric)):
+        lines.append(
+            f"{difference.status.upper():<8} {difference.scenario:<52} {difference.metric:<8} {number(difference.baseline):>10} "
+            f"{number(difference.current):>10} {number(difference.limit):>10} {change(difference):>9}"
+        )
+    failures: list[Difference] = failed(differences)
+    lines.append(f"{len(failures)} regression(s)." if failures else "No regressions.")
+    return "\n".join(lines)
@@ -0,0 +1,232 @@
+from datetime import date, datetime, timedelta
+from random import Random
+from typing import Any, Callable, Final, NamedTuple
+from uuid import UUID
+
+from seoul_opendata.models import ChildSchool, Gender, Location, ParentUser
+from seoul_opendata.models.establish_type import EstablishType
+from seoul_opendata.seoul_openapi.client import OpenDataAPICallers
+from seoul_opendata.utils.dateutils import date2yyyy_mm_dd
+from seoul_opendata.utils.uuidutils import RandomBMask, Variant, Version7, to_millis
+
+
+class Scale(NamedTuple):
+    """합성 데이터의 크기입니다."""
+    schools: int
+    parents: int
+    children: int
+    articles: int       # 행사 게시글을 포함한 전체 게시글 수
+    events: int
+
+
+Scales: Final[dict[str, Scale]] = {
+    "small": Scale(schools=100, parents=500, children=1_000, articles=10_000, events=200),
+    "medium": Scale(schools=1_000, parents=5_000, children=10_000, articles=100_000, events=1_000),
+    "large": Scale(schools=10_000, parents=50_000, children=100_000, articles=1_000_000, events=5_000),
+}
+Locations: Final[list[Location]] = list(Location)
+Establishes: Final[tuple[str, ...]] = ("공립(병설)", "공립(단설)", "사립(법인)", "사립(사인)")
+MealTypes: Final[tuple[str, ...]] = ("직영", "위탁", "공동조리")
+Flags: Final[tuple[str, ...]] = ("Y", "N")
+Results: Final[tuple[str, ...]] = ("적합", "부적합", "")
+FirstDay: Final[date] = date(2022, 1, 1)
+
+
+class Dataset(NamedTuple):
+    """생성된 데이터베이스 트리와, 시나리오에서 조회할 키들입니다."""
+    tree: dict[str, Any]
+    schools: list[str]
+    parents: list[str]
+    children: list[str]
+    articles: list[tuple[str, str]]       # (그룹, 게시글 id). 그룹은 유치원 코드 또는 `events`
+
+
+def articleId(rng: Random, at: datetime) -> str:
+    """작성 시각 순서로 정렬되는 UUID(version 7)를 시드에서 재현 가능하게 만듭니다."""
+    return str(UUID(int=(
+        (to_millis(at) & 0xFFFFFFFFFFFF) << 80 | Version7 | rng.getrandbits(12) << 64 | Variant | rng.getrandbits(62) & RandomBMask
+    )))
+
+
+def schoolCode(rng: Random) -> str:
+    return str(UUID(int=rng.getrandbits(128), version=4))
+
+
+def address(rng: Random, location: Location) -> str:
+    return f"서울특별시 {location} 테스트로{rng.randint(1, 200)}길 {rng.randint(1, 99)}"
+
+
+def generateDatabase(scale: Scale, seed: int = 0) -> Dataset:
+    """
+    레포지토리가 저장하는 형식 그대로 유치원, 부모 유저, 아이, 게시글을 만듭니다. 보조 인덱스와 피드는 만들지 않으므로,
+    데이터베이스에 넣은 뒤 `FirebaseController.rebuildIndexes()`로 만드세요.
+    유치원의 children 목록에 든 아이는 schoolCode를 비워 둡니다. 둘 다 채우면 유치원과 아이를 읽을 때 서로를 끝없이 다시 읽기 때문입니다.
+
+    Args:
+        scale (Scale): 데이터 크기
+        seed (int, optional): 난수 시드. 같은 시드는 같은 데이터를 만듭니다.
+
+    Returns:
+        Dataset: 데이터베이스 트리와 조회할 키들
+    """
+    rng = Random(seed)
+    schools: dict[str, Any] = {}
+    for i in range(scale.schools):
+        location: Location = rng.choice(Locations)
+        school = ChildSchool(
+            code=schoolCode(rng),
+            name=f"테스트유치원{i}",
+            representerName=f"대표자{i}",
+            tel=f"02-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            location=location,
+            address=address(rng, location),
+            establishType=rng.choice(list(EstablishType)),
+            establishAt=f"{rng.randint(1960, 2022)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            openingTime="09:00~18:00",
+            latitude=round(rng.uniform(37.43, 37.69), 6),
+            longitude=round(rng.uniform(126.8, 127.18), 6),
+            articles=[]
+        )
+        schools[school.code] = school.dict()
+
+    parents: dict[str, Any] = {}
+    for i in range(scale.parents):
+        user = ParentUser(
+            id=f"parent{i}",
+            password="password",
+            name=f"부모{i}",
+            tel=f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            email=f"parent{i}@example.com",
+            gender=rng.choice(list(Gender)),
+            location=rng.choice(Locations),
+            children=[]
+        )
+        parents[user.id] = user.dict()
+
+    codes: list[str] = list(schools)
+    children: dict[str, Any] = {}
+    for i in range(scale.children):
+        childId: str = str(UUID(int=rng.getrandbits(128), version=4))
+        code: str | None = rng.choice(codes) if codes else None
+        if code is not None and rng.random() < 0.5:
+            # 절반은 유치원 정보 수정으로 유치원에, 나머지는 아이 등록으로 아이에 연결합니다.
+            schools[code]["children"].append(childId)
+            code = None
+        children[childId] = {
+            "id": childId,
+            "name": f"아이{i}",
+            "age": rng.randint(3, 7),
+            "parentId": f"parent{rng.randrange(scale.parents)}",
+            "schoolCode": code
+        }
+
+    articles: dict[str, dict[str, Any]] = {}
+    keys: list[tuple[str, str]] = []
+    span: int = (date.today() - FirstDay).days or 1
+    for i in range(scale.articles):
+        event: bool = i < scale.events or not codes
+        group: str = "events" if event else rng.choice(codes)
+        uploadAt: datetime = datetime.combine(FirstDay, datetime.min.time()) + timedelta(seconds=rng.randrange(span * 86400))
+        location = rng.choice(Locations) if event else Location(schools[group]["location"])
+        key: str = articleId(rng, uploadAt)
+        articles.setdefault(group, {})[key] = {     # Article.dict()와 같은 형식
+            "id": key,
+            "title": f"{'행사' if event else '공지'} {i}",
+            "content": f"테스트 게시글 {i}입니다.\n" * rng.randint(1, 5),
+            "attachments": [],
+            "location": str(location),
+            "latitude": round(rng.uniform(37.43, 37.69), 6) if event else None,
+            "longitude": round(rng.uniform(126.8, 127.18), 6) if event else None,
+            "uploadAt": date2yyyy_mm_dd(uploadAt.date()),
+            "eventStart": date2yyyy_mm_dd(start := uploadAt.date() + timedelta(days=rng.randint(0, 60))) if event else None,
+            "eventEnd": date2yyyy_mm_dd(start + timedelta(days=rng.randint(0, 7))) if event else None,
+            "childSchoolId": None if event else group
+        }
+        keys.append((group, key))
+
+    tree: dict[str, Any] = {
+        "childschool": schools,
+        "users": {"parent": parents},
+        "children": children,
+        "articles": articles
+    }
+    return Dataset(tree, codes, list(parents), list(children), keys)
+
+
+def generateOpenApiPages(schools: int, events: int, seed: int = 0) -> dict[str, dict[str, Any]]:
+    """
+    공공데이터 api 응답과 같은 형식의 서비스별 응답 본문을 만듭니다.
+    유치원 서비스의 행은 KINDERCODE로 병합되며, 패싯과 통계가 읽는 필드를 서비스에 나눠 담습니다.
+
+    Args:
+        schools (int): 유치원 수
+        events (int): 행사 정보 수
+        seed (int, optional): 난수 시드
+
+    Returns:
+        dict[str, dict[str, Any]]: 서비스 명칭과 응답 본문
+    """
+    rng = Random(seed)
+    fields: dict[str, Callable[[int], dict[str, Any]]] = {
+        "childSchoolInfo": lambda i: {
+            "KINDERNAME": f"테스트유치원{i}",
+            "ESTABLISH": rng.choice(Establishes),
+            "RPPNNAME": f"대표자{i}",
+            "EDATE": f"{rng.randint(1960, 2022)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            "OPERTIME": "09:00~18:00",
+            "ADDR": address(rng, rng.choice(Locations)),
+            "TELNO": f"02-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            "LTTDCDNT": f"{rng.uniform(37.43, 37.69):.6f}",
+            "LNGTDCDNT": f"{rng.uniform(126.8, 127.18):.6f}",
+            **{field: str(rng.randint(0, 40)) for field in ("PPCNT3", "PPCNT4", "PPCNT5", "MIXPPCNT", "SHPPCNT")}
+        },
+        "childSchoolHygiene": lambda i: {
+            "ARQL_CHK_RSLT_TP_CD": rng.choice(Results), "FXTM_DSNF_CHK_RSLT_TP_CD": rng.choice(Results)
+        },
+        "childSchoolBus": lambda i: {"VHCL_OPRN_YN": rng.choice(Flags), "OPRA_VHCNT": str(rng.randint(0, 5))},
+        "childSchoolMeal": lambda i: {
+            "MLSR_OPRN_WAY_TP_CD": rng.choice(MealTypes),
+            "NTRT_TCHR_AGMT_YN": rng.choice(Flags),
+            "MAS_MSPL_DCLR_YN": rng.choice(Flags)
+        },
+        "childSchoolSafetyEdu": lambda i: {
+            field: rng.choice(Flags) for field in ("FIRE_AVD_YN", "GAS_CK_YN", "ELECT_CK_YN", "PLYFC_CK_YN", "CCTV_IST_YN")
+        },
+        "childSchoolTeacher": lambda i: {
+            field: str(rng.randint(0, 10))
+            for field in ("DRCNT", "ADCNT", "HDST_THCNT", "ASPS_THCNT", "GNRL_THCNT", "SPCN_THCNT", "NTCNT", "NTRT_THCNT", "SHCNT_THCNT")
+        },
+        "childSchoolClassArea": lambda i: {"CRCNT": str(rng.randint(1, 20)), "CLSRAREA": f"{rng.uniform(30, 600):.1f}"},
+    }
+    codes: list[str] = [schoolCode(rng) for _ in range(schools)]
+    pages: dict[str, dict[str, Any]] = {}
+    for service in OpenDataAPICallers:
+        build = fields.get(service, lambda i: {})
+        rows: list[dict[str, Any]] = [{"KINDERCODE": code} | build(i) for i, code in enumerate(codes)]
+        pages[service] = page(service, rows)
+
+    rows = []
+    for i in range(events):
+        location: Location = rng.choice(Locations)
+        start: date = FirstDay + timedelta(days=rng.randrange(365))
+        rows.append({
+            "CLTUR_EVENT_ETC_NM": f"테스트 행사 {i}",
+            "SVC_CL_CODE": "2001",
+            "SVC_CL_NM": "문화행사(보육반장)",
+            "ATDRC_NM": str(location),
+            "X_CRDNT_VALUE": f"{rng.uniform(126.8, 127.18):.5f}",
+            "Y_CRDNT_VALUE": f"{rng.uniform(37.43, 37.69):.5f}",
+            "BASS_ADRES": address(rng, location),
+            "DETAIL_ADRES": "",
+            "EVENT_PD_BGNDE": date2yyyy_mm_dd(start),
+            "EVENT_PD_ENDDE": date2yyyy_mm_dd(start + timedelta(days=rng.randint(0, 7))),
+            "EVENT_FCLTY_NM": f"주최{i}",
+            "REGIST_DT": f"{date2yyyy_mm_dd(start - timedelta(days=rng.randint(1, 30)))} 10:00:00.0"
+        })
+    pages["TnFcltySttusInfo2001"] = page("TnFcltySttusInfo2001", rows)
+    return pages
+
+
+def page(service: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """공공데이터 api의 응답 본문 형식으로 행을 감쌉니다."""
+    return {service: {"list_total_count": len(rows), "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"}, "row": rows}}
@@ -0,0 +1,382 @@
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+from random import Random
+from time import monotonic, perf_counter
+from typing import Any, AsyncIterator, Callable, Final, Iterable, Iterator, Literal, NamedTuple
+
+import httpx
+import uvicorn
+
+from benchmarks.generators import Dataset, Scale, generateDatabase
+from benchmarks.runner import ResultDirectory, percentile, revision
+from benchmarks.scenarios import Environment
+from seoul_opendata.firebase.tracing import slowLog
+
+Transport = Literal["asgi", "http"]
+RootDirectory: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DefaultUsers: Final[tuple[int, ...]] = (1, 2, 4, 8, 16, 32, 64)
+
+
+class Call(NamedTuple):
+    """가상 사용자가 보낼 요청 하나입니다. name은 결과를 묶을 라우트 이름입니다."""
+    name: str
+    method: str
+    path: str
+    body: dict[str, Any] | None = None
+
+
+class Sample(NamedTuple):
+    name: str
+    latency: float      # 초
+    status: int         # 연결 오류는 0
+    dbCalls: int        # 응답의 X-DB-Calls 헤더
+
+
+Journey = Callable[[Dataset, Random], Iterator[Call]]
+Journeys: Final[dict[str, Journey]] = {}
+
+
+def journey(name: str) -> Callable[[Journey], Journey]:
+    """
+    부하 시나리오를 등록하는 데코레이터입니다.
+    부하 시나리오는 데이터셋과 가상 사용자마다의 난수 생성기를 받아, 그 사용자가 차례로 보낼 요청을 끝없이 만듭니다.
+    """
+    def decorator(steps: Journey) -> Journey:
+        Journeys[name] = steps
+        return steps
+    return decorator
+
+
+@journey("signup")
+def signupBurst(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """새 부모 유저로 가입한 뒤 바로 로그인합니다."""
+    while True:
+        userId: str = f"load-{rng.getrandbits(64):016x}"
+        password: str = f"{rng.getrandbits(32):08x}"
+        yield Call("POST /users/signup", "POST", "/users/signup", {
+            "id": userId,
+            "password": password,
+            "name": "부하테스트",
+            "tel": f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            "gender": rng.choice(("Male", "Female")),
+            "location": "강남구"
+        })
+        yield Call("POST /users/login", "POST", "/users/login", {"id": userId, "password": password})
+
+
+@journey("schools")
+def browseSchools(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """유치원 목록을 받은 뒤, 몇 곳의 상세 정보를 봅니다."""
+    while True:
+        yield Call("GET /childschools/all", "GET", "/childschools/all")
+        for code in rng.sample(dataset.schools, k=min(3, len(dataset.schools))):
+            yield Call("GET /childschools/{code}", "GET", f"/childschools/{code}")
+
+
+@journey("articles:read")
+def readArticles(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """최신 게시글, 유치원 게시글, 행사 게시글을 차례로 읽습니다."""
+    while True:
+        yield Call("GET /articles/", "GET", "/articles/?limit=20")
+        yield Call("GET /articles/{child_school_id}", "GET", f"/articles/{rng.choice(dataset.schools)}")
+        yield Call("GET /articles/events", "GET", "/articles/events")
+
+
+@journey("articles:post")
+def postArticles(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """행사 게시글을 작성합니다."""
+    while True:
+        yield Call("POST /articles/events", "POST", "/articles/events", {
+            "title": "부하테스트 행사",
+            "content": "부하테스트에서 작성한 행사 게시글입니다.",
+            "attachments": [],
+            "location": "강남구",
+            "eventStart": "2023-05-13",
+            "eventEnd": "2023-05-14"
+        })
+
+
+@journey("children")
+def registerChildren(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """기존 부모 유저의 아이를 등록합니다. 절반은 유치원도 함께 지정합니다."""
+    while True:
+        yield Call("POST /children/", "POST", "/children/", {
+            "name": "부하테스트",
+            "age": rng.randint(3, 7),
+            "parentId": rng.choice(dataset.parents),
+            "schoolCode": rng.choice(dataset.schools) if rng.random() < 0.5 else None
+        })
+
+
+# 혼합 부하에서 각 부하 시나리오의 다음 요청을 고를 비율
+Mix: Final[dict[str, float]] = {"articles:read": 0.4, "schools": 0.25, "signup": 0.15, "children": 0.15, "articles:post": 0.05}
+
+
+@journey("mixed")
+def mixedTraffic(dataset: Dataset, rng: Random) -> Iterator[Call]:
+    """`Mix`의 비율대로 다른 부하 시나리오의 요청을 섞어 보냅니다."""
+    streams: dict[str, Iterator[Call]] = {name: Journeys[name](dataset, rng) for name in Mix}
+    names: list[str] = list(Mix)
+    weights: list[float] = list(Mix.values())
+    while True:
+        yield next(streams[rng.choices(names, weights)[0]])
+
+
+async def virtualUser(client: httpx.AsyncClient, calls: Iterator[Call], deadline: float, samples: list[Sample]) -> None:
+    """응답을 받으면 바로 다음 요청을 보내는 사용자입니다(closed model). 마감 시각 전에 보낸 요청은 끝까지 기다립니다."""
+    while perf_counter() < deadline:
+        call: Call = next(calls)
+        startedAt: float = perf_counter()
+        try:
+            resp = await client.request(call.method, call.path, json=call.body)
+            status, dbCalls = resp.status_code, int(resp.headers.get("X-DB-Calls", 0))
+        except httpx.HTTPError:
+            status, dbCalls = 0, 0
+        samples.append(Sample(call.name, perf_counter() - startedAt, status, dbCalls))
+
+
+def summarize(samples: list[Sample], users: int, elapsed: float) -> dict[str, Any]:
+    """한 단계의 표본을 처리량, 지연 시간 분위 수, 오류율로 요약합니다. 라우트별 요약도 함께 만듭니다."""
+    def stats(group: list[Sample]) -> dict[str, Any]:
+        latencies: list[float] = sorted(sample.latency for sample in group)
+        return {
+            "requests": len(group),
+            "p50Ms": round(percentile(latencies, 0.5) * 1000, 3),
+            "p95Ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99Ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "errorRate": round(sum(1 for sample in group if not 200 <= sample.status < 400) / len(group), 4),
+            "dbCallsPerRequest": round(sum(sample.dbCalls for sample in group) / len(group), 2)
+        }
+
+    if not samples:
+        return {"users": users, "requests": 0, "rps": 0.0, "p50Ms": 0.0, "p95Ms": 0.0, "p99Ms": 0.0, "errorRate": 1.0, "dbCallsPerRequest": 0.0, "routes": {}}
+    routes: dict[str, list[Sample]] = {}
+    for sample in samples:
+        routes.setdefault(sample.name, []).append(sample)
+    return {"users": users, "rps": round(len(samples) / elapsed, 2)} | stats(samples) | {
+        "routes": {name: stats(group) for name, group in sorted(routes.items())}
+    }
+
+
+def saturation(steps: list[dict[str, Any]], sloMs: float, maxErrorRate: float, minGain: float = 0.1) -> dict[str, Any]:
+    """
+    동시 사용자 수를 늘려 간 단계들에서 지속 가능한 처리량과 포화 지점을 찾습니다.
+    p99가 `sloMs` 이하이고 오류율이 `maxErrorRate` 이하인 단계를 건강한 단계로 봅니다.
+    포화 지점은 그 단계부터 사용자를 더 늘려도 처리량이 이전 단계들의 최대 처리량보다 `minGain` 비율 이상 늘지 않는 첫 단계이거나,
+    건강하지 않은 첫 단계입니다. 이후 단계까지 보므로, 한 단계의 일시적인 처리량 감소는 포화로 보지 않습니다.
+
+    Returns:
+        dict[str, Any]: 지속 가능한 최대 처리량(sustainedRps)과 그때의 사용자 수, 포화 지점의 사용자 수와 이유
+    """
+    healthy: list[dict[str, Any]] = [step for step in steps if step["p99Ms"] <= sloMs and step["errorRate"] <= maxErrorRate]
+    best: dict[str, Any] | None = max(healthy, key=lambda step: step["rps"], default=None)
+    saturatedAt: int | None = None
+    reason: str | None = None
+    peak: float = 0.0
+    for i, step in enumerate(steps):
+        if step["errorRate"] > maxErrorRate:
+            saturatedAt, reason = step["users"], "errors"
+        elif step["p99Ms"] > sloMs:
+            saturatedAt, reason = step["users"], "latency"
+        elif peak > 0 and max(later["rps"] for later in steps[i:] if later in healthy) < peak * (1 + minGain):
+            saturatedAt, reason = step["users"], "throughput"
+        if saturatedAt is not None:
+            break
+        peak = max(peak, step["rps"])
+    return {
+        "sustainedRps": best["rps"] if best is not None else 0.0,
+        "sustainedUsers": best["users"] if best is not None else None,
+        "saturatedAt": saturatedAt,
+        "reason": reason
+    }
+
+
+async def ramp(
+    client: httpx.AsyncClient,
+    dataset: Dataset,
+    name: str,
+    users: Iterable[int],
+    duration: float,
+    seed: int,
+    sloMs: float,
+    maxErrorRate: float
+) -> dict[str, Any]:
+    """동시 사용자 수를 단계별로 늘려 가며 부하 시나리오 하나를 실행합니다. 건강하지 않은 단계가 나오면 멈춥니다."""
+    steps: list[dict[str, Any]] = []
+    for count in users:
+        print(f"Loading {name} with {count} user(s) ...", file=sys.stderr, flush=True)
+        samples: list[Sample] = []
+        startedAt: float = perf_counter()
+        await asyncio.gather(*(
+            # 사용자마다 따로 시드를 정해, 같은 시드라면 각 사용자가 같은 순서로 요청을 보내도록 합니다.
+            virtualUser(client, Journeys[name](dataset, Random(f"{seed}:{name}:{count}:{i}")), startedAt + duration, samples)
+            for i in range(count)
+        ))
+        steps.append(summarize(samples, count, perf_counter() - startedAt))
+        if steps[-1]["p99Ms"] > sloMs or steps[-1]["errorRate"] > maxErrorRate:
+            break
+    return {"steps": steps} | saturation(steps, sloMs, maxErrorRate)
+
+
+def freePort() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def connect(
+    transport: Transport, scale: str, sizes: Scale, seed: int, latency: float, url: str | None, connections: int
+) -> AsyncIterator[tuple[httpx.AsyncClient, Dataset]]:
+    """
+    부하를 보낼 클라이언트와, 서버의 데이터베이스에 든 데이터셋을 만듭니다.
+    - `asgi`: 같은 프로세스의 앱을 직접 호출합니다. 부하를 만드는 코드가 서버와 GIL을 나눠 씁니다.
+    - `http`: `url`이 없으면 `python -m benchmarks serve`를 자식 프로세스로 띄워 localhost로 요청합니다.
+      `url`이 있으면 같은 크기와 시드로 띄운 서버라고 보고 그 주소로 요청합니다.
+    """
+    timeout = httpx.Timeout(60.0)
+    if transport == "asgi":
+        # 부하를 걸면 대부분의 요청이 느린 요청이 되므로, 느린 요청 로그는 끄고 지연 시간은 결과로만 봅니다.
+        slowLog.setLevel(logging.ERROR)
+        env = Environment(sizes, seed, latency)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=env.app), base_url="http://benchmark", timeout=timeout) as client:
+            yield client, env.dataset
+        return
+
+    server: subprocess.Popen | None = None
+    if url is None:
+        port: int = freePort()
+        url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks", "serve", "--scale", scale, "--seed", str(seed), "--latency-ms", str(latency * 1000), "--port", str(port)],
+            cwd=RootDirectory
+        )
+    try:
+        dataset: Dataset = generateDatabase(sizes, seed)
+        limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            await waitUntilReady(client, server)
+            yield client, dataset
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+async def waitUntilReady(client: httpx.AsyncClient, server: subprocess.Popen | None, timeout: float = 300.0) -> None:
+    """서버가 데이터를 준비하고 응답할 때까지 기다립니다."""
+    deadline: float = monotonic() + timeout
+    while monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Benchmark server exited with code {server.returncode}.")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"Benchmark server at {client.base_url} is not ready after {timeout} seconds.")
+
+
+def loadTest(
+    journeys: Iterable[str],
+    scale: str,
+    sizes: Scale,
+    *,
+    seed: int = 0,
+    latency: float = 0.0,
+    users: Iterable[int] = DefaultUsers,
+    duration: float = 5.0,
+    sloMs: float = 1000.0,
+    maxErrorRate: float = 0.01,
+    transport: Transport = "asgi",
+    url: str | None = None
+) -> dict[str, Any]:
+    """
+    부하 시나리오마다 동시 사용자 수를 늘려 가며 앱에 요청을 보내고, 단계별 처리량과 지연 시간, 포화 지점을 잽니다.
+    모든 부하 시나리오는 같은 서버에서 차례로 실행되므로, 앞선 시나리오가 쓴 데이터가 뒤의 시나리오에 남습니다.
+
+    Args:
+        journeys (Iterable[str]): 실행할 부하 시나리오 이름
+        scale (str): 데이터 크기의 이름
+        sizes (Scale): 데이터 크기
+        seed (int, optional): 난수 시드
+        latency (float, optional): 데이터베이스 호출마다 기다릴 시간(초)
+        users (Iterable[int], optional): 단계별 동시 사용자 수
+        duration (float, optional): 단계마다 부하를 보낼 시간(초)
+        sloMs (float, optional): 건강한 단계의 p99 상한(ms)
+        maxErrorRate (float, optional): 건강한 단계의 오류율 상한
+        transport (Transport, optional): `asgi`는 프로세스 안에서, `http`는 localhost의 서버로 요청합니다.
+        url (str | None, optional): `http`일 때 요청할 서버 주소. 없으면 서버를 띄웁니다.
+
+    Returns:
+        dict[str, Any]: 실행 환경 정보(meta)와 부하 시나리오별 결과(results)
+    """
+    users = list(users)
+    meta: dict[str, Any] = {
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision(),
+        "python": sys.version.split()[0],
+        "scale": scale,
+        "sizes": sizes._asdict(),
+        "seed": seed,
+        "latencyMs": latency * 1000,
+        "transport": transport,
+        "url": url,
+        "users": users,
+        "duration": duration,
+        "sloMs": sloMs,
+        "maxErrorRate": maxErrorRate
+    }
+
+    async def main() -> dict[str, Any]:
+        results: dict[str, Any] = {}
+        async with connect(transport, scale, sizes, seed, latency, url, max(users)) as (client, dataset):
+            for name in journeys:
+                results[name] = await ramp(client, dataset, name, users, duration, seed, sloMs, maxErrorRate)
+        return results
+
+    return {"meta": meta, "results": asyncio.run(main())}
+
+
+def resultPath(report: dict[str, Any]) -> str:
+    """부하 테스트 결과를 저장할 기본 경로 `benchmarks/results/load-{크기}-{시각}.json`입니다."""
+    os.makedirs(ResultDirectory, exist_ok=True)
+    stamp: str = datetime.fromisoformat(report["meta"]["createdAt"]).strftime("%Y%m%d-%H%M%S")
+    return os.path.join(ResultDirectory, f"load-{report['meta']['scale']}-{stamp}.json")
+
+
+def loadTable(report: dict[str, Any]) -> str:
+    """부하 테스트 결과를 단계별 표와 요약으로 만듭니다. 포화 지점의 단계에는 `*`를 붙입니다."""
+    lines: list[str] = []
+    for name, result in report["results"].items():
+        lines.append(f"[{name}]")
+        lines.append(f"{'users':>7} {'rps':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8} {'db/req':>8}")
+        for step in result["steps"]:
+            marker: str = "*" if step["users"] == result["saturatedAt"] else " "
+            lines.append(
+                f"{step['users']:>6}{marker} {step['rps']:>10.1f} {step['p50Ms']:>10.1f} {step['p95Ms']:>10.1f} "
+                f"{step['p99Ms']:>10.1f} {step['errorRate'] * 100:>7.2f}% {step['dbCallsPerRequest']:>8.1f}"
+            )
+        summary: str = f"sustained {result['sustainedRps']:.1f} rps at {result['sustainedUsers']} user(s)"
+        if result["saturatedAt"] is not None:
+            summary += f", saturated at {result['saturatedAt']} user(s) by {result['reason']}"
+        lines.append(summary)
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def serve(sizes: Scale, seed: int = 0, latency: float = 0.0, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    로컬 데이터베이스와 고정 응답을 사용하는 앱을 uvicorn으로 띄웁니다. `loadTest(transport="http")`가 자식 프로세스로 실행합니다.
+    공공데이터 갱신 스케줄러가 부하에 섞이지 않도록 수명 주기 이벤트는 끕니다.
+    """
+    slowLog.setLevel(logging.ERROR)
+    env = Environment(sizes, seed, latency)
+    uvicorn.run(env.app, host=host, port=port, lifespan="off", log_level="warning", access_log=False)
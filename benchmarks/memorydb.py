@@ -0,0 +1,194 @@
+import json
+from collections import Counter
+from threading import RLock
+from time import sleep
+from typing import Any, Callable, Final
+
+from seoul_opendata.firebase.replica import orderKey
+
+
+def encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class MemoryDatabase:
+    """
+    firebase 실시간 데이터베이스를 대신하는 프로세스 내 데이터베이스입니다.
+    값은 JSON으로 직렬화해 보관하고 읽을 때마다 새로 해석하므로, firebase처럼 호출자가 받은 값을 고쳐도 저장된 값은 바뀌지 않습니다.
+    호출 종류별 횟수와 주고받은 크기를 세므로, 벤치마크에서 시나리오마다 데이터베이스 호출 수를 비교할 수 있습니다.
+    """
+    latency: float
+
+    def __init__(self, data: dict[str, Any] | None = None, latency: float = 0.0) -> None:
+        """
+        Args:
+            data (dict[str, Any] | None, optional): 초기 데이터
+            latency (float, optional): 호출마다 기다릴 시간(초). firebase와의 왕복 시간을 흉내 낼 때 사용합니다.
+        """
+        self.tree: dict[str, Any] = json.loads(encode(data or {}))
+        self.latency = latency
+        self.calls: Counter[str] = Counter()        # 호출 종류 -> 횟수
+        self.bytes: int = 0                         # 주고받은 JSON 크기
+        self._lock = RLock()
+
+    def reference(self, path: str = "/") -> "MemoryReference":
+        return MemoryReference(self, path)
+
+    def call(self, kind: str, run: Callable[[], Any]) -> Any:
+        """호출을 세고, 지연 시간을 흉내 낸 뒤 실행합니다."""
+        if self.latency > 0:
+            sleep(self.latency)
+        with self._lock:
+            self.calls[kind] += 1
+            return run()
+
+    def node(self, parts: list[str]) -> Any:
+        node: Any = self.tree
+        for part in parts:
+            if not isinstance(node, dict) or (node := node.get(part)) is None:
+                return None
+        return node
+
+    def read(self, parts: list[str]) -> Any:
+        """노드를 JSON으로 직렬화했다가 해석해, 저장된 값과 공유하지 않는 사본을 반환합니다."""
+        blob: str = encode(self.node(parts))
+        self.bytes += len(blob)
+        return json.loads(blob)
+
+    def put(self, parts: list[str], value: Any) -> None:
+        if isinstance(value, dict) and ".sv" in value:
+            # 서버 값은 firebase처럼 증가 연산만 지원합니다.
+            current: Any = self.node(parts)
+            value = (current if isinstance(current, (int, float)) else 0) + value[".sv"]["increment"]
+        if not parts:
+            self.tree = value if isinstance(value, dict) else {}
+            return
+        node: dict[str, Any] = self.tree
+        parents: list[tuple[dict[str, Any], str]] = []
+        for part in parts[:-1]:
+            if not isinstance(node.get(part), dict):
+                if value is None:
+                    return
+                node[part] = {}
+            parents.append((node, part))
+            node = node[part]
+        if value is None or value == {}:
+            node.pop(parts[-1], None)
+            # firebase는 빈 노드를 남기지 않습니다.
+            for parent, part in reversed(parents):
+                if parent[part]:
+                    break
+                del parent[part]
+        else:
+            blob: str = encode(value)
+            self.bytes += len(blob)
+            node[parts[-1]] = json.loads(blob)
+
+
+def split(path: str) -> list[str]:
+    return [part for part in path.split("/") if part]
+
+
+class MemoryReference:
+    """`firebase_admin.db.Reference` 중 레포지토리가 사용하는 연산을 구현합니다."""
+    database: Final[MemoryDatabase]
+    parts: Final[list[str]]
+
+    def __init__(self, database: MemoryDatabase, path: str) -> None:
+        self.database = database
+        self.parts = split(path)
+
+    @property
+    def path(self) -> str:
+        return "/" + "/".join(self.parts)
+
+    @property
+    def key(self) -> str | None:
+        return self.parts[-1] if self.parts else None
+
+    def child(self, path: str) -> "MemoryReference":
+        return MemoryReference(self.database, f"{self.path}/{path}")
+
+    def get(self) -> Any:
+        return self.database.call("get", lambda: self.database.read(self.parts))
+
+    def set(self, value: Any) -> None:
+        self.database.call("set", lambda: self.database.put(self.parts, value))
+
+    def update(self, value: dict[str, Any]) -> None:
+        def run() -> None:
+            for path, child in value.items():
+                self.database.put(self.parts + split(path), child)
+        self.database.call("update", run)
+
+    def delete(self) -> None:
+        self.database.call("delete", lambda: self.database.put(self.parts, None))
+
+    def order_by_child(self, field: str) -> "MemoryQuery":
+        return MemoryQuery(self, field)
+
+    def order_by_key(self) -> "MemoryQuery":
+        return MemoryQuery(self, None)
+
+
+class MemoryQuery:
+    """`firebase_admin.db.Query`처럼 자식 노드를 정렬하고 범위와 개수로 거릅니다."""
+    reference: Final[MemoryReference]
+    field: Final[str | None]
+
+    def __init__(self, reference: MemoryReference, field: str | None) -> None:
+        self.reference = reference
+        self.field = field      # None이면 키로 정렬합니다.
+        self.startAt: Any = None
+        self.endAt: Any = None
+        self.limit: int | None = None
+        self.last: bool = False
+
+    def equal_to(self, value: Any) -> "MemoryQuery":
+        self.startAt = self.endAt = value
+        return self
+
+    def start_at(self, value: Any) -> "MemoryQuery":
+        self.startAt = value
+        return self
+
+    def end_at(self, value: Any) -> "MemoryQuery":
+        self.endAt = value
+        return self
+
+    def limit_to_first(self, limit: int) -> "MemoryQuery":
+        self.limit, self.last = limit, False
+        return self
+
+    def limit_to_last(self, limit: int) -> "MemoryQuery":
+        self.limit, self.last = limit, True
+        return self
+
+    def ordered(self, item: tuple[str, Any]) -> tuple:
+        key, value = item
+        if self.field is None:
+            return orderKey(key)
+        return orderKey(value.get(self.field) if isinstance(value, dict) else None)
+
+    def run(self) -> dict[str, Any]:
+        database: MemoryDatabase = self.reference.database
+        node: Any = database.node(self.reference.parts)
+        if not isinstance(node, dict):
+            return {}
+        low: tuple | None = orderKey(self.startAt) if self.startAt is not None else None
+        high: tuple | None = orderKey(self.endAt) if self.endAt is not None else None
+        keys: list[str] = [
+            key for key, _ in sorted(
+                (
+                    item for item in node.items()
+                    if (low is None or self.ordered(item) >= low) and (high is None or self.ordered(item) <= high)
+                ),
+                key=lambda item: (self.ordered(item), item[0])
+            )
+        ]
+        if self.limit is not None:
+            keys = keys[-self.limit:] if self.last else keys[:self.limit]
+        return {key: database.read([*self.reference.parts, key]) for key in keys}
+
+    def get(self) -> dict[str, Any]:
+        return self.reference.database.call("query", self.run)
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+from time import sleep
+from typing import Any, Final, Mapping
+
+import requests
+from requests.adapters import BaseAdapter
+
+from seoul_opendata.seoul_openapi.client import OpenDataAPIRanges, SeoulOpenAPI
+
+FixtureDirectory: Final[str] = os.path.join(os.path.dirname(__file__), "fixtures", "openapi")
+OpenApiPrefix: Final[str] = "http://openapi.seoul.go.kr:8088/"
+RequestPath: Final[re.Pattern] = re.compile(r"/json/(?P<service>\w+)/(?P<start>\d+)/(?P<end>\d+)/?$")
+
+
+def loadFixtures(directory: str = FixtureDirectory) -> dict[str, dict[str, Any]]:
+    """`record()`로 저장한 서비스별 응답 본문을 읽습니다. 저장된 응답이 없으면 빈 dict를 반환합니다."""
+    if not os.path.isdir(directory):
+        return {}
+    pages: dict[str, dict[str, Any]] = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                pages[filename.removesuffix(".json")] = json.load(f)
+    return pages
+
+
+def record(directory: str = FixtureDirectory) -> list[str]:
+    """
+    실제 공공데이터 api를 호출해, 서비스별 응답 본문을 벤치마크용 고정 응답으로 저장합니다. `SEOUL_OPENDATA_KEY`가 필요합니다.
+
+    Returns:
+        list[str]: 저장한 서비스 명칭
+    """
+    os.makedirs(directory, exist_ok=True)
+    api = SeoulOpenAPI()
+    recorded: list[str] = []
+    for service in OpenDataAPIRanges:
+        resp: requests.Response = api.request(service)
+        resp.raise_for_status()
+        with open(os.path.join(directory, f"{service}.json"), mode="wt", encoding="utf-8") as f:
+            json.dump(resp.json(), f, ensure_ascii=False)
+        recorded.append(service)
+    return recorded
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    공공데이터 api 대신 고정된 응답 본문으로 응답하는 requests 어댑터입니다.
+    `SeoulOpenAPI.session`에 mount하면 클라이언트 코드는 그대로 둔 채 네트워크 없이 수집 파이프라인을 실행할 수 있습니다.
+    요청 경로의 시작/끝 인덱스에 맞춰 행을 잘라 응답합니다.
+    """
+    pages: Final[Mapping[str, dict[str, Any]]]
+    latency: float
+
+    def __init__(self, pages: Mapping[str, dict[str, Any]], latency: float = 0.0) -> None:
+        """
+        Args:
+            pages (Mapping[str, dict[str, Any]]): 서비스 명칭과 응답 본문
+            latency (float, optional): 요청마다 기다릴 시간(초)
+        """
+        super().__init__()
+        self.pages = pages
+        self.latency = latency
+        self.requests: int = 0
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        self.requests += 1
+        if self.latency > 0:
+            sleep(self.latency)
+        resp = requests.Response()
+        resp.request = request
+        resp.url = str(request.url)
+        resp.headers["Content-Type"] = "application/json; charset=utf-8"
+        match: re.Match | None = RequestPath.search(requests.utils.urlparse(resp.url).path)
+        if match is None or match["service"] not in self.pages:
+            resp.status_code = 404
+            resp._content = b""
+            return resp
+        service: str = match["service"]
+        body: dict[str, Any] = self.pages[service]
+        start, end = int(match["start"]), int(match["end"])
+        resp.status_code = 200
+        resp._content = json.dumps(
+            {service: body[service] | {"row": body[service]["row"][start - 1:end]}}, ensure_ascii=False
+        ).encode("utf-8")
+        return resp
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,225 @@
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+from typing import Any, Final, Iterable
+
+from benchmarks.generators import Scale
+from benchmarks.scenarios import Environment, Operation, Scenario
+
+ResultDirectory: Final[str] = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """정렬된 표본의 q 분위 수(nearest-rank)입니다."""
+    return samples[min(len(samples) - 1, max(0, round(q * len(samples)) - 1))]
+
+
+def measure(
+    env: Environment,
+    operation: Operation,
+    duration: float = 1.0,
+    minIterations: int = 5,
+    rounds: int = 3,
+    maxIterations: int = 10_000
+) -> dict[str, Any]:
+    """
+    작업을 반복 실행해 처리량, 지연 시간 분위 수, 최대 메모리 사용량, 데이터베이스 호출 수를 잽니다.
+    한 번 실행해 캐시를 데운 뒤, 처음 `minIterations`번의 실행으로 데이터베이스 호출 수를 셉니다. 같은 시드와 횟수라면 항상 같은 값입니다.
+    시간은 `rounds`번으로 나눠, 라운드마다 `duration / rounds`초가 지나고 `minIterations`번 이상 실행할 때까지 잽니다.
+    라운드별 p50의 중앙값을 p50으로, 라운드 사이의 상대적인 차이를 잡음(noise)으로 기록합니다.
+    메모리는 추적 부담이 시간 측정에 섞이지 않도록, 시간을 잰 뒤 한 번 더 실행하며 tracemalloc으로 잽니다.
+
+    Returns:
+        dict[str, Any]: 측정 결과
+    """
+    operation()
+    calls: int = env.database.calls.total()
+    size: int = env.database.bytes
+    for _ in range(minIterations):
+        operation()
+    dbCalls: int = env.database.calls.total() - calls
+    dbBytes: int = env.database.bytes - size
+
+    latencies: list[float] = []
+    medians: list[float] = []
+    elapsed: float = 0.0
+    for _ in range(rounds):
+        samples: list[float] = []
+        startedAt: float = perf_counter()
+        while len(samples) < maxIterations // rounds and (len(samples) < minIterations or perf_counter() - startedAt < duration / rounds):
+            began: float = perf_counter()
+            operation()
+            samples.append(perf_counter() - began)
+        elapsed += perf_counter() - startedAt
+        medians.append(median(samples))
+        latencies += samples
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    p50: float = median(medians)
+    return {
+        "iterations": len(latencies),
+        "throughput": round(len(latencies) / elapsed, 3),      # 초당 실행 수
+        "meanMs": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50Ms": round(p50 * 1000, 3),
+        "p99Ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "noise": round((max(medians) - min(medians)) / p50, 3) if p50 > 0 else 0.0,
+        "peakMemoryBytes": peak,
+        "dbCalls": round(dbCalls / minIterations, 3),          # 실행마다의 평균 데이터베이스 호출 수
+        "dbBytes": round(dbBytes / minIterations)
+    }
+
+
+def calibrate(repeat: int = 9) -> tuple[float, float]:
+    """
+    정해진 CPU 작업(JSON 직렬화와 정렬)의 실행 시간(ms)과, 반복 사이의 상대적인 차이(사분위 범위 / 중앙값)입니다.
+    다른 머신에서 만든 기준 결과와 비교할 때, 머신 사이의 속도 차이를 보정하는 데 사용합니다.
+    차이는 보정 자체의 잡음이므로, 비교할 때 그만큼 더 허용합니다. 가비지 컬렉션이 끼어든 한두 번에 흔들리지 않도록,
+    실행 중에는 가비지 컬렉션을 끄고 최댓값 대신 사분위 범위를 사용합니다.
+    """
+    data: list[dict[str, Any]] = [{"id": f"{i:06d}", "name": f"테스트{i}", "values": list(range(i % 17))} for i in range(5000)]
+    times: list[float] = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            startedAt: float = perf_counter()
+            json.loads(json.dumps(data, ensure_ascii=False))
+            sorted(data, key=lambda item: (len(item["values"]), item["name"]))
+            times.append(perf_counter() - startedAt)
+    finally:
+        gc.enable()
+    times.sort()
+    middle: float = median(times)
+    return round(middle * 1000, 3), round((times[len(times) * 3 // 4] - times[len(times) // 4]) / middle, 3)
+
+
+def revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    scenarios: Iterable[Scenario],
+    scale: str,
+    sizes: Scale,
+    *,
+    seed: int = 0,
+    latency: float = 0.0,
+    duration: float = 1.0,
+    minIterations: int = 5,
+    rounds: int = 3
+) -> dict[str, Any]:
+    """
+    시나리오들을 같은 환경에서 차례로 측정합니다.
+
+    Args:
+        scenarios (Iterable[Scenario]): 측정할 시나리오
+        scale (str): 데이터 크기의 이름
+        sizes (Scale): 데이터 크기
+        seed (int, optional): 난수 시드
+        latency (float, optional): 데이터베이스 호출마다 기다릴 시간(초)
+        duration (float, optional): 시나리오마다 반복할 최소 시간(초)
+        minIterations (int, optional): 시나리오마다 반복할 최소 횟수. 데이터베이스 호출 수도 이 횟수의 실행으로 셉니다.
+        rounds (int, optional): 시간을 나눠 잴 라운드 수
+
+    Returns:
+        dict[str, Any]: 실행 환경 정보(meta)와 시나리오별 측정 결과(results)
+    """
+    startedAt: float = perf_counter()
+    env = Environment(sizes, seed, latency)
+    calibrationMs, calibrationSpread = calibrate()
+    meta: dict[str, Any] = {
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "scale": scale,
+        "sizes": sizes._asdict(),
+        "seed": seed,
+        "latencyMs": latency * 1000,
+        "duration": duration,
+        "minIterations": minIterations,
+        "rounds": rounds,
+        "calibrationMs": calibrationMs,
+        "calibrationSpread": calibrationSpread,
+        "setupSeconds": round(perf_counter() - startedAt, 3)
+    }
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        print(f"Running {scenario.name} ...", file=sys.stderr, flush=True)
+        results[scenario.name] = measure(env, scenario.setup(env), duration, minIterations, rounds)
+    return {"meta": meta, "results": results}
+
+
+def combine(reports: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    같은 조건으로 여러 번 측정한 결과를 하나로 합칩니다. 한 번의 측정이 다른 프로세스에 방해받아도 결과가 흔들리지 않도록,
+    p50과 보정 작업 시간, 보정 잡음은 중앙값을 쓰고, 측정 사이의 p50의 상대적인 차이를 시나리오의 잡음에 반영합니다.
+
+    Args:
+        reports (list[dict[str, Any]]): `run()`의 결과들
+
+    Returns:
+        dict[str, Any]: 합친 결과. 첫 결과의 실행 환경 정보에 반복 횟수(repeats)를 더합니다.
+    """
+    def spread(values: list[float]) -> float:
+        middle: float = median(values)
+        return round((max(values) - min(values)) / middle, 3) if middle > 0 else 0.0
+
+    calibrations: list[float] = [report["meta"]["calibrationMs"] for report in reports]
+    meta: dict[str, Any] = reports[0]["meta"] | {
+        "repeats": len(reports),
+        "calibrationMs": median(calibrations),
+        "calibrationSpread": median(report["meta"]["calibrationSpread"] for report in reports)
+    }
+    results: dict[str, Any] = {}
+    for name, first in reports[0]["results"].items():
+        runs: list[dict[str, Any]] = [report["results"][name] for report in reports]
+        p50s: list[float] = [result["p50Ms"] for result in runs]
+        results[name] = first | {
+            "p50Ms": median(p50s),
+            "p99Ms": median(result["p99Ms"] for result in runs),
+            "throughput": median(result["throughput"] for result in runs),
+            "noise": max(spread(p50s), median(result["noise"] for result in runs)),
+            "dbCalls": max(result["dbCalls"] for result in runs)
+        }
+    return {"meta": meta, "results": results}
+
+
+def save(report: dict[str, Any], path: str | None = None) -> str:
+    """측정 결과를 JSON으로 저장합니다. 경로가 없으면 `benchmarks/results/{크기}-{시각}.json`에 저장합니다."""
+    if path is None:
+        os.makedirs(ResultDirectory, exist_ok=True)
+        stamp: str = datetime.fromisoformat(report["meta"]["createdAt"]).strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(ResultDirectory, f"{report['meta']['scale']}-{stamp}.json")
+    with open(path, mode="wt", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def table(report: dict[str, Any]) -> str:
+    """측정 결과를 사람이 읽기 쉬운 표로 만듭니다."""
+    lines: list[str] = [f"{'scenario':<52} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10} {'db calls':>9}"]
+    for name, result in report["results"].items():
+        lines.append(
+            f"{name:<52} {result['throughput']:>10.1f} {result['p50Ms']:>10.3f} {result['p99Ms']:>10.3f} "
+            f"{result['peakMemoryBytes'] / 1024:>10.1f} {result['dbCalls']:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+import os
+import tempfile
+from contextlib import chdir
+from itertools import cycle
+from random import Random
+from typing import Any, Callable, Final, Iterator, NamedTuple, cast
+
+from firebase_admin import db
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.generators import Dataset, Scale, generateDatabase, generateOpenApiPages
+from benchmarks.memorydb import MemoryDatabase
+from benchmarks.openapi import FixtureAdapter, OpenApiPrefix, loadFixtures
+from main import create_app
+from seoul_opendata.firebase.controller import DB, FirebaseController
+from seoul_opendata.models.payloads import ChildRead, ChildSchoolRead, UserRead
+from seoul_opendata.seoul_openapi import OpenData
+from seoul_opendata.utils.lazy import Lazy
+from seoul_opendata.utils.ratelimit import TokenBucket
+
+Operation = Callable[[], Any]
+
+
+class Environment:
+    """
+    벤치마크 시나리오가 실행되는 로컬 환경입니다.
+    합성 데이터를 넣은 `MemoryDatabase`로 `DB`를 바꾸고, 공공데이터 api 호출은 고정 응답으로 처리하므로 네트워크 없이 실행됩니다.
+    """
+    scale: Final[Scale]
+    dataset: Final[Dataset]
+    database: Final[MemoryDatabase]
+    controller: Final[FirebaseController]
+    openapi: Final[FixtureAdapter]
+
+    def __init__(self, scale: Scale, seed: int = 0, latency: float = 0.0) -> None:
+        """
+        Args:
+            scale (Scale): 합성 데이터 크기
+            seed (int, optional): 난수 시드
+            latency (float, optional): 데이터베이스 호출마다 기다릴 시간(초)
+        """
+        self.scale = scale
+        self.seed = seed
+        self.dataset = generateDatabase(scale, seed)
+        self.database = MemoryDatabase(self.dataset.tree)
+        self.controller = FirebaseController(cast(db.Reference, self.database.reference()))
+        self.controller.rebuildIndexes()
+        # 버전 카운터는 쓰기 뒤에만 다시 읽도록 해, 데이터베이스 호출 수가 실행 시간에 따라 달라지지 않게 합니다.
+        self.controller.versions.syncInterval = 24 * 60 * 60
+        self.database.latency = latency
+        cast(Lazy, DB).use(self.controller)
+        os.environ.setdefault("SEOUL_OPENDATA_KEY", "benchmark")     # 요청은 FixtureAdapter가 처리하므로 실제 키는 필요 없습니다.
+        # 녹화된 응답이 있으면 그것을, 없으면 합성한 응답을 사용합니다.
+        self.openapi = FixtureAdapter(loadFixtures() or generateOpenApiPages(scale.schools, scale.events, seed))
+        OpenData.api.session.mount(OpenApiPrefix, self.openapi)
+        OpenData.api.limiter = TokenBucket(0)       # 고정 응답에는 호출 한도가 없으므로, 파이프라인의 처리 속도만 잽니다.
+        self._app: FastAPI | None = None
+        self._client: TestClient | None = None
+
+    @property
+    def app(self) -> FastAPI:
+        """이 환경의 데이터베이스를 사용하는 앱"""
+        if self._app is None:
+            self._app = create_app()
+        return self._app
+
+    @property
+    def client(self) -> TestClient:
+        """앱에 요청을 보내는 클라이언트. 수명 주기 이벤트를 실행하지 않으므로 공공데이터 갱신 스케줄러는 시작하지 않습니다."""
+        if self._client is None:
+            self._client = TestClient(self.app)
+        return self._client
+
+    def keys(self, keys: list[Any]) -> Iterator[Any]:
+        """시나리오가 반복마다 다른 항목을 읽도록, 시드로 섞은 키를 끝없이 돌려줍니다."""
+        keys = list(keys)
+        Random(self.seed).shuffle(keys)
+        return cycle(keys[:1000])
+
+
+class Scenario(NamedTuple):
+    """측정할 작업입니다. setup은 환경을 받아, 한 번의 작업을 실행하는 함수를 반환합니다."""
+    name: str
+    setup: Callable[[Environment], Operation]
+
+
+Scenarios: Final[dict[str, Scenario]] = {}
+
+
+def scenario(name: str) -> Callable[[Callable[[Environment], Operation]], Callable[[Environment], Operation]]:
+    """시나리오를 등록하는 데코레이터입니다. 이름은 `repo:`, `ingest:`, `route:` 중 하나로 시작합니다."""
+    def decorator(setup: Callable[[Environment], Operation]) -> Callable[[Environment], Operation]:
+        Scenarios[name] = Scenario(name, setup)
+        return setup
+    return decorator
+
+
+def get(env: Environment, path: str) -> Any:
+    resp = env.client.get(path)
+    assert resp.status_code == 200, f"GET {path} responded {resp.status_code}: {resp.text[:200]}"
+    return resp
+
+
+@scenario("repo:ChildSchoolRepository.readAll")
+def childSchoolReadAll(env: Environment) -> Operation:
+    return DB.childSchool.readAll
+
+
+@scenario("repo:ChildSchoolRepository.read")
+def childSchoolRead(env: Environment) -> Operation:
+    codes: Iterator[str] = env.keys(env.dataset.schools)
+    return lambda: DB.childSchool.read(ChildSchoolRead(code=next(codes)))
+
+
+@scenario("repo:ParentUserRepository.read")
+def parentUserRead(env: Environment) -> Operation:
+    ids: Iterator[str] = env.keys(env.dataset.parents)
+    return lambda: DB.parentUser.read(UserRead(id=next(ids)))
+
+
+@scenario("repo:ChildRepository.read")
+def childRead(env: Environment) -> Operation:
+    ids: Iterator[str] = env.keys(env.dataset.children)
+    return lambda: DB.child.read(ChildRead(id=next(ids)))
+
+
+@scenario("repo:ArticleRepository.readLatest")
+def articleReadLatest(env: Environment) -> Operation:
+    return lambda: DB.article.readLatest(20)
+
+
+@scenario("repo:ArticleRepository.readAllChildSchoolArticles")
+def articleReadAllChildSchoolArticles(env: Environment) -> Operation:
+    codes: Iterator[str] = env.keys(env.dataset.schools)
+    return lambda: DB.article.readAllChildSchoolArticles(next(codes))
+
+
+@scenario("ingest:SeoulOpenData.prefetch")
+def openDataPrefetch(env: Environment) -> Operation:
+    # prefetch는 api 응답을 작업 디렉토리 아래에 저장하므로, 임시 디렉토리에서 실행합니다.
+    directory: str = tempfile.mkdtemp(prefix="seoul-opendata-bench-")
+
+    def run() -> None:
+        with chdir(directory):
+            OpenData.prefetch()
+    return run
+
+
+@scenario("route:GET /childschools/all")
+def routeChildSchoolsAll(env: Environment) -> Operation:
+    return lambda: get(env, "/childschools/all")
+
+
+@scenario("route:GET /articles/?limit=20")
+def routeArticlesFeed(env: Environment) -> Operation:
+    return lambda: get(env, "/articles/?limit=20")
+
+
+@scenario("route:GET /articles/events")
+def routeEventArticles(env: Environment) -> Operation:
+    return lambda: get(env, "/articles/events")
+
+
+@scenario("route:GET /articles/{child_school_id}")
+def routeChildSchoolArticles(env: Environment) -> Operation:
+    codes: Iterator[str] = env.keys(env.dataset.schools)
+    return lambda: get(env, f"/articles/{next(codes)}")
+
+
+@scenario("route:POST /articles/events")
+def routeCreateEventArticle(env: Environment) -> Operation:
+    body: dict[str, Any] = {
+        "title": "벤치마크 행사",
+        "content": "벤치마크에서 작성한 행사 게시글입니다.",
+        "attachments": [],
+        "location": "강남구",
+        "eventStart": "2023-05-13",
+        "eventEnd": "2023-05-14"
+    }
+
+    def run() -> Any:
+        resp = env.client.post("/articles/events", json=body)
+        assert resp.status_code == 200, f"POST /articles/events responded {resp.status_code}: {resp.text[:200]}"
+        return resp
+    return run
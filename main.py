@@ -1,28 +1,45 @@
+from contextlib import asynccontextmanager
+import os
+from time import perf_counter
+from typing import cast
 from pydantic import ValidationError
-from fastapi import FastAPI, Request, status
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
-from seoul_opendata.routes import user_router, child_school_router, child_router
-from seoul_opendata.firebase.controller import DBException
-from seoul_opendata.seoul_openapi import SeoulOpenData
+from seoul_opendata.routes import user_router, child_school_router, child_router, article_router, search_router, stats_router, ingest_router, metrics_router, admin_router
+from seoul_opendata.routes.admin_route import Profilers, authorized
+from seoul_opendata.routes.metrics_route import RequestDuration, RequestsInFlight
+from seoul_opendata.firebase.controller import DB, DBException
+from seoul_opendata.firebase.deadline import startDeadline
+from seoul_opendata.firebase.tracing import startTrace
+from seoul_opendata.utils.lazy import Lazy
+from seoul_opendata.utils.profiler import RequestProfiles, SamplingProfiler
+from seoul_opendata.search import Search
+from seoul_opendata.seoul_openapi import OpenData, Scheduler
+from setup import set_keys
 
-app = FastAPI()
-seoulOpenAPI = SeoulOpenData()
+base_router = APIRouter()
 
-seoulOpenAPI.prefetch()
-seoulOpenAPI.create()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 공공데이터는 요청 처리와 별개로 백그라운드에서 가져옵니다. 준비 여부는 /ready로 확인할 수 있습니다.
+    # 검색 색인도 첫 검색 요청을 기다리지 않고 백그라운드에서 만듭니다.
+    Scheduler.start()
+    Search.start()
+    yield
+    Scheduler.stop(timeout=5)
+    if cast(Lazy, DB).initialized:
+        DB.close()
 
 # Sample Endpoints
 
-@app.exception_handler(DBException)
 async def handle_db_exception(request: Request, exc: DBException):
     return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        status_code=exc.status,
         content=jsonable_encoder(exc.message)
     )
 
-@app.exception_handler(ValidationError)
 async def handle_type_exception(request: Request, exc: ValidationError):
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,8 +50,43 @@ async def handle_type_exception(request: Request, exc: ValidationError):
         })
     )
 
+async def trace_requests(request: Request, call_next):
+    # 요청마다 데이터베이스 호출 수, 시간, 크기를 응답 헤더로 알려주고, 느린 요청은 호출 트리를 로그로 남깁니다.
+    # 라우트별 응답 시간과 처리 중인 요청 수는 /metrics로 내보냅니다.
+    # 관리자 토큰과 X-Profile 헤더가 있으면 요청을 프로파일하고, 결과를 조회할 id를 X-Profile-Id 헤더로 알려줍니다.
+    # 요청마다 REQUEST_DEADLINE_MS의 시간 예산을 주고, 예산을 다 쓴 뒤의 데이터베이스 호출은 504로 바로 실패합니다.
+    trace = startTrace(request.method, request.url.path)
+    startDeadline()
+    profiler: SamplingProfiler | None = None
+    if "X-Profile" in request.headers and authorized(request) and Profilers.acquire(blocking=False):
+        profiler = SamplingProfiler().start()
+    RequestsInFlight.inc()
+    status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        RequestsInFlight.dec()
+        if profiler is not None:
+            profiler.stop()
+            Profilers.release()
+        route = request.scope.get("route")
+        RequestDuration.observe(
+            perf_counter() - trace.root.startedAt,
+            method=request.method,
+            route=route.path if route is not None else "unmatched",     # 경로 변수가 라벨 값을 늘리지 않도록 라우트 템플릿을 사용합니다.
+            status=str(status_code)
+        )
+    trace.finish(status_code)
+    response.headers.update(trace.headers())
+    if profiler is not None:
+        # 같은 시간에 다른 요청을 처리한 스레드의 샘플은 빼고, 이 요청의 라우트 처리기를 거치는 스택만 남깁니다.
+        endpoint = getattr(route, "endpoint", None)
+        response.headers["X-Profile-Id"] = RequestProfiles.put(profiler.collapsed(within=endpoint.__code__) if endpoint is not None else "")
+    return response
 
-@app.get("/")
+
+@base_router.get("/")
 def index():
     """
     index 요청입니다. 그냥 서버 상태 확인이에요.
@@ -44,7 +96,7 @@ def index():
     """
     return {"message": "Server Online!", "api_version": "20230530", "code": "OK"}
 
-@app.get("/echo/{text}")
+@base_router.get("/echo/{text}")
 def echo(text: str):
     """
     echo 요청입니다. URL 파라미터로 받은 문자열을 그대로 보내줍니다. 서버 상태 확인을 위해 존재합니다.
@@ -57,6 +109,45 @@ def echo(text: str):
     """
     return {"message": text, "code": "OK"}
 
-app.include_router(user_router)
-app.include_router(child_school_router)
-app.include_router(child_router)
+@base_router.get("/ready")
+def ready():
+    """
+    readiness 요청입니다. 첫 공공데이터를 읽어 들였는지 확인합니다.
+
+    Returns:
+        Message: 준비되었으면 데이터 버전을, 아니라면 503 응답을 보냅니다.
+    """
+    if not Scheduler.ready.is_set():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": "Open data is not loaded yet.", "code": "NOT_READY"}
+        )
+    return {"message": "Ready", "version": OpenData.version, "leader": Scheduler.leader, "code": "OK"}
+
+def create_app() -> FastAPI:
+    """
+    FastAPI 앱을 만듭니다. 모듈을 import할 때에는 아무 작업도 하지 않으며,
+    firebase와 공공데이터 api 클라이언트는 처음 사용될 때 초기화됩니다.
+
+    Returns:
+        FastAPI: 라우터와 예외 처리기가 등록된 앱
+    """
+    if "SEOUL_OPENDATA_KEY" not in os.environ:
+        set_keys()
+    
+    app = FastAPI(lifespan=lifespan)
+    app.middleware("http")(trace_requests)
+    app.add_exception_handler(DBException, handle_db_exception)
+    app.add_exception_handler(ValidationError, handle_type_exception)
+    
+    app.include_router(base_router)
+    app.include_router(user_router)
+    app.include_router(child_school_router)
+    app.include_router(child_router)
+    app.include_router(article_router)
+    app.include_router(search_router)
+    app.include_router(stats_router)
+    app.include_router(ingest_router)
+    app.include_router(metrics_router)
+    app.include_router(admin_router)
+    return app
@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from enum import StrEnum
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Final, NamedTuple, TypeVar
+
+import requests
+from firebase_admin import exceptions
+
+from seoul_opendata.firebase.replica import Miss
+from seoul_opendata.utils.metrics import Counter, Gauge
+
+T = TypeVar("T")
+
+# Error codes of firebase meaning the database is unreachable or failing, rather than the request being wrong.
+OutageCodes: Final[frozenset[str]] = frozenset({
+    exceptions.UNAVAILABLE, exceptions.DEADLINE_EXCEEDED, exceptions.INTERNAL, exceptions.UNKNOWN, exceptions.RESOURCE_EXHAUSTED
+})
+
+BreakerState: Final[Gauge] = Gauge("firebase_breaker_open", "Whether the circuit breaker of firebase operations is open (1) or half-open (0.5).")
+BreakerRejections: Final[Counter] = Counter("firebase_breaker_rejections_total", "Firebase operations not attempted because the breaker was open.")
+StaleReads: Final[Counter] = Counter("firebase_stale_reads_total", "Reads served from the last known good copy.")
+
+
+def isOutage(error: BaseException) -> bool:
+    """Whether the error of a database operation counts as a failure of the database."""
+    if isinstance(error, exceptions.FirebaseError):
+        return error.code in OutageCodes
+    return isinstance(error, (requests.RequestException, OSError))
+
+
+class State(StrEnum):
+    Closed = "closed"           # operations run.
+    Open = "open"               # operations are rejected until the cooldown passes.
+    HalfOpen = "half-open"      # a single probe is running.
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of database operations.
+    It opens after `failureThreshold` consecutive failures, counting operations slower than `slowCall` seconds as failures,
+    and rejects operations while open. Requests never probe the database themselves:
+    once `cooldown` seconds passed, the caller of `probe()` (a background thread) runs one operation and closes the breaker if it succeeds.
+    """
+    failureThreshold: Final[int]
+    cooldown: Final[float]
+    slowCall: Final[float]
+
+    def __init__(self, failureThreshold: int = 5, cooldown: float = 10.0, slowCall: float = 2.0) -> None:
+        """
+        Args:
+            failureThreshold (int, optional): consecutive failures opening the breaker.
+            cooldown (float, optional): seconds to wait after opening before probing the database.
+            slowCall (float, optional): operations slower than this (in seconds) count as failures, even if they succeeded.
+        """
+        self.failureThreshold = failureThreshold
+        self.cooldown = cooldown
+        self.slowCall = slowCall
+        self._lock = Lock()
+        self.state: State = State.Closed
+        self.failures: int = 0
+        self.openedAt: float = 0.0
+
+    @property
+    def retryAt(self) -> float:
+        """Monotonic time when the open breaker may be probed."""
+        return self.openedAt + self.cooldown
+
+    def allow(self) -> bool:
+        """Whether an operation may run now. Only the closed breaker lets operations through."""
+        return self.state is State.Closed
+
+    def record(self, elapsed: float, error: BaseException | None) -> bool:
+        """
+        Record the outcome of an operation.
+
+        Args:
+            elapsed (float): seconds the operation took.
+            error (BaseException | None): error of the failed operation, which counts only if it is an outage.
+
+        Returns:
+            bool: whether this outcome opened the breaker.
+        """
+        failed: bool = (error is not None and isOutage(error)) or elapsed >= self.slowCall
+        with self._lock:
+            if not failed:
+                self.failures = 0
+                return False
+            self.failures += 1
+            if self.state is State.Closed and self.failures >= self.failureThreshold:
+                self._transit(State.Open)
+                return True
+            return False
+
+    def probe(self, run: Callable[[], T]) -> T:
+        """
+        Run an operation on the open breaker whose cooldown passed. Closes the breaker if it succeeds in time, or reopens it.
+
+        Raises:
+            Exception: error of the operation.
+        """
+        with self._lock:
+            self._transit(State.HalfOpen)
+        startedAt: float = monotonic()
+        try:
+            result: T = run()
+        except Exception:
+            with self._lock:
+                self._transit(State.Open)
+            raise
+        with self._lock:
+            self._transit(State.Closed if monotonic() - startedAt < self.slowCall else State.Open)
+        return result
+
+    def _transit(self, state: State) -> None:
+        self.state = state
+        if state is State.Open:
+            self.openedAt = monotonic()
+        elif state is State.Closed:
+            self.failures = 0
+        BreakerState.set({State.Closed: 0, State.HalfOpen: 0.5, State.Open: 1}[state])
+
+
+class Refresh(NamedTuple):
+    """Operation to run again for refreshing a copy served stale."""
+    name: str
+    path: str
+    run: Callable[[], Any]
+
+
+class FallbackCache:
+    """
+    Last known good copies of database reads, in LRU order, served while the database is unavailable.
+    Results are kept by reference, as repositories don't modify the data they read, and copied only when served,
+    so that callers of a stale read can't alter the copy kept for the next one.
+    Keys of copies served stale are remembered, so that they can be refreshed once the database recovers.
+    """
+    capacity: Final[int]
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        """
+        Args:
+            capacity (int, optional): maximum number of copies. 0 disables the fallback.
+        """
+        self.capacity = capacity
+        self._lock = Lock()
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._served: dict[str, Refresh] = {}
+
+    def put(self, key: str, value: Any) -> None:
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def serve(self, key: str, refresh: Refresh) -> Any:
+        """Get a copy of the stored data, or `Miss`. Served keys are refreshed by `stalled()`'s caller later."""
+        with self._lock:
+            if key not in self._entries:
+                return Miss
+            value: Any = self._entries[key]
+            self._served[key] = refresh
+        StaleReads.inc()
+        return copyTree(value)
+
+    def stalled(self) -> dict[str, Refresh]:
+        """Take the keys served stale since the last call, with the operations refreshing them."""
+        with self._lock:
+            served, self._served = self._served, {}
+        return served
+
+
+def copyTree(value: Any) -> Any:
+    """Copy JSON-like data read from the database. Faster than `copy.deepcopy` for dicts and lists of plain values."""
+    if isinstance(value, dict):
+        return {key: copyTree(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [copyTree(child) for child in value]
+    return value
@@ -1,23 +1,95 @@
 from abc import ABCMeta, abstractmethod
-from datetime import date
-from turtle import st
-from typing import Any, Final, Type, cast
-from firebase_admin import db, initialize_app
+from concurrent.futures import Future
+from datetime import date, datetime
+import inspect
+import os
+from threading import Lock, Thread
+from time import monotonic, perf_counter, sleep
+from typing import Any, Callable, ClassVar, Final, Iterable, Type, TypeVar, cast
+from firebase_admin import App, db, get_app, initialize_app
 from firebase_admin.credentials import Certificate
 from pydantic import BaseModel
 from seoul_opendata.models import Article, Child, ChildSchool, Location, EstablishType, ParentUser, Gender, ChildSchoolUser, article, child
 
+from seoul_opendata.firebase.breaker import BreakerRejections, CircuitBreaker, FallbackCache, Refresh, State, isOutage
+from seoul_opendata.firebase.deadline import Deadline, currentDeadline
+from seoul_opendata.firebase.hedging import Hedger, readKind
+from seoul_opendata.firebase.indexes import FeedField, IndexRoot, buildIndex, feedPath, feedUpdates, indexPath, indexUpdates, walkEntries
+from seoul_opendata.firebase.replica import LocalReplica, Miss
+from seoul_opendata.firebase.tracing import markStale, operation, traced
+from seoul_opendata.firebase.versions import SubtreeVersions
+from seoul_opendata.firebase.writebehind import WriteBehindQueue
 from seoul_opendata.models.payloads import ArticleCreate, ArticleData, ArticleDelete, ArticleRead, ArticleUpdate, ChildCreate, ChildData, ChildDelete, ChildRead, ChildSchoolCreate, ChildSchoolData, ChildSchoolDelete, ChildSchoolRead, ChildSchoolUpdate, ChildSchoolUserCreate, ChildSchoolUserData, ChildSchoolUserDelete, ChildSchoolUserRead, ChildSchoolUserUpdate, ChildUpdate, Message, UserCreate, UserData, UserDelete, UserRead, UserUpdate
-from seoul_opendata.utils.dateutils import str2date, yyyy_mm_dd2date
+from seoul_opendata.utils.dateutils import date2str, date2yyyy_mm_dd, str2date, yyyy_mm_dd2date
+from seoul_opendata.utils.lazy import Lazy
+from seoul_opendata.utils.uuidutils import is_uuid7, uuid7, uuid7_bound
 
-CRED_OBJ: Final[Certificate] = Certificate("firebase_cert.json")
+T = TypeVar("T")
+WriteListener = Callable[[str, Any, Any], None]
+CredentialPath: Final[str] = os.environ.get("FIREBASE_CREDENTIAL", "firebase_cert.json")
+DatabaseURL: Final[str] = "https://project-seoulmom-default-rtdb.firebaseio.com/"
+# Subtrees kept in the local replica, separated by commas. e.g. `childschool,articles/events`. Empty disables the replica.
+ReplicaSubtrees: Final[tuple[str, ...]] = tuple(
+    subtree.strip() for subtree in os.environ.get("FIREBASE_REPLICA", "").split(",") if subtree.strip()
+)
+ReplicaMaxStaleness: Final[float] = float(os.environ.get("FIREBASE_REPLICA_MAX_STALENESS", 5))     # seconds
+# Seconds to coalesce repository writes into a single multi-path update. 0 writes synchronously.
+WriteBehindWindow: Final[float] = float(os.environ.get("FIREBASE_WRITE_BEHIND_WINDOW", 0))
+# Seconds a single firebase HTTP request may take before it fails.
+HttpTimeout: Final[float] = float(os.environ.get("FIREBASE_HTTP_TIMEOUT", 10))
+# Circuit breaker of database operations: consecutive failures opening it, seconds until probing again,
+# and milliseconds after which a successful operation still counts as a failure.
+BreakerFailures: Final[int] = int(os.environ.get("FIREBASE_BREAKER_FAILURES", 5))
+BreakerCooldown: Final[float] = float(os.environ.get("FIREBASE_BREAKER_COOLDOWN", 10))
+BreakerSlowCall: Final[float] = float(os.environ.get("FIREBASE_BREAKER_SLOW_MS", 2000)) / 1000
+# Number of last known good copies of reads, served while the database is unavailable. 0 disables the fallback.
+FallbackEntries: Final[int] = int(os.environ.get("FIREBASE_FALLBACK_ENTRIES", 10_000))
+# Percentile of the latest latencies of a read, after which a duplicate of the read is sent. 0 disables hedging.
+HedgePercentile: Final[float] = float(os.environ.get("FIREBASE_HEDGE_PERCENTILE", 0))
+# Operations safe to send twice.
+IdempotentOperations: Final[frozenset[str]] = frozenset({"get", "query"})
 
-initialize_app(CRED_OBJ, {"databaseURL": "https://project-seoulmom-default-rtdb.firebaseio.com/"})
+
+def initializeFirebase() -> App:
+    """Initialize the default firebase app, unless it is already initialized."""
+    try:
+        return get_app()
+    except ValueError:
+        return initialize_app(Certificate(CredentialPath), {"databaseURL": DatabaseURL, "httpTimeout": HttpTimeout})
 
 class DBException(Exception):
     """Base class of exception occurred in controller layer."""
     message: Message
+    status: ClassVar[int] = 422     # HTTP status of the error response.
+
+    def __init__(self, message: Message) -> None:
+        super().__init__(message)
+        self.message = message
+
+class DatabaseUnavailable(DBException):
+    """The database failed, or the circuit breaker is open, and there is no copy of the data to serve instead."""
+    status = 503
+    path: str
     
+    def __init__(self, path: str) -> None:
+        super().__init__({
+            "message": f"Database is unavailable. Failed to access {path}.",
+            "code": "DATABASE_UNAVAILABLE"
+        })
+        self.path = path
+
+class DeadlineExceeded(DBException):
+    """The request spent its time budget before a database operation finished."""
+    status = 504
+    path: str
+    
+    def __init__(self, path: str, deadline: Deadline) -> None:
+        super().__init__({
+            "message": f"Request exceeded its deadline of {deadline.budget * 1000:.0f} ms. Gave up on accessing {path}.",
+            "code": "DEADLINE_EXCEEDED"
+        })
+        self.path = path
+
 class EntryNotExist(DBException):
     entryType: Type[BaseModel]
     key: str
@@ -47,12 +119,204 @@ class CRUDRepository(metaclass=ABCMeta):
     """Repository base class supporting CRUD operations."""
     repo: Final[db.Reference]
     controller: "FirebaseController"
+    indexed: ClassVar[tuple[str, ...]] = ()     # fields of the stored data with secondary index, read by `lookup()`.
+    queried: ClassVar[tuple[str, ...]] = ()     # fields of the stored data used in equality queries.
+    ordered: ClassVar[tuple[str, ...]] = ()     # fields of the stored data used in range queries.
+    keyDepth: ClassVar[int] = 1                 # depth of entry keys under the repository node.
+    feed: ClassVar[bool] = False                # whether entries with nested keys are listed in the feed index.
+    durable: ClassVar[bool] = False             # whether writes wait until committed, even in write-behind mode.
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Trace public methods of repositories, so that database operations of a request are grouped by the methods making them."""
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(attr):
+                setattr(cls, name, traced(f"{cls.__name__}.{name}")(attr))
     
     def __init__(self, repo: db.Reference, controller: "FirebaseController") -> None:
         super().__init__()
         self.repo = repo
         self.controller = controller
     
+    @property
+    def subtree(self) -> str:
+        """Path of this repository, relative to the database root."""
+        return self.repo.path.strip("/")
+    
+    def path(self, key: str) -> str:
+        """Get path of the entry, relative to the database root."""
+        return f"{self.subtree}/{key}"
+    
+    def fetch(self, key: str = "") -> Any:
+        """
+        Read stored data of the entry, or of the whole repository if the key is omitted.
+        Data may be served from the local replica, so don't use this to read data to be written back.
+        """
+        return self.controller.read(self.path(key) if key else self.subtree)
+    
+    def current(self, key: str) -> Any:
+        """Read stored data of the entry to be written back, including writes of this worker not committed yet."""
+        return self.controller.current(self.path(key))
+    
+    def store(self, key: str, before: Any, after: Any, touch: Iterable[str] = ()) -> Future:
+        """
+        Write an entry together with its secondary index entries, in a single multi-path update.
+        In write-behind mode the update is queued, and coalesced with other writes of the window,
+        unless the repository is `durable`, whose writes wait until committed and raise its error.
+
+        Args:
+            key (str): key of the entry in this repository.
+            before (Any): stored data before the write. None if the entry is created.
+            after (Any): stored data after the write. None deletes the entry.
+            touch (Iterable[str]): extra paths whose readers embed the entry.
+
+        Returns:
+            Future: resolved when the write is committed.
+        """
+        updates: dict[str, Any] = {self.path(key): after} | indexUpdates(self.subtree, self.indexed, key, before, after)
+        if self.feed:
+            updates |= feedUpdates(self.subtree, key, after)
+        future: Future = self.controller.write(updates, touch, lambda: self.controller.notifyWrite(self.path(key), before, after))
+        if self.durable:
+            future.result()
+        return future
+    
+    def lookup(self, field: str, value: Any) -> list[str]:
+        """
+        Find keys of the entries whose field equals to the value, using secondary index.
+
+        Args:
+            field (str): indexed field of the stored data.
+            value (Any): value to look up.
+
+        Returns:
+            list[str]: keys of the matching entries.
+        """
+        assert field in self.indexed, f"{field} is not indexed in {type(self).__name__}."
+        node: Any = self.controller.read(indexPath(self.subtree, field, value))
+        return [key for key, _ in walkEntries(node, self.keyDepth)]
+    
+    def query(
+        self,
+        field: str,
+        *,
+        equalTo: Any = None,
+        startAt: Any = None,
+        endAt: Any = None,
+        limit: int | None = None,
+        group: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Query entries filtered by the database, using `.indexOn` rules generated by `seoul_opendata.firebase.rules`.
+
+        Args:
+            field (str): queried or ordered field of the stored data.
+            equalTo (Any, optional): match entries whose field equals to the value.
+            startAt (Any, optional): inclusive lower bound of the field. Ignored if `equalTo` is given.
+            endAt (Any, optional): inclusive upper bound of the field. Ignored if `equalTo` is given.
+            limit (int | None, optional): maximum number of entries to fetch, from the lowest value.
+            group (str | None, optional): child node to query, for repositories with nested keys.
+
+        Returns:
+            dict[str, Any]: stored data of the matching entries, ordered by the field.
+        """
+        assert field in self.queried + self.ordered, f"{field} is not queryable in {type(self).__name__}."
+        assert (group is None) == (self.keyDepth == 1), "group is required only for repositories with nested keys."
+        
+        replica: LocalReplica | None = self.controller.replica
+        if replica is not None:
+            entries: Any = replica.query(
+                self.subtree if group is None else f"{self.subtree}/{group}", field,
+                equalTo=equalTo, startAt=startAt, endAt=endAt, limit=limit
+            )
+            if entries is not Miss:
+                return entries
+        
+        node: db.Reference = self.repo if group is None else self.repo.child(group)
+        query: db.Query = node.order_by_child(field)
+        if equalTo is not None:
+            query = query.equal_to(equalTo)
+        else:
+            if startAt is not None:
+                query = query.start_at(startAt)
+            if endAt is not None:
+                query = query.end_at(endAt)
+        if limit is not None:
+            query = query.limit_to_first(limit)
+        return self.controller.call(
+            "query", f"{node.path}?orderBy={field}", query.get,
+            cacheKey=f"{node.path}?orderBy={field}&equalTo={equalTo!r}&startAt={startAt!r}&endAt={endAt!r}&limit={limit}"
+        ) or {}    # type: ignore
+    
+    def latest(
+        self,
+        limit: int,
+        *,
+        startAt: str | None = None,
+        endAt: str | None = None,
+        exclusiveEnd: bool = False,
+        group: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Read entries with the greatest keys in the key range, greatest first.
+        Repositories with nested keys are read from the feed index unless the group is given.
+
+        Args:
+            limit (int): maximum number of entries to read.
+            startAt (str | None, optional): inclusive lower bound of the (last segment of) keys.
+            endAt (str | None, optional): upper bound of the (last segment of) keys.
+            exclusiveEnd (bool, optional): exclude the entry whose key equals to `endAt`. Used to read the next page.
+            group (str | None, optional): child node to read, for repositories with nested keys.
+
+        Returns:
+            dict[str, Any]: stored data of the entries, mapped from their keys relative to the repository (or to the group).
+        """
+        assert group is None or self.keyDepth > 1, "group is only for repositories with nested keys."
+        useFeed: bool = group is None and self.keyDepth > 1
+        node: db.Reference = self.controller.root.child(feedPath(self.subtree)) if useFeed else self.repo
+        if group is not None:
+            node = node.child(group)
+        
+        replica: LocalReplica | None = self.controller.replica
+        entries: Any = Miss
+        if replica is not None:
+            entries = replica.query(node.path, None, startAt=startAt, endAt=endAt, limit=limit + exclusiveEnd, last=True)
+        if entries is Miss:
+            entries = self.rangeByKey(node, startAt, endAt, limit + exclusiveEnd)
+        keys: list[str] = [k for k in reversed(entries) if not (exclusiveEnd and k == endAt)][:limit]
+        
+        if useFeed:
+            return {entries[k]: data for k in keys if (data := self.fetch(entries[k])) is not None}
+        return {k: entries[k] for k in keys}
+    
+    def rangeByKey(self, node: db.Reference, startAt: str | None, endAt: str | None, limit: int) -> dict[str, Any]:
+        """Read children of the node with the greatest keys in the key range, in the order of keys."""
+        query: db.Query = node.order_by_key()
+        if startAt is not None:
+            query = query.start_at(startAt)
+        if endAt is not None:
+            query = query.end_at(endAt)
+        query = query.limit_to_last(limit)
+        return self.controller.call(
+            "query", f"{node.path}?orderBy=$key", query.get,
+            cacheKey=f"{node.path}?orderBy=$key&startAt={startAt!r}&endAt={endAt!r}&limitToLast={limit}"
+        ) or {}     # type: ignore
+    
+    def rebuildIndexes(self) -> None:
+        """Rebuild secondary indexes (and the feed) of this repository from the stored data, removing indexes of fields no longer indexed."""
+        node: db.Reference = self.controller.root.child(f"{IndexRoot}/{self.subtree}")
+        if not self.indexed and not self.feed:
+            node.delete()
+            return
+        entries: list[tuple[str, Any]] = list(walkEntries(self.repo.get(), self.keyDepth))
+        index: dict[str, Any] = buildIndex(self.indexed, entries)
+        if self.feed and entries:
+            index[FeedField] = {key.rsplit("/", 1)[-1]: key for key, _ in entries}
+        if index:
+            node.set(index)
+        else:
+            node.delete()
+    
     @abstractmethod
     def create(self, payload: dict[str, Any]) -> Any:
         """Create new element in this repository."""
@@ -71,13 +335,14 @@ class CRUDRepository(metaclass=ABCMeta):
     
 class ParentUserRepository(CRUDRepository):
     """CRUD Repository for ParentUser."""
+    durable = True      # accounts must not be acknowledged and then lost.
     
     @property
     def childRepo(self) -> "ChildRepository":
         return self.controller.child
     
     def create(self, payload: UserCreate) -> ParentUser:
-        prev: dict | None = self.repo.child(payload.id).get()   # type: ignore
+        prev: dict | None = self.current(payload.id)
         if prev is not None:
             raise EntryAlreadyExist(ParentUser, payload.id)
         
@@ -91,23 +356,22 @@ class ParentUserRepository(CRUDRepository):
             gender=payload.gender,
             password=payload.password
         )
-        self.repo.child(user.id).update(user.dict())
+        self.store(user.id, None, user.dict())
         return user
     
     def read(self, payload: UserRead) -> ParentUser:
         assert self.childRepo is not None       # Type assertion. Always True if initialized properly.
         
-        data: UserData | None = self.repo.child(payload.id).get()  # type: ignore
+        data: UserData | None = self.fetch(payload.id)  # type: ignore
         if data is None:
             raise EntryNotExist(ParentUser, payload.id)
         
-        data["children"] = [self.childRepo.read(ChildRead(id=cid)) for cid in data["children"]]   # type: ignore
+        children: list[Child] = [self.childRepo.read(ChildRead(id=cid)) for cid in data["children"]]   # type: ignore
         
-        return ParentUser(**data)   # type: ignore since resolved from above.
+        return ParentUser(**(data | {"children": children}))   # type: ignore since resolved from above.
 
     def update(self, payload: UserUpdate) -> ParentUser | None:
-        node: db.Reference = self.repo.child(payload.id)
-        data: dict | None = node.get()  # type: ignore
+        data: dict | None = self.current(payload.id)
         if data is None:
             raise EntryNotExist(ParentUser, payload.id)
         
@@ -122,22 +386,23 @@ class ParentUserRepository(CRUDRepository):
             user.location = payload.location
         if payload.gender is not None:
             user.gender = payload.gender
-        node.update(user.dict())    # update firebase data.
+        self.store(payload.id, data, user.dict())    # update firebase data.
         return user
     
     def delete(self, payload: UserDelete) -> ParentUser:
-        node: db.Reference = self.repo.child(payload.id)
-        data: dict | None = node.get()  # type: ignore
+        data: dict | None = self.current(payload.id)
         if data is None:
             raise EntryNotExist(ParentUser, payload.id)
     
         user = ParentUser(**data)
-        node.delete()
+        self.store(payload.id, data, None)
         return user
 
 
 class ChildSchoolRepository(CRUDRepository):
     """CRUD Repository for ChildSchool."""
+    queried = ChildSchool.__queried__
+    ordered = ChildSchool.__ordered__
     
     @property
     def childRepo(self) -> "ChildRepository":
@@ -146,7 +411,7 @@ class ChildSchoolRepository(CRUDRepository):
     def create(self, payload: ChildSchoolCreate) -> ChildSchool:
         assert self.childRepo is not None
         
-        prev: dict | None = self.repo.child(payload.code).get()   # type: ignore
+        prev: dict | None = self.current(payload.code)
         if prev is not None:
             raise EntryAlreadyExist(ChildSchoolCreate, payload.code)
         
@@ -158,42 +423,66 @@ class ChildSchoolRepository(CRUDRepository):
             tel=payload.tel,
             location=payload.location,
             establishType=payload.establishType,
+            establishAt=payload.establishAt,
             openingTime=payload.openingTime,
+            latitude=payload.latitude,
+            longitude=payload.longitude,
             articles=[],
             children=[cast(Child, self.childRepo.read(ChildRead(id=cid))) for cid in payload.children]
         )
         
-        self.repo.child(childSchool.code).update(childSchool.dict())
+        self.store(
+            childSchool.code, None, childSchool.dict(),
+            touch=[f"articles/{childSchool.code}"]      # articles embed their child school.
+        )
         return childSchool
     
     def readAll(self) -> dict[str, ChildSchool]:
         assert self.childRepo is not None       # Type assertion. Always True if initialized properly.
         
-        data: dict[str, ChildSchoolData] = self.repo.get()  # type: ignore
+        data: dict[str, ChildSchoolData] = self.fetch()  # type: ignore
         res: dict[str, ChildSchool] = {}
         
         if data is None:
             return {}
         
         for code, entry in data.items():
-            entry["children"] = [self.childRepo.read(ChildRead(id=cid)) for cid in entry["children"]]   # type: ignore
-            res[code] = ChildSchool(**entry)
+            res[code] = self.hydrate(entry)
     
         return res
     
+    def hydrate(self, data: ChildSchoolData) -> ChildSchool:
+        """Build ChildSchool model from the stored data."""
+        return ChildSchool(**(data | {"children": [self.childRepo.read(ChildRead(id=cid)) for cid in data.get("children", [])]}))
+    
+    def readByLocation(self, location: Location) -> dict[str, ChildSchool]:
+        return {code: self.hydrate(entry) for code, entry in self.query("location", equalTo=location).items()}
+    
+    def readByEstablishType(self, establishType: EstablishType) -> dict[str, ChildSchool]:
+        return {code: self.hydrate(entry) for code, entry in self.query("establishType", equalTo=establishType).items()}
+    
+    def readEstablishedBetween(self, since: date | None = None, until: date | None = None) -> dict[str, ChildSchool]:
+        data: dict[str, ChildSchoolData] = self.query(
+            "establishAt",
+            startAt=date2str(since) if since is not None else None,
+            endAt=date2str(until) if until is not None else None
+        )
+        return {code: self.hydrate(entry) for code, entry in data.items()}
+    
     def read(self, payload: ChildSchoolRead) -> ChildSchool:
         assert self.childRepo is not None       # Type assertion. Always True if initialized properly.
-        data: ChildSchoolData | None = cast(ChildSchoolData | None, self.repo.child(payload.code).get())
+        data: ChildSchoolData | None = cast(ChildSchoolData | None, self.fetch(payload.code))
         if data is None:
             raise EntryNotExist(ChildSchool, payload.code)
         
-        data["children"] = [self.childRepo.read(ChildRead(id=cid)) for cid in data["children"]]   # type: ignore
-        
-        return ChildSchool(**data)
+        return self.hydrate(data)
 
     def update(self, payload: ChildSchoolUpdate) -> ChildSchool:
-        node: db.Reference = self.repo.child(payload.code)
-        childSchool = ChildSchool(**cast(ChildSchoolData, node.get()))
+        data: ChildSchoolData | None = cast(ChildSchoolData | None, self.current(payload.code))
+        if data is None:
+            raise EntryNotExist(ChildSchool, payload.code)
+        
+        childSchool = ChildSchool(**(data | {"children": [self.childRepo.read(ChildRead(id=cid)) for cid in data["children"]]}))
         
         if payload.name is not None:
             childSchool.name = payload.name
@@ -210,13 +499,14 @@ class ChildSchoolRepository(CRUDRepository):
                 in payload.children
             ]
         
-        
-        node.update(childSchool.dict())    # update firebase data.
+        self.store(
+            payload.code, data, childSchool.dict(),    # update firebase data.
+            touch=[f"articles/{payload.code}"]
+        )
         return childSchool
     
     def delete(self, payload: ChildSchoolDelete) -> ChildSchool:
-        node: db.Reference = self.repo.child(payload.code)
-        data: ChildSchoolData | None = node.get()  # type: ignore
+        data: ChildSchoolData | None = self.current(payload.code)
         
         if data is None:
             raise EntryNotExist(ChildSchool, payload.code)
@@ -224,7 +514,7 @@ class ChildSchoolRepository(CRUDRepository):
         data["children"] = [self.childRepo.read(ChildRead(id=cid)) for cid in data["children"]]   # type: ignore
         
         childSchool = ChildSchool(**data)
-        node.delete()
+        self.store(payload.code, data, None, touch=[f"articles/{payload.code}"])
         return childSchool
 
 
@@ -238,6 +528,7 @@ class ChildSchoolNotExist(DBException):
 
 class ChildSchoolUserRepository(CRUDRepository):
     """CRUD Repository for ChildSchoolUser."""
+    durable = True
     @property
     def childSchoolRepo(self) -> ChildSchoolRepository:
         return self.controller.childSchool
@@ -256,11 +547,11 @@ class ChildSchoolUserRepository(CRUDRepository):
             password=payload.password,
             childSchool=childSchool
         )
-        self.repo.child(user.id).update(user.dict())
+        self.store(user.id, None, user.dict())
         return user
     
     def read(self, payload: ChildSchoolUserRead) -> ChildSchoolUser:
-        data: ChildSchoolUserData | None = cast(ChildSchoolUserData | None, self.repo.child(payload.id).get())
+        data: ChildSchoolUserData | None = cast(ChildSchoolUserData | None, self.fetch(payload.id))
         if data is None:
             raise EntryNotExist(ChildSchoolUser, payload.id)
         
@@ -270,8 +561,7 @@ class ChildSchoolUserRepository(CRUDRepository):
         )
 
     def update(self, payload: ChildSchoolUserUpdate) -> ChildSchoolUser:
-        node: db.Reference = self.repo.child(payload.id)
-        data: ChildSchoolUserData | None = cast(ChildSchoolUserData | None, node.get())
+        data: ChildSchoolUserData | None = cast(ChildSchoolUserData | None, self.current(payload.id))
         
         if data is None:
             raise EntryNotExist(ChildSchoolUser, payload.id)
@@ -290,12 +580,11 @@ class ChildSchoolUserRepository(CRUDRepository):
         if payload.email is not None:
             user.email = payload.email
         
-        node.update(user.dict())    # update firebase data.
+        self.store(payload.id, data, user.dict())    # update firebase data.
         return user
     
     def delete(self, payload: ChildSchoolUserDelete) -> ChildSchoolUser:
-        node: db.Reference = self.repo.child(payload.id)
-        data: ChildSchoolUserData | None = node.get()  # type: ignore
+        data: ChildSchoolUserData | None = self.current(payload.id)
         
         if data is None:
             raise EntryNotExist(ChildSchoolUser, payload.id)
@@ -304,12 +593,14 @@ class ChildSchoolUserRepository(CRUDRepository):
             childSchool=cast(ChildSchool, self.childSchoolRepo.read(ChildSchoolRead(code=payload.id))),
             **data
         )
-        node.delete()
+        self.store(payload.id, data, None)
         return user
 
 
 class ChildRepository(CRUDRepository):
     """CRUD Repository for Child."""
+    queried = Child.__queried__
+    ordered = Child.__ordered__
     
     @property
     def parentUserRepo(self) -> ParentUserRepository:
@@ -319,6 +610,15 @@ class ChildRepository(CRUDRepository):
     def childSchoolRepo(self) -> ChildSchoolRepository:
         return self.controller.childSchool
     
+    @staticmethod
+    def embeddedIn(*schoolCodes: str | None) -> list[str]:
+        """Paths of entries embedding children of the given child schools."""
+        return [
+            path
+            for code in set(schoolCodes) if code is not None
+            for path in (f"childschool/{code}", f"articles/{code}")
+        ]
+    
     def create(self, payload: ChildCreate) -> Child:
         parent: ParentUser | None = self.parentUserRepo.read(UserRead(id=payload.parentId))
         if parent is None:
@@ -335,11 +635,14 @@ class ChildRepository(CRUDRepository):
             school=childSchool
         )
         child.parent.children.append(child)
-        self.repo.child(child.id).update(child.dict())
+        self.store(
+            str(child.id), None, child.dict(),
+            touch=self.embeddedIn(payload.schoolCode)
+        )
         return child
     
     def read(self, payload: ChildRead) -> Child:
-        data: ChildData | None = cast(ChildData | None, self.repo.child(payload.id).get())
+        data: ChildData | None = cast(ChildData | None, self.fetch(payload.id))
         
         if data is None:
             raise EntryNotExist(Child, payload.id)
@@ -356,9 +659,27 @@ class ChildRepository(CRUDRepository):
             school=school
         )
 
+    def hydrate(self, data: ChildData) -> Child:
+        """Build Child model from the stored data."""
+        school: ChildSchool | None = None
+        if (schoolCode := data.get("schoolCode")) is not None:
+            school = self.childSchoolRepo.read(ChildSchoolRead(code=schoolCode))
+        
+        return Child(
+            name=data["name"],
+            age=data["age"],
+            parent=self.parentUserRepo.read(UserRead(id=data["parentId"])),
+            school=school
+        )
+    
+    def readByParent(self, parentId: str) -> dict[str, Child]:
+        return {cid: self.hydrate(entry) for cid, entry in self.query("parentId", equalTo=parentId).items()}
+    
+    def readBySchool(self, schoolCode: str) -> dict[str, Child]:
+        return {cid: self.hydrate(entry) for cid, entry in self.query("schoolCode", equalTo=schoolCode).items()}
+    
     def update(self, payload: ChildUpdate) -> Child:
-        node: db.Reference = self.repo.child(payload.id)
-        data: ChildData | None = cast(ChildData | None, node.get())
+        data: ChildData | None = cast(ChildData | None, self.current(payload.id))
         if data is None:
             raise EntryNotExist(Child, payload.id)
         
@@ -382,12 +703,14 @@ class ChildRepository(CRUDRepository):
         if payload.schoolCode is not None:
             child.school = self.childSchoolRepo.read(ChildSchoolRead(code=payload.schoolCode))
         
-        node.update(child.dict())    # update firebase data.
+        self.store(
+            payload.id, data, child.dict(),    # update firebase data.
+            touch=self.embeddedIn(data["schoolCode"], payload.schoolCode)
+        )
         return child
     
     def delete(self, payload: ChildDelete) -> Child:
-        node: db.Reference = self.repo.child(payload.id)
-        data: ChildData | None = node.get() # type: ignore
+        data: ChildData | None = self.current(payload.id)
         if data is None:
             raise EntryNotExist(Child, payload.id)
         
@@ -402,37 +725,70 @@ class ChildRepository(CRUDRepository):
             parent=parent,
             school=school
         )
-        node.delete()
+        self.store(
+            payload.id, data, None,
+            touch=self.embeddedIn(schoolCode)
+        )
         return child
 
 class ArticleRepository(CRUDRepository):
     """CRUD Repository for Article"""
+    indexed = Article.__indexed__
+    ordered = Article.__ordered__
+    keyDepth = 2        # articles/{childSchoolId | "events"}/{articleId}
+    feed = True         # article ids are time-sortable, so that the feed lists the latest articles of every group.
     
     @property
     def childSchoolRepo(self) -> ChildSchoolRepository:
         return self.controller.childSchool
     
+    def hydrate(self, articleId: str, data: ArticleData, childSchool: ChildSchool | None = None) -> Article:
+        """
+        Build Article model from the stored data.
+        School of the article is read from the database unless it is given, or the article is an event article.
+        """
+        if childSchool is None and (childSchoolId := data.get("childSchoolId")) is not None:
+            childSchool = self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
+        
+        return Article(
+            id=articleId,
+            title=data["title"],
+            content=data["content"],
+            attachments=data.get("attachments", []),
+            location=Location(data["location"]),
+            latitude=data.get("latitude"),
+            longitude=data.get("longitude"),
+            uploadAt=yyyy_mm_dd2date(data["uploadAt"]),
+            eventStart=yyyy_mm_dd2date(eventStart) if (eventStart := data.get("eventStart")) else None,
+            eventEnd=yyyy_mm_dd2date(eventEnd) if (eventEnd := data.get("eventEnd")) else None,
+            childSchool=childSchool
+        )
+    
+    @staticmethod
+    def build(payload: ArticleCreate, childSchool: ChildSchool | None) -> Article:
+        """Build new Article model from the payload, with a time-sortable id of its upload time."""
+        article = Article(
+            title=payload.title,
+            content=payload.content,
+            attachments=payload.attachments,
+            location=Location(payload.location),
+            latitude=payload.latitude,
+            longitude=payload.longitude,
+            eventStart=yyyy_mm_dd2date(payload.eventStart) if payload.eventStart else None,
+            eventEnd=yyyy_mm_dd2date(payload.eventEnd) if payload.eventEnd else None,
+            childSchool=childSchool
+        )
+        if payload.uploadAt is not None:
+            # uploadAt may carry time, like `2023-04-29 02:37:02.0` of open data.
+            uploadAt: datetime = datetime.fromisoformat(payload.uploadAt[:19])
+            article.id = uuid7(uploadAt)
+            article.uploadAt = uploadAt.date()
+        return article
+    
     def createEventArticle(self, payload: ArticleCreate) -> Article:
         # event article
-        if payload.uploadAt is not None:
-            article = Article(
-                title=payload.title,
-                content=payload.content,
-                attachments=payload.attachments,
-                location=Location(payload.location),
-                uploadAt=yyyy_mm_dd2date(payload.uploadAt),
-                childSchool=None
-            )
-        else:
-            article = Article(
-                title=payload.title,
-                content=payload.content,
-                attachments=payload.attachments,
-                location=Location(payload.location),
-                childSchool=None
-            )
-            
-        self.repo.child(f"events/{article.id}").update(article.dict())
+        article: Article = self.build(payload, None)
+        self.store(f"events/{article.id}", None, article.dict())
         return article
     
     def createChildSchoolArticle(self, payload: ArticleCreate) -> Article:
@@ -442,25 +798,8 @@ class ArticleRepository(CRUDRepository):
         if childSchool is None:
             raise EntryNotExist(ChildSchool, childSchoolId)
         
-        if payload.uploadAt is not None:
-            article = Article(
-                title=payload.title,
-                content=payload.content,
-                attachments=payload.attachments,
-                location=Location(payload.location),
-                uploadAt=yyyy_mm_dd2date(payload.uploadAt),
-                childSchool=childSchool
-            )
-        else:
-            article = Article(
-                title=payload.title,
-                content=payload.content,
-                attachments=payload.attachments,
-                location=Location(payload.location),
-                childSchool=childSchool
-            )
-        
-        self.repo.child(f"{childSchoolId}/{article.id}").update(article.dict())
+        article: Article = self.build(payload, childSchool)
+        self.store(f"{childSchoolId}/{article.id}", None, article.dict())
         return article
     
     def create(self, payload: ArticleCreate) -> Article:
@@ -471,7 +810,7 @@ class ArticleRepository(CRUDRepository):
             return self.createChildSchoolArticle(payload)
     
     def readAll(self) -> dict[str, dict[str, Article]]:
-        data: dict[str, dict[str, ArticleData]] | None = cast(dict[str, dict[str, ArticleData]] | None, self.repo.get())
+        data: dict[str, dict[str, ArticleData]] | None = cast(dict[str, dict[str, ArticleData]] | None, self.fetch())
         res: dict[str, dict[str, Article]] = {}
         
         if data is None:
@@ -480,100 +819,156 @@ class ArticleRepository(CRUDRepository):
         for childSchool, articles in data.items():
             res[childSchool] = {}
             for articleId, articleData in articles.items():
-                childSchoolId = articleData["childSchoolId"]
-                if childSchoolId is None:
-                    res[childSchool][articleId] = Article(
-                        title=articleData["title"],
-                        content=articleData["content"],
-                        attachments=articleData["attachments"],
-                        location=Location(articleData["location"]),
-                        uploadAt=str2date(articleData["uploadAt"]),
-                        childSchool=None
-                    )
-                else:
-                    res[childSchool][articleId] = Article(
-                        title=articleData["title"],
-                        content=articleData["content"],
-                        attachments=articleData["attachments"],
-                        location=Location(articleData["location"]),
-                        uploadAt=str2date(articleData["uploadAt"]),
-                        childSchool=self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
-                    )
+                res[childSchool][articleId] = self.hydrate(articleId, articleData)
     
         return res
     
     def readAllEventArticles(self) -> dict[str, Article]:
-        data: dict[str, ArticleData] | None = cast(dict[str, ArticleData] | None, self.repo.child("events").get())
-        res: dict[str, Article] = {}
+        data: dict[str, ArticleData] | None = cast(dict[str, ArticleData] | None, self.fetch("events"))
         
         if data is None:
             return {}
         
-        for articleId, articleData in data.items():
-            res[articleId] = Article(
-                title=articleData["title"],
-                content=articleData["content"],
-                attachments=articleData["attachments"],
-                location=Location(articleData["location"]),
-                uploadAt=str2date(articleData["uploadAt"]),
-                childSchool=None
-            )
-    
-        return res
+        return {articleId: self.hydrate(articleId, articleData) for articleId, articleData in data.items()}
     
     def readAllChildSchoolArticles(self, childSchoolId: str) -> dict[str, Article]:
-        data: dict[str, ArticleData] | None = cast(dict[str, ArticleData] | None, self.repo.child(childSchoolId).get())
-        res: dict[str, Article] = {}
+        data: dict[str, ArticleData] | None = cast(dict[str, ArticleData] | None, self.fetch(childSchoolId))
         
         if data is None:
             return {}
 
         childSchool = self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
-        
-        for articleId, articleData in data.items():
-            res[articleId] = Article(
-                title=articleData["title"],
-                content=articleData["content"],
-                attachments=articleData["attachments"],
-                location=Location(articleData["location"]),
-                uploadAt=str2date(articleData["uploadAt"]),
-                childSchool=childSchool
-            )
-    
-        return res
+        return {articleId: self.hydrate(articleId, articleData, childSchool) for articleId, articleData in data.items()}
     
     def readEventArticle(self, payload: ArticleRead) -> Article:
-        data: ArticleData | None = cast(ArticleData | None, self.repo.child(f"events/{payload.id}").get())
+        data: ArticleData | None = cast(ArticleData | None, self.fetch(f"events/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        return Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=None
-        )
+        return self.hydrate(payload.id, data)
     
     def readChildSchoolArticle(self, payload: ArticleRead) -> Article:
         childSchoolId: str = cast(str, payload.childSchoolId)
-        data: ArticleData | None = cast(ArticleData | None, self.repo.child(f"{childSchoolId}/{payload.id}").get())
+        data: ArticleData | None = cast(ArticleData | None, self.fetch(f"{childSchoolId}/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        childSchool = self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
-        return Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=childSchool
+        return self.hydrate(payload.id, data)
+        
+    
+    def readByLocation(self, location: Location) -> dict[str, dict[str, Article]]:
+        res: dict[str, dict[str, Article]] = {}
+        for key in self.lookup("location", location):
+            childSchoolId, articleId = key.split("/")
+            res.setdefault(childSchoolId, {})[articleId] = self.read(ArticleRead(
+                id=articleId,
+                childSchoolId=None if childSchoolId == "events" else childSchoolId
+            ))
+        return res
+    
+    def readLatest(
+        self,
+        limit: int,
+        *,
+        since: date | None = None,
+        until: date | None = None,
+        before: str | None = None,
+        group: str | None = None
+    ) -> list[Article]:
+        """
+        Read the latest articles uploaded in the date range, newest first.
+        Articles are read with a key range query on their time-sortable ids, so that only the page is fetched.
+
+        Args:
+            limit (int): maximum number of articles to read.
+            since (date | None, optional): inclusive lower bound of the upload date.
+            until (date | None, optional): inclusive upper bound of the upload date.
+            before (str | None, optional): id of the last article of the previous page. Only older articles are read.
+            group (str | None, optional): `events` or code of the child school. Articles of every group are read if omitted.
+
+        Returns:
+            list[Article]: articles of the page, newest first.
+        """
+        endAt: str | None = uuid7_bound(until, upper=True) if until is not None else None
+        if before is not None and (endAt is None or before < endAt):
+            endAt = before
+        entries: dict[str, ArticleData] = self.latest(
+            limit,
+            startAt=uuid7_bound(since) if since is not None else None,
+            endAt=endAt,
+            exclusiveEnd=endAt is not None and endAt == before,
+            group=group
         )
         
+        childSchools: dict[str, ChildSchool] = {}
+        articles: list[Article] = []
+        for key, data in entries.items():
+            articleId: str = key.rsplit("/", 1)[-1]
+            childSchoolId: str | None = data.get("childSchoolId")
+            if childSchoolId is not None and childSchoolId not in childSchools:
+                childSchools[childSchoolId] = self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
+            articles.append(self.hydrate(articleId, data, childSchools.get(childSchoolId) if childSchoolId else None))
+        return articles
+    
+    def rekey(self) -> dict[str, str]:
+        """
+        Move articles stored with ids which are not time-sortable (uuid4 of older versions) to UUIDv7 ids of their upload dates,
+        so that the feed and key range queries of `readLatest` order them by time.
+
+        Returns:
+            dict[str, str]: keys of the moved articles, mapped to their new keys.
+        """
+        moved: dict[str, str] = {}
+        writes: list[tuple[str, Any, Any]] = []     # path, data before and after the move.
+        for key, data in walkEntries(self.repo.get(), self.keyDepth):
+            group, articleId = key.split("/")
+            if is_uuid7(articleId) or not isinstance(data, dict):
+                continue
+            newId: str = str(uuid7(datetime.combine(yyyy_mm_dd2date(data["uploadAt"]), datetime.min.time())))
+            moved[key] = f"{group}/{newId}"
+            writes += [(self.path(key), data, None), (self.path(moved[key]), None, data | {"id": newId})]
+        if writes:
+            self.controller.commit({path: after for path, _, after in writes})
+            for path, before, after in writes:
+                self.controller.notifyWrite(path, before, after)
+        return moved
+    
+    def rebuildIndexes(self) -> None:
+        """Give time-sortable ids to articles stored before the feed, and rebuild the indexes."""
+        self.rekey()
+        super().rebuildIndexes()
+    
+    def readEventArticlesBetween(self, since: date | None = None, until: date | None = None) -> dict[str, Article]:
+        data: dict[str, ArticleData] = self.query(
+            "uploadAt",
+            startAt=date2yyyy_mm_dd(since) if since is not None else None,
+            endAt=date2yyyy_mm_dd(until) if until is not None else None,
+            group="events"
+        )
+        return {articleId: self.hydrate(articleId, articleData) for articleId, articleData in data.items()}
+    
+    def readUpcomingEvents(self, limit: int, since: date | None = None, until: date | None = None) -> list[Article]:
+        """
+        Read event articles starting in the date range, in the order of their start dates.
+
+        Args:
+            limit (int): maximum number of articles to read.
+            since (date | None, optional): inclusive lower bound of the event start date. Defaults to today.
+            until (date | None, optional): inclusive upper bound of the event start date.
+
+        Returns:
+            list[Article]: event articles, soonest first.
+        """
+        data: dict[str, ArticleData] = self.query(
+            "eventStart",
+            startAt=date2yyyy_mm_dd(since or date.today()),
+            endAt=date2yyyy_mm_dd(until) if until is not None else None,
+            limit=limit,
+            group="events"
+        )
+        return [self.hydrate(articleId, articleData) for articleId, articleData in data.items()]
     
     def read(self, payload: ArticleRead) -> Article:
         if payload.childSchoolId is None:
@@ -582,42 +977,25 @@ class ArticleRepository(CRUDRepository):
             return self.readChildSchoolArticle(payload)
     
     def updateEventArticle(self, payload: ArticleUpdate) -> Article:
-        node: db.Reference = self.repo.child(f"events/{payload.id}")
-        data: ArticleData | None = cast(ArticleData | None, node.get())
+        data: ArticleData | None = cast(ArticleData | None, self.current(f"events/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        article = Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=None
-        )
-        node.update(article.dict())
+        article: Article = self.hydrate(payload.id, data)
+        self.store(f"events/{payload.id}", data, article.dict())
         return article
         
 
     def updateChildSchoolArticle(self, payload: ArticleUpdate) -> Article:
         childSchoolId: str = cast(str, payload.childSchoolId)
-        node: db.Reference = self.repo.child(f"{childSchoolId}/{payload.id}")
-        data: ArticleData | None = cast(ArticleData | None, node.get())
+        data: ArticleData | None = cast(ArticleData | None, self.current(f"{childSchoolId}/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        article = Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
-        )
-        
-        node.update(article.dict())    # update firebase data.
+        article: Article = self.hydrate(payload.id, data)
+        self.store(f"{childSchoolId}/{payload.id}", data, article.dict())    # update firebase data.
         return article
 
     def update(self, payload: ArticleUpdate) -> Article:
@@ -627,40 +1005,24 @@ class ArticleRepository(CRUDRepository):
             return self.updateChildSchoolArticle(payload)
     
     def deleteEventArticle(self, payload: ArticleDelete) -> Article:
-        node: db.Reference = self.repo.child(f"events/{payload.id}")
-        data: ArticleData | None = cast(ArticleData | None, node.get())
+        data: ArticleData | None = cast(ArticleData | None, self.current(f"events/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        article = Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=None
-        )
-        node.delete()
+        article: Article = self.hydrate(payload.id, data)
+        self.store(f"events/{payload.id}", data, None)
         return article
     
     def deleteChildSchoolArticle(self, payload: ArticleDelete) -> Article:
         childSchoolId: str = cast(str, payload.childSchoolId)
-        node: db.Reference = self.repo.child(f"{childSchoolId}/{payload.id}")
-        data: ArticleData | None = cast(ArticleData | None, node.get())
+        data: ArticleData | None = cast(ArticleData | None, self.current(f"{childSchoolId}/{payload.id}"))
         
         if data is None:
             raise EntryNotExist(Article, payload.id)
         
-        article = Article(
-            title=data["title"],
-            content=data["content"],
-            attachments=data["attachments"],
-            location=Location(data["location"]),
-            uploadAt=str2date(data["uploadAt"]),
-            childSchool=self.childSchoolRepo.read(ChildSchoolRead(code=childSchoolId))
-        )
-        node.delete()
+        article: Article = self.hydrate(payload.id, data)
+        self.store(f"{childSchoolId}/{payload.id}", data, None)
         return article
         
     
@@ -670,6 +1032,7 @@ class ArticleRepository(CRUDRepository):
         else:
             return self.deleteChildSchoolArticle(payload)
         
+
 class FirebaseController:
     """
     Middleware to abstract Firebase Database access.
@@ -681,15 +1044,246 @@ class FirebaseController:
     child: Final[ChildRepository]
     article: Final[ArticleRepository]
     childSchoolUser: Final[ChildSchoolUserRepository]
+    versions: Final[SubtreeVersions]
+    breaker: Final[CircuitBreaker]
+    fallback: Final[FallbackCache]
+    hedger: Final[Hedger]
+    replica: Final[LocalReplica | None]
+    writeBehind: Final[WriteBehindQueue | None]
+    writeListeners: Final[list[WriteListener]]
     
-    def __init__(self) -> None:
-        self.root = db.reference("/")
+    def __init__(self, root: db.Reference | None = None) -> None:
+        """
+        Args:
+            root (db.Reference | None, optional): reference of the database root.
+                Connects to the firebase database if omitted. Benchmarks pass an in-process stand-in.
+        """
+        if root is None:
+            initializeFirebase()
+            root = db.reference("/")
+        self.root = root
+        self.breaker = CircuitBreaker(BreakerFailures, BreakerCooldown, BreakerSlowCall)
+        self.fallback = FallbackCache(FallbackEntries)
+        self.hedger = Hedger(HedgePercentile / 100)
+        self._revalidating: bool = False
+        self._revalidateLock = Lock()
+        self.versions = SubtreeVersions(
+            self.root.child("versions"), run=lambda name, path, call: self.call(name, path, call, cacheKey=path)
+        )
+        self.replica = LocalReplica(self.root, self.versions, ReplicaSubtrees, ReplicaMaxStaleness) if ReplicaSubtrees else None
+        if self.replica is not None:
+            self.replica.start()
+        self.writeBehind = WriteBehindQueue(self.commit, WriteBehindWindow) if WriteBehindWindow > 0 else None
+        self.writeListeners = []
         self.parentUser = ParentUserRepository(self.root.child("users/parent"), self)
         self.childSchool = ChildSchoolRepository(self.root.child("childschool"), self)
         self.childSchoolUser = ChildSchoolUserRepository(self.root.child("users/childschool"), self)
         self.child = ChildRepository(self.root.child("children"), self)
         self.article = ArticleRepository(self.root.child("articles"), self)
     
+    def commit(self, updates: dict[str, Any], touch: Iterable[str] = ()) -> None:
+        """
+        Apply a multi-path update on the database, bumping version counters of the written subtrees.
+
+        Args:
+            updates (dict[str, Any]): paths relative to the database root, mapped to their new values. `None` deletes the entry.
+            touch (Iterable[str]): extra paths whose readers embed the written entries.
+        """
+        written: list[str] = list(updates)
+        updates = updates | self.versions.increments(written, touch)
+        self.versions.committed(written)
+        try:
+            self.call("update", "/", lambda: self.root.update(updates), payload=updates)
+        except Exception:
+            self.versions.committed(written, -1)
+            raise
+        self.versions.invalidate()
+        if self.replica is not None:
+            self.replica.apply(updates)
+    
+    def write(self, updates: dict[str, Any], touch: Iterable[str] = (), onCommit: Callable[[], None] | None = None) -> Future:
+        """
+        Commit a multi-path update, or queue it in write-behind mode.
+
+        Args:
+            updates (dict[str, Any]): paths relative to the database root, mapped to their new values. `None` deletes the entry.
+            touch (Iterable[str]): extra paths whose readers embed the written entries.
+            onCommit (Callable[[], None] | None, optional): called after the update is committed.
+
+        Returns:
+            Future: resolved when the update is committed.
+        """
+        if self.writeBehind is not None:
+            return self.writeBehind.submit(updates, touch, onCommit)
+        future: Future = Future()
+        self.commit(updates, touch=touch)
+        if onCommit is not None:
+            onCommit()
+        future.set_result(None)
+        return future
+    
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait until queued writes are committed. Does nothing unless in write-behind mode."""
+        if self.writeBehind is not None:
+            self.writeBehind.flush(timeout)
+    
+    def current(self, path: str) -> Any:
+        """
+        Read a node of the database to be written back. Queued writes of this worker are visible,
+        but the local replica is not used, so that index updates are computed from the latest data.
+        """
+        load: Callable[[], Any] = lambda: self.call("get", path, self.root.child(path).get)
+        return load() if self.writeBehind is None else self.writeBehind.overlay(path, load)
+    
+    def read(self, path: str) -> Any:
+        """
+        Read a node of the database. Nodes of replicated subtrees are served from the local replica while it is fresh.
+        While the database is unavailable, the last known good copy of the node is served instead.
+
+        Args:
+            path (str): path of the node, relative to the database root.
+
+        Returns:
+            Any: data of the node. None if the node doesn't exist.
+        """
+        def load() -> Any:
+            if self.replica is not None and (data := self.replica.get(path)) is not Miss:
+                return data
+            return self.call("get", path, self.root.child(path).get, cacheKey=path)
+
+        return load() if self.writeBehind is None else self.writeBehind.overlay(path, load)
+    
+    def call(self, name: str, path: str, run: Callable[[], T], *, cacheKey: str | None = None, payload: Any = None) -> T:
+        """
+        Run a database operation through the circuit breaker, within the deadline of the current request.
+        Reads pass `cacheKey`, and their results are kept as the last known good copy.
+        If the operation fails, or the breaker is open, the copy is served and the response is marked stale.
+        Operations don't start once the deadline passed, and idempotent ones are hedged if enabled, waiting no longer than
+        the deadline, once enough reads of their kind were observed. Others are bounded by the HTTP timeout of firebase.
+
+        Args:
+            name (str): operation name, like `get` or `update`.
+            path (str): database path of the operation.
+            run (Callable[[], T]): function running the operation.
+            cacheKey (str | None, optional): key of the copy for reads. Operations without it are never served from a copy.
+            payload (Any, optional): data sent with the operation.
+
+        Returns:
+            T: result of the operation, or a copy of the last result.
+
+        Raises:
+            DeadlineExceeded: the deadline of the request passed before the operation finished.
+            DatabaseUnavailable: the operation failed or was rejected, and there is no copy to serve.
+        """
+        deadline: Deadline | None = currentDeadline.get()
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(path, deadline)
+        
+        error: Exception | None = None
+        if self.breaker.allow():
+            startedAt: float = perf_counter()
+            try:
+                result: T = operation(name, path, self.hedged(name, path, run, deadline) if name in IdempotentOperations else run, payload)
+            except Exception as e:
+                if self.breaker.record(perf_counter() - startedAt, e):
+                    self.revalidate()
+                if not isOutage(e):
+                    raise
+                error = e
+            else:
+                if self.breaker.record(perf_counter() - startedAt, None):
+                    self.revalidate()
+                if cacheKey is not None:
+                    self.fallback.put(cacheKey, result)
+                return result
+        else:
+            BreakerRejections.inc()
+        
+        if cacheKey is not None and (data := self.fallback.serve(cacheKey, Refresh(name, path, run))) is not Miss:
+            markStale()
+            return data
+        raise DatabaseUnavailable(path) from error
+    
+    def hedged(self, name: str, path: str, run: Callable[[], T], deadline: Deadline | None) -> Callable[[], T]:
+        """Wrap an idempotent operation to run it hedged, giving up at the deadline. Returns it as is if hedging is disabled."""
+        if not self.hedger.enabled:
+            return run
+        
+        def call() -> T:
+            try:
+                return self.hedger.run(readKind(name, path), run, deadline.remaining() if deadline is not None else None)
+            except TimeoutError:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(path, deadline) from None
+                raise
+        return call
+    
+    def revalidate(self) -> None:
+        """Start the background thread probing the database after the breaker opened, unless it is running."""
+        with self._revalidateLock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+        Thread(target=self._revalidate, name="firebase-revalidate", daemon=True).start()
+    
+    def _revalidate(self) -> None:
+        """
+        Once the cooldown of the open breaker passes, probe the database with a read served stale (or with the version counters).
+        After the breaker closes, read again every copy served stale, so they are fresh when the database fails next time.
+        """
+        while True:
+            if self.breaker.state is not State.Closed:
+                sleep(max(0.0, self.breaker.retryAt - monotonic()))
+                stalled: dict[str, Refresh] = self.fallback.stalled()
+                key, refresh = next(iter(stalled.items()), (self.versions.node.path, Refresh("get", self.versions.node.path, self.versions.node.get)))
+                try:
+                    result: Any = self.breaker.probe(lambda: operation(refresh.name, refresh.path, refresh.run))
+                except Exception:
+                    for key, refresh in stalled.items():     # keep them for the next probe.
+                        self.fallback.serve(key, refresh)
+                    continue
+                self.fallback.put(key, result)
+                stalled.pop(key, None)
+            else:
+                stalled = self.fallback.stalled()
+            
+            for key, refresh in stalled.items():
+                if self.breaker.state is not State.Closed:
+                    self.fallback.serve(key, refresh)
+                    continue
+                try:
+                    self.call(refresh.name, refresh.path, refresh.run, cacheKey=key)
+                except Exception:
+                    pass        # served stale again (or failed for another reason); the next outage serves the older copy.
+            with self._revalidateLock:
+                if self.breaker.state is State.Closed:
+                    self._revalidating = False
+                    return
+    
+    def close(self) -> None:
+        """Commit queued writes, close change streams of the local replica, and stop threads of hedged reads."""
+        if self.writeBehind is not None:
+            self.writeBehind.close()
+        if self.replica is not None:
+            self.replica.close()
+        self.hedger.close()
+    
+    def addWriteListener(self, listener: WriteListener) -> None:
+        """
+        Register a listener called after every repository write of this worker.
+        Listener receives path of the entry relative to the database root, its data before and after the write.
+        """
+        self.writeListeners.append(listener)
+    
+    def notifyWrite(self, path: str, before: Any, after: Any) -> None:
+        for listener in self.writeListeners:
+            listener(path, before, after)
+    
+    def rebuildIndexes(self) -> None:
+        """Rebuild secondary indexes of every repository. Use this to index data written before indexes existed."""
+        for repo in (self.parentUser, self.childSchool, self.childSchoolUser, self.child, self.article):
+            repo.rebuildIndexes()
+    
     def debug(self):
         self.debug_user_feature()
         self.debug_childschool_feature()
@@ -725,4 +1319,5 @@ class FirebaseController:
         self.childSchool.update(ChildSchoolUpdate(code="1ecec08c-f932-b044-e053-0a32095ab044", openingTime="09:00~20:00"))
         self.childSchool.delete(ChildSchoolDelete(code="1ecec08c-f932-b044-e053-0a32095ab044"))
 
-DB: Final[FirebaseController] = FirebaseController()
+# Connects to firebase on the first access, not on import.
+DB: Final[FirebaseController] = cast(FirebaseController, Lazy(FirebaseController))
@@ -0,0 +1,39 @@
+import os
+from contextvars import ContextVar
+from time import monotonic
+from typing import Final
+
+# Milliseconds a request may spend before its database operations fail. 0 disables the deadline.
+RequestBudget: Final[float] = float(os.environ.get("REQUEST_DEADLINE_MS", 10_000)) / 1000      # seconds
+
+
+class Deadline:
+    """Time by which a request must be handled. Every database operation of the request checks it before running."""
+    budget: Final[float]
+    expiresAt: Final[float]
+
+    def __init__(self, budget: float) -> None:
+        """
+        Args:
+            budget (float): seconds from now.
+        """
+        self.budget = budget
+        self.expiresAt = monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline. 0 once it passed."""
+        return max(0.0, self.expiresAt - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() >= self.expiresAt
+
+
+currentDeadline: Final[ContextVar[Deadline | None]] = ContextVar("currentDeadline", default=None)
+
+
+def startDeadline(budget: float = RequestBudget) -> Deadline | None:
+    """Set the deadline of the current request, `budget` seconds from now. Budget of 0 or less sets no deadline."""
+    deadline: Deadline | None = Deadline(budget) if budget > 0 else None
+    currentDeadline.set(deadline)
+    return deadline
@@ -0,0 +1,144 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Final, TypeVar, cast
+
+from seoul_opendata.utils.metrics import Counter
+
+T = TypeVar("T")
+
+HedgedReads: Final[Counter] = Counter(
+    "firebase_hedged_reads_total", "Duplicate reads sent because the first one was slow, and whether the duplicate answered first.", ("outcome",)
+)
+
+
+class LatencyWindow:
+    """Latencies of the latest operations of a kind, for estimating a quantile of them."""
+    quantile: Final[float]
+    minSamples: Final[int]
+
+    def __init__(self, quantile: float, size: int = 256, minSamples: int = 20) -> None:
+        self.quantile = quantile
+        self.minSamples = minSamples
+        self._lock = Lock()
+        self._samples: deque[float] = deque(maxlen=size)
+        self._stale: int = 0        # samples added since the quantile was computed.
+        self._value: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._stale += 1
+
+    def value(self) -> float | None:
+        """The quantile of the window, or None until `minSamples` were observed. Recomputed every 16 samples."""
+        with self._lock:
+            if len(self._samples) < self.minSamples:
+                return None
+            if self._value is None or self._stale >= 16:
+                ordered: list[float] = sorted(self._samples)
+                self._value = ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+                self._stale = 0
+            return self._value
+
+
+class Hedger:
+    """
+    Runs idempotent reads on a thread pool, sending a duplicate of a read that is slower than
+    the `quantile` of the latest reads of its kind, and taking whichever answers first.
+    The slower one is left to finish in the background, since firebase requests can't be cancelled.
+    Until enough reads of a kind were observed to know the quantile, its reads run inline on the calling thread.
+    """
+    quantile: Final[float]
+    minDelay: Final[float]
+
+    def __init__(self, quantile: float, minDelay: float = 0.005, workers: int = 32) -> None:
+        """
+        Args:
+            quantile (float): quantile of the latest latencies to wait for before sending the duplicate. 0 disables hedging.
+            minDelay (float, optional): minimum seconds to wait before sending the duplicate.
+            workers (int, optional): threads running the reads.
+        """
+        self.quantile = quantile
+        self.minDelay = minDelay
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="firebase-hedge")
+        self._lock = Lock()
+        self._windows: dict[str, LatencyWindow] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.quantile > 0
+
+    def window(self, kind: str) -> LatencyWindow:
+        with self._lock:
+            window: LatencyWindow | None = self._windows.get(kind)
+            if window is None:
+                window = self._windows[kind] = LatencyWindow(self.quantile)
+            return window
+
+    def run(self, kind: str, call: Callable[[], T], timeout: float | None = None) -> T:
+        """
+        Run the read, hedged if enabled and enough reads of its kind were observed.
+
+        Args:
+            kind (str): kind of the read, whose latencies decide the delay of the duplicate. e.g. `get /children`.
+            call (Callable[[], T]): function running the read. It must be safe to run twice.
+            timeout (float | None, optional): seconds to wait for an answer of a hedged read.
+                Reads running inline take as long as they take.
+
+        Returns:
+            T: result of the read which answered first.
+
+        Raises:
+            TimeoutError: neither read answered within the timeout.
+            Exception: error of the read, if every read sent failed.
+        """
+        window: LatencyWindow = self.window(kind)
+
+        def timed() -> T:
+            startedAt: float = perf_counter()
+            result: T = call()
+            window.observe(perf_counter() - startedAt)
+            return result
+
+        quantile: float | None = window.value() if self.enabled else None
+        if quantile is None:
+            return timed()
+
+        deadline: float | None = None if timeout is None else perf_counter() + timeout
+        pending: set[Future] = {self._pool.submit(timed)}
+        hedge: Future | None = None
+        delay: float = max(self.minDelay, quantile)
+        done, _ = wait(pending, timeout=delay if timeout is None else min(delay, timeout))
+        if not done and (deadline is None or perf_counter() < deadline):
+            HedgedReads.inc(outcome="sent")
+            hedge = self._pool.submit(timed)
+            pending.add(hedge)
+
+        error: BaseException | None = None
+        while pending:
+            remaining: float | None = None if deadline is None else max(0.0, deadline - perf_counter())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"No answer within {timeout} seconds.")
+            for future in done:
+                if future.exception() is None:
+                    if hedge is not None and future is hedge:
+                        HedgedReads.inc(outcome="won")
+                    return future.result()
+                error = future.exception()
+        raise cast(BaseException, error)
+
+    def close(self) -> None:
+        """Stop the threads once the reads running now finish."""
+        self._pool.shutdown(wait=False)
+
+
+def readKind(name: str, path: str) -> str:
+    """
+    Kind of a read whose latencies are compared, with keys of the path replaced by `*`.
+    e.g. `get /children/*` for reads of a child, and `get /children` for the whole repository.
+    """
+    parts: list[str] = path.strip("/").split("?", 1)[0].split("/")
+    return f"{name} /" + "/".join(parts[:1] + ["*"] * (len(parts) - 1))
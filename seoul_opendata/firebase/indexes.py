@@ -0,0 +1,130 @@
+from typing import Any, Final, Iterable, Iterator, Mapping
+
+IndexRoot: Final[str] = "indexes"
+FeedField: Final[str] = "_feed"     # index of every entry of a repository with nested keys, ordered by the last key segment.
+ForbiddenKeyChars: Final[str] = "%.#$[]/"
+
+
+def escapeKey(value: Any) -> str:
+    """
+    Escape a field value so that it can be used as a firebase key.
+    Characters forbidden in firebase keys are percent-encoded.
+
+    Args:
+        value (Any): indexed field value.
+
+    Returns:
+        str: value usable as a firebase key.
+    """
+    return "".join(f"%{ord(c):02X}" if c in ForbiddenKeyChars else c for c in str(value))
+
+
+def indexPath(subtree: str, field: str, value: Any) -> str:
+    """Path of the index node listing entries of the subtree whose field equals to value."""
+    return f"{IndexRoot}/{subtree}/{field}/{escapeKey(value)}"
+
+
+def indexUpdates(
+    subtree: str,
+    fields: Iterable[str],
+    key: str,
+    before: Mapping[str, Any] | None,
+    after: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    """
+    Build multi-path update entries keeping indexes in sync with a write.
+
+    Args:
+        subtree (str): path of the indexed repository, relative to the database root.
+        fields (Iterable[str]): indexed fields of the stored data.
+        key (str): key of the written entry in the repository.
+        before (Mapping[str, Any] | None): stored data before the write. None if entry is created.
+        after (Mapping[str, Any] | None): stored data after the write. None if entry is deleted.
+
+    Returns:
+        dict[str, Any]: entries to merge into the multi-path update of the write.
+    """
+    updates: dict[str, Any] = {}
+    for field in fields:
+        old: Any = before.get(field) if before is not None else None
+        new: Any = after.get(field) if after is not None else None
+        if old == new:
+            continue
+        if old is not None:
+            updates[f"{indexPath(subtree, field, old)}/{key}"] = None
+        if new is not None:
+            updates[f"{indexPath(subtree, field, new)}/{key}"] = True
+    return updates
+
+
+def feedPath(subtree: str) -> str:
+    """Path of the feed node of the subtree, mapping the last segment of each entry key to the full key."""
+    return f"{IndexRoot}/{subtree}/{FeedField}"
+
+
+def feedUpdates(subtree: str, key: str, after: Any) -> dict[str, Any]:
+    """
+    Build multi-path update entries keeping the feed in sync with a write.
+    Feed lists entries across nested keys in the order of their time-sortable ids, so that pages can be read with key range queries.
+
+    Args:
+        subtree (str): path of the repository, relative to the database root.
+        key (str): key of the written entry in the repository.
+        after (Any): stored data after the write. None if entry is deleted.
+
+    Returns:
+        dict[str, Any]: entries to merge into the multi-path update of the write.
+    """
+    return {f"{feedPath(subtree)}/{key.rsplit('/', 1)[-1]}": None if after is None else key}
+
+
+def walkEntries(node: Any, depth: int) -> Iterator[tuple[str, Any]]:
+    """
+    Iterate entries of a repository node, flattening nested keys.
+
+    Args:
+        node (Any): repository node, as read from firebase.
+        depth (int): depth of keys in the repository. e.g. 2 for `articles/{code}/{id}`.
+
+    Yields:
+        tuple[str, Any]: key of the entry and its stored data.
+    """
+    if not isinstance(node, dict):
+        return
+    for k, child in node.items():
+        if depth == 1:
+            yield k, child
+        else:
+            for sub, data in walkEntries(child, depth - 1):
+                yield f"{k}/{sub}", data
+
+
+def buildIndex(fields: Iterable[str], entries: Iterable[tuple[str, Mapping[str, Any]]]) -> dict[str, Any]:
+    """
+    Build index nodes of a repository from scratch.
+
+    Args:
+        fields (Iterable[str]): indexed fields of the stored data.
+        entries (Iterable[tuple[str, Mapping[str, Any]]]): keys and stored data of every entry.
+
+    Returns:
+        dict[str, Any]: index tree to store at `indexes/{subtree}`.
+    """
+    fields = tuple(fields)
+    tree: dict[str, Any] = {}
+    for key, data in entries:
+        for field in fields:
+            if (value := data.get(field)) is None:
+                continue
+            node: dict[str, Any] = tree.setdefault(field, {}).setdefault(escapeKey(value), {})
+            *parents, leaf = key.split("/")
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[leaf] = True
+    return tree
+
+
+if __name__ == "__main__":
+    from seoul_opendata.firebase.controller import DB
+
+    DB.rebuildIndexes()
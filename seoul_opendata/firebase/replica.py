@@ -0,0 +1,245 @@
+import copy
+import logging
+from threading import Lock
+from time import monotonic
+from typing import Any, Final, Iterable
+
+from firebase_admin import db
+
+from seoul_opendata.firebase.versions import SubtreeVersions
+from seoul_opendata.utils.metrics import CacheLookups
+
+Miss: Final[object] = object()      # returned when the replica can't serve a read, so that the caller reads firebase.
+log: Final[logging.Logger] = logging.getLogger(__name__)
+
+
+def orderKey(value: Any) -> tuple:
+    """Sort key of a child value, following the ordering of firebase queries."""
+    if value is None:
+        return (0,)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4,)
+
+
+class LocalReplica:
+    """
+    In-process copy of selected database subtrees, kept current by `Reference.listen` change streams.
+    Reads on replicated paths are served from memory while the replica is fresh:
+    its stream is open, and every write of the other workers observed through the version counters
+    has been delivered by the stream within `maxStaleness` seconds.
+    Writes of this worker are applied locally, so they don't wait for the stream.
+    Otherwise reads miss, and the caller falls back to a remote read.
+    """
+    root: Final[db.Reference]
+    versions: Final[SubtreeVersions]
+    subtrees: Final[tuple[str, ...]]
+    maxStaleness: float
+
+    def __init__(self, root: db.Reference, versions: SubtreeVersions, subtrees: Iterable[str], maxStaleness: float = 5.0) -> None:
+        """
+        Args:
+            root (db.Reference): reference of the database root.
+            versions (SubtreeVersions): version counters used to detect writes the stream has not delivered yet.
+            subtrees (Iterable[str]): paths of the replicated subtrees, relative to the database root.
+            maxStaleness (float, optional): seconds a committed write may stay undelivered before reads fall back to firebase.
+        """
+        self.root = root
+        self.versions = versions
+        self.subtrees = tuple(subtree.strip("/") for subtree in subtrees)
+        self.maxStaleness = maxStaleness
+        self._lock = Lock()
+        self._trees: dict[str, Any] = {}                        # subtree -> replicated data, present once the first snapshot arrived.
+        self._versions: dict[str, int] = {}                     # subtree -> greatest count of writes of the other workers seen.
+        self._pendingSince: dict[str, float | None] = {}        # subtree -> when an undelivered write was noticed.
+        self._listeners: dict[str, db.ListenerRegistration] = {}
+        self._open: set[str] = set()                            # subtrees whose stream is open and applying events.
+
+    def start(self) -> None:
+        """Subscribe to change streams of the replicated subtrees. Each stream starts with a snapshot of its subtree."""
+        for subtree in self.subtrees:
+            if subtree not in self._listeners:
+                self._listeners[subtree] = self.root.child(subtree).listen(
+                    lambda event, subtree=subtree: self.onEvent(subtree, event)
+                )
+                self._open.add(subtree)
+
+    def close(self) -> None:
+        """Close change streams. Reads miss afterwards."""
+        listeners, self._listeners = self._listeners, {}
+        self._open.clear()
+        for listener in listeners.values():
+            listener.close()
+        with self._lock:
+            self._trees.clear()
+
+    def covering(self, path: str) -> tuple[str, list[str]] | None:
+        """Find the replicated subtree containing the path, with the rest of the path split into keys."""
+        path = path.strip("/")
+        for subtree in self.subtrees:
+            if path == subtree or path.startswith(f"{subtree}/"):
+                return subtree, [part for part in path[len(subtree):].split("/") if part]
+        return None
+
+    def fresh(self, subtree: str) -> bool:
+        """Whether reads of the subtree may be served locally."""
+        if subtree not in self._open or subtree not in self._trees:
+            return False
+        version: int = self.versions.foreign(subtree)       # cached by SubtreeVersions, so this rarely hits the network.
+        now: float = monotonic()
+        with self._lock:
+            if subtree not in self._versions:
+                self._versions[subtree] = version
+            elif version > self._versions[subtree]:
+                # another worker committed a write; the stream has `maxStaleness` seconds to deliver it.
+                self._versions[subtree] = version
+                if self._pendingSince.get(subtree) is None:
+                    self._pendingSince[subtree] = now
+            pendingSince: float | None = self._pendingSince.get(subtree)
+        return pendingSince is None or now - pendingSince <= self.maxStaleness
+
+    def onEvent(self, subtree: str, event: db.Event) -> None:
+        """
+        Apply a `put` or `patch` event of the change stream.
+        If the event can't be applied, the subtree stops being served, since later events would apply on a wrong copy.
+        """
+        keys: list[str] = [part for part in event.path.split("/") if part]
+        with self._lock:
+            try:
+                if event.event_type == "put":
+                    self._put(subtree, keys, event.data)
+                elif event.event_type == "patch":
+                    for key, value in (event.data or {}).items():
+                        self._put(subtree, keys + [part for part in key.split("/") if part], value)
+            except Exception:
+                log.exception("Failed to apply a change stream event of %s. Reads of it fall back to firebase.", subtree)
+                self._open.discard(subtree)
+                self._trees.pop(subtree, None)
+                return
+            self._pendingSince[subtree] = None
+
+    def _put(self, subtree: str, keys: list[str], value: Any) -> None:
+        if not keys:
+            self._trees[subtree] = value
+            return
+        node: Any = self._trees.get(subtree)
+        if not isinstance(node, dict):
+            node = self._trees[subtree] = {}
+        parents: list[tuple[dict[str, Any], str]] = []
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                if value is None:
+                    return      # deleting a node which doesn't exist.
+                node[key] = {}
+            parents.append((node, key))
+            node = node[key]
+        if value is None:
+            node.pop(keys[-1], None)
+            # firebase doesn't keep empty nodes.
+            for parent, key in reversed(parents):
+                if parent[key]:
+                    break
+                del parent[key]
+        else:
+            node[keys[-1]] = copy.deepcopy(value)
+
+    def apply(self, updates: dict[str, Any]) -> None:
+        """
+        Apply a multi-path update committed by this worker, so that the worker reads its own writes
+        before the change stream delivers them.
+        """
+        with self._lock:
+            for path, value in updates.items():
+                if (covered := self.covering(path)) is not None and covered[0] in self._trees:
+                    self._put(covered[0], covered[1], value)
+
+    def serves(self, path: str) -> tuple[str, list[str]] | None:
+        """Find the replicated subtree and keys of the path, if reads of the path may be served locally."""
+        covered: tuple[str, list[str]] | None = self.covering(path)
+        if covered is None:
+            return None
+        if not self.fresh(covered[0]):
+            CacheLookups.inc(cache="replica", result="miss")
+            return None
+        CacheLookups.inc(cache="replica", result="hit")
+        return covered
+
+    def _node(self, subtree: str, keys: list[str]) -> Any:
+        node: Any = self._trees.get(subtree)
+        for key in keys:
+            if not isinstance(node, dict) or (node := node.get(key)) is None:
+                return None
+        return node
+
+    def get(self, path: str) -> Any:
+        """
+        Read a node from the replica.
+
+        Args:
+            path (str): path of the node, relative to the database root.
+
+        Returns:
+            Any: copy of the node data (None if it doesn't exist), or `Miss`.
+        """
+        if (covered := self.serves(path)) is None:
+            return Miss
+        with self._lock:
+            return copy.deepcopy(self._node(*covered))
+
+    def query(
+        self,
+        path: str,
+        field: str | None,
+        *,
+        equalTo: Any = None,
+        startAt: Any = None,
+        endAt: Any = None,
+        limit: int | None = None,
+        last: bool = False
+    ) -> Any:
+        """
+        Run an ordered query on children of a node, like `order_by_child` (or `order_by_key` if field is None).
+
+        Args:
+            path (str): path of the queried node, relative to the database root.
+            field (str | None): field of the children to order by. Children are ordered by their keys if None.
+            equalTo (Any, optional): match children whose field equals to the value.
+            startAt (Any, optional): inclusive lower bound. Ignored if `equalTo` is given.
+            endAt (Any, optional): inclusive upper bound. Ignored if `equalTo` is given.
+            limit (int | None, optional): maximum number of children to return.
+            last (bool, optional): take the children from the greatest value, like `limit_to_last`.
+
+        Returns:
+            Any: copy of the matching children ordered by the field, or `Miss`.
+        """
+        if (covered := self.serves(path)) is None:
+            return Miss
+        with self._lock:
+            node: Any = self._node(*covered)
+            if not isinstance(node, dict):
+                return {}
+
+            def ordered(item: tuple[str, Any]) -> tuple:
+                key, value = item
+                if field is None:
+                    return orderKey(key)
+                return orderKey(value.get(field) if isinstance(value, dict) else None)
+
+            if equalTo is not None:
+                startAt = endAt = equalTo
+            low: tuple | None = orderKey(startAt) if startAt is not None else None
+            high: tuple | None = orderKey(endAt) if endAt is not None else None
+            items: list[tuple[str, Any]] = sorted(
+                (
+                    item for item in node.items()
+                    if (low is None or ordered(item) >= low) and (high is None or ordered(item) <= high)
+                ),
+                key=lambda item: (ordered(item), item[0])
+            )
+            if limit is not None:
+                items = items[-limit:] if last else items[:limit]
+            return copy.deepcopy(dict(items))
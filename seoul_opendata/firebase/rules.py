@@ -0,0 +1,45 @@
+import json
+from contextlib import nullcontext
+import sys
+from typing import Any, Final, Type
+
+from pydantic import BaseModel
+
+from seoul_opendata.models import Article, Child, ChildSchool
+
+# Repository paths mapped to the model they store. `$name` segments are wildcards of nested keys.
+QueriedPaths: Final[dict[str, Type[BaseModel]]] = {
+    "childschool": ChildSchool,
+    "children": Child,
+    "articles/$childSchoolId": Article
+}
+
+
+def indexOn(model: Type[BaseModel]) -> list[str]:
+    """Fields of the stored data queried with `order_by_child`, declared by the model."""
+    return [*getattr(model, "__queried__", ()), *getattr(model, "__ordered__", ())]
+
+
+def buildRules() -> dict[str, Any]:
+    """
+    Build `.indexOn` rules of the realtime database from the model field declarations.
+
+    Returns:
+        dict[str, Any]: rules object to merge into `database.rules.json`.
+    """
+    rules: dict[str, Any] = {}
+    for path, model in QueriedPaths.items():
+        if not (fields := indexOn(model)):
+            continue
+        node: dict[str, Any] = rules
+        for part in path.split("/"):
+            node = node.setdefault(part, {})
+        node[".indexOn"] = fields
+    return {"rules": rules}
+
+
+if __name__ == "__main__":
+    # usage: python -m seoul_opendata.firebase.rules [database.rules.json]
+    with open(sys.argv[1], mode="wt", encoding="utf-8") if len(sys.argv) > 1 else nullcontext(sys.stdout) as f:
+        json.dump(buildRules(), f, ensure_ascii=False, indent=2)
+        f.write("\n")
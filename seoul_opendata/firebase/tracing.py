@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import random
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Final, TypeVar
+
+from seoul_opendata.utils.metrics import Counter, Histogram
+
+T = TypeVar("T")
+
+SlowRequestThreshold: Final[float] = float(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 1000)) / 1000     # seconds
+# Fraction of requests whose payload sizes are measured. Encoding every result is too costly to do on every request.
+TraceSampleRate: Final[float] = float(os.environ.get("TRACE_SAMPLE_RATE", 0.01))
+slowLog: Final[logging.Logger] = logging.getLogger("seoul_opendata.slow")
+RepositoryDuration: Final[Histogram] = Histogram(
+    "repository_call_duration_seconds", "Latency of repository method calls.", ("method",)
+)
+FirebaseDuration: Final[Histogram] = Histogram(
+    "firebase_operation_duration_seconds", "Latency of firebase operations by path prefix.", ("operation", "prefix")
+)
+FirebaseErrors: Final[Counter] = Counter(
+    "firebase_operation_errors_total", "Failed firebase operations by path prefix.", ("operation", "prefix")
+)
+
+
+def pathPrefix(path: str) -> str:
+    """First segment of a database path, used as a metric label of bounded cardinality."""
+    return "/" + path.strip("/").split("/", 1)[0].split("?", 1)[0]
+
+
+def payloadSize(value: Any) -> int:
+    """Size of the value encoded as JSON, in bytes."""
+    if value is None:
+        return 0
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class Span:
+    """A repository method call or a database operation, with the calls made inside of it."""
+    __slots__ = ("name", "path", "size", "startedAt", "elapsed", "children")
+
+    def __init__(self, name: str, path: str | None = None) -> None:
+        self.name: str = name
+        self.path: str | None = path        # database path, for database operations.
+        self.size: int | None = None        # payload size in bytes, for database operations. None if not measured.
+        self.startedAt: float = perf_counter()
+        self.elapsed: float = 0.0
+        self.children: list[Span] = []
+
+    def dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"name": self.name, "ms": round(self.elapsed * 1000, 3)}
+        if self.path is not None:
+            data["path"] = self.path
+        if self.size is not None:
+            data["bytes"] = self.size
+        if self.children:
+            data["calls"] = [child.dict() for child in self.children]
+        return data
+
+
+class RequestTrace:
+    """
+    Database operations made while handling a request, as a tree under the repository methods which made them.
+    Payload sizes are measured only on sampled requests, and on operations of a request once it became slow.
+    """
+    root: Final[Span]
+    sampled: Final[bool]
+
+    def __init__(self, method: str, path: str, sampled: bool | None = None) -> None:
+        self.root = Span(f"{method} {path}")
+        self.sampled = random.random() < TraceSampleRate if sampled is None else sampled
+        self.calls: int = 0
+        self.bytes: int = 0
+        self.dbTime: float = 0.0
+        self.stale: int = 0         # reads served from the last known good copy while the database was unavailable.
+
+    def measures(self) -> bool:
+        """Whether payload sizes of operations finishing now are measured."""
+        return self.sampled or perf_counter() - self.root.startedAt >= SlowRequestThreshold
+
+    def record(self, span: Span) -> None:
+        self.calls += 1
+        self.bytes += span.size or 0
+        self.dbTime += span.elapsed
+
+    def headers(self) -> dict[str, str]:
+        """
+        Response headers reporting the totals. `X-DB-Bytes` is added on sampled requests,
+        and `X-DB-Stale` if any data of the response may be outdated.
+        """
+        headers: dict[str, str] = {
+            "X-DB-Calls": str(self.calls),
+            "X-DB-Time": f"{self.dbTime * 1000:.3f}",
+            "Server-Timing": f"db;dur={self.dbTime * 1000:.3f};desc=\"{self.calls} calls\""
+        }
+        if self.sampled:
+            headers["X-DB-Bytes"] = str(self.bytes)
+        if self.stale:
+            headers["X-DB-Stale"] = str(self.stale)
+        return headers
+
+    def finish(self, status: int) -> None:
+        """
+        Close the trace, and write it to the slow request log if the request took longer than the threshold.
+        Unless the request was sampled, `dbBytes` counts only the operations which finished after the threshold.
+        """
+        self.root.elapsed = perf_counter() - self.root.startedAt
+        if self.root.elapsed >= SlowRequestThreshold:
+            slowLog.warning(json.dumps({
+                "request": self.root.name,
+                "status": status,
+                "ms": round(self.root.elapsed * 1000, 3),
+                "dbCalls": self.calls,
+                "dbMs": round(self.dbTime * 1000, 3),
+                "dbBytes": self.bytes,
+                "sampled": self.sampled,
+                "calls": [child.dict() for child in self.root.children]
+            }, ensure_ascii=False))
+
+
+currentTrace: Final[ContextVar[RequestTrace | None]] = ContextVar("currentTrace", default=None)
+currentSpan: Final[ContextVar[Span | None]] = ContextVar("currentSpan", default=None)
+
+
+def startTrace(method: str, path: str) -> RequestTrace:
+    """Start tracing database operations of the current request."""
+    trace = RequestTrace(method, path)
+    currentTrace.set(trace)
+    currentSpan.set(trace.root)
+    return trace
+
+
+def markStale() -> None:
+    """Note that the current request was served a stale copy of database data."""
+    trace: RequestTrace | None = currentTrace.get()
+    if trace is not None:
+        trace.stale += 1
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator recording calls of a repository method as spans of the current trace."""
+    def decorator(method: Callable[..., T]) -> Callable[..., T]:
+        @wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            parent: Span | None = currentSpan.get()
+            if parent is None:
+                startedAt: float = perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    RepositoryDuration.observe(perf_counter() - startedAt, method=name)
+            span = Span(name)
+            parent.children.append(span)
+            token = currentSpan.set(span)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                span.elapsed = perf_counter() - span.startedAt
+                currentSpan.reset(token)
+                RepositoryDuration.observe(span.elapsed, method=name)
+        return wrapper
+    return decorator
+
+
+def operation(name: str, path: str, call: Callable[[], T], payload: Any = None) -> T:
+    """
+    Run a database operation, recording it in the current trace and in the operation metrics.
+
+    Args:
+        name (str): operation name, like `get` or `update`.
+        path (str): database path of the operation.
+        call (Callable[[], T]): function running the operation.
+        payload (Any, optional): data sent with the operation. The size of the result is recorded if omitted.
+            Sizes are recorded only if the trace measures them.
+
+    Returns:
+        T: result of the operation.
+    """
+    trace: RequestTrace | None = currentTrace.get()
+    parent: Span | None = currentSpan.get()
+    span = Span(name, "/" + path.strip("/"))
+    prefix: str = pathPrefix(path)
+    try:
+        result: T = call()
+    except Exception:
+        span.elapsed = perf_counter() - span.startedAt
+        FirebaseDuration.observe(span.elapsed, operation=name, prefix=prefix)
+        FirebaseErrors.inc(operation=name, prefix=prefix)
+        if trace is not None and parent is not None:
+            parent.children.append(span)
+            trace.record(span)
+        raise
+    span.elapsed = perf_counter() - span.startedAt
+    FirebaseDuration.observe(span.elapsed, operation=name, prefix=prefix)
+    if trace is None or parent is None:
+        return result
+    parent.children.append(span)
+    if trace.measures():
+        span.size = payloadSize(payload if payload is not None else result)
+    trace.record(span)
+    return result
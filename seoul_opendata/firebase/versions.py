@@ -0,0 +1,145 @@
+from math import inf
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Final, Iterable
+
+from firebase_admin import db
+
+from seoul_opendata.firebase.tracing import operation
+
+# Subtrees carrying a version counter, mapped to how deep the counters go.
+# e.g. `articles: 2` keeps counters for `articles` and every `articles/{code}`.
+VersionedSubtrees: Final[dict[str, int]] = {
+    "childschool": 1,
+    "articles": 2,
+    "users": 2,
+    "children": 1
+}
+# Subtrees whose data is embedded in the responses of a subtree, so that their counters are a part of its ETag.
+# Child schools embed children with their parent users, and articles embed their child schools.
+EmbeddedSubtrees: Final[dict[str, tuple[str, ...]]] = {
+    "childschool": ("users/parent", "children"),
+    "articles": ("users/parent", "children")
+}
+VersionKey: Final[str] = "_v"         # bumped by writes in the subtree, and by writes of entries embedded in it.
+WriteKey: Final[str] = "_w"           # bumped only by writes in the subtree.
+
+
+def versionedPaths(path: str) -> list[str]:
+    """
+    Find versioned subtrees affected by a write on the given path.
+
+    Args:
+        path (str): path of the written node, relative to the database root.
+
+    Returns:
+        list[str]: versioned subtree paths, from the outermost one.
+    """
+    parts: list[str] = path.strip("/").split("/")
+    depth: int | None = VersionedSubtrees.get(parts[0])
+    if depth is None:
+        return []
+    return ["/".join(parts[:i]) for i in range(1, min(depth, len(parts)) + 1)]
+
+
+class SubtreeVersions:
+    """
+    Version counters of database subtrees, used to build ETag of GET responses.
+    Counters are stored on firebase so that every worker observes writes of the others,
+    and cached locally for `syncInterval` seconds so conditional GETs don't hit the database.
+    Each subtree has two counters: `_v` for ETags, also bumped when entries embedded in the subtree change,
+    and `_w` bumped only when data of the subtree itself changes. Bumps of `_w` committed by this worker are counted too,
+    so that writes of the other workers can be told apart with `foreign()`.
+    """
+    node: Final[db.Reference]
+    syncInterval: float
+    run: Final[Callable[[str, str, Callable[[], Any]], Any]]
+
+    def __init__(self, node: db.Reference, syncInterval: float = 1.0, run: Callable[[str, str, Callable[[], Any]], Any] = operation) -> None:
+        """
+        Args:
+            node (db.Reference): node keeping the counters.
+            syncInterval (float, optional): seconds to use the local copy of the counters.
+            run (Callable, optional): runs the read of the counters, given operation name, path and the call. Traced by default.
+        """
+        self.node = node
+        self.syncInterval = syncInterval
+        self.run = run
+        self._tree: dict[str, Any] = {}
+        self._syncedAt: float = -inf
+        self._lock = Lock()
+        self._local: dict[str, int] = {}        # subtree -> bumps of `_w` committed by this worker.
+
+    def increments(self, paths: Iterable[str], touch: Iterable[str] = ()) -> dict[str, Any]:
+        """
+        Build multi-path update entries which bump counters of every subtree written or touched.
+
+        Args:
+            paths (Iterable[str]): written paths, relative to the database root.
+            touch (Iterable[str], optional): paths whose readers embed the written entries. Only their `_v` counters are bumped.
+
+        Returns:
+            dict[str, Any]: entries to merge into the multi-path update of the write.
+        """
+        base: str = self.node.path.strip("/")
+        written: set[str] = {subtree for path in paths for subtree in versionedPaths(path)}
+        touched: set[str] = {subtree for path in touch for subtree in versionedPaths(path)}
+        return {
+            f"{base}/{subtree}/{key}": {".sv": {"increment": 1}}
+            for key, subtrees in ((VersionKey, written | touched), (WriteKey, written))
+            for subtree in subtrees
+        }
+
+    def committed(self, paths: Iterable[str], count: int = 1) -> None:
+        """
+        Count the bumps of a multi-path update this worker commits, given the same written paths as `increments()`.
+        Counted before the commit, and uncounted with `count=-1` if it fails, so that `foreign()` never sees them as writes of the others.
+        """
+        subtrees: set[str] = {subtree for path in paths for subtree in versionedPaths(path)}
+        with self._lock:
+            for subtree in subtrees:
+                self._local[subtree] = self._local.get(subtree, 0) + count
+
+    def invalidate(self) -> None:
+        """Force next lookup to fetch counters from firebase."""
+        self._syncedAt = -inf
+
+    def sync(self) -> None:
+        with self._lock:
+            if monotonic() - self._syncedAt <= self.syncInterval:
+                return      # another thread synced while we were waiting.
+            self._tree = self.run("get", self.node.path, self.node.get) or {}
+            self._syncedAt = monotonic()
+
+    def get(self, subtree: str, key: str = VersionKey) -> int:
+        """
+        Get version of the subtree. Counter starts from 0 for never-written subtrees.
+
+        Args:
+            subtree (str): subtree path, relative to the database root.
+            key (str, optional): counter to read, `_v` or `_w`.
+
+        Returns:
+            int: current version of the subtree.
+        """
+        if monotonic() - self._syncedAt > self.syncInterval:
+            self.sync()
+
+        node: Any = self._tree
+        for part in subtree.strip("/").split("/"):
+            if not isinstance(node, dict) or (node := node.get(part)) is None:
+                return 0
+        return node.get(key, 0) if isinstance(node, dict) else 0
+
+    def foreign(self, subtree: str) -> int:
+        """
+        Count of writes in the subtree committed by the other workers, from its `_w` counter without the bumps of this worker.
+        It may drop for a moment while this worker commits, until the local copy of the counters is synced.
+        """
+        version: int = self.get(subtree, WriteKey)
+        return version - self._local.get(subtree, 0)
+
+    def etag(self, subtree: str) -> str:
+        """ETag of the subtree, built from its counter and counters of the subtrees embedded in it."""
+        embedded: tuple[str, ...] = EmbeddedSubtrees.get(subtree.strip("/").split("/", 1)[0], ())
+        return f'"{subtree.replace("/", ".")}-{"-".join(str(self.get(path)) for path in (subtree, *embedded))}"'
@@ -0,0 +1,224 @@
+import copy
+import logging
+import traceback
+from math import inf
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any, Callable, Final, Iterable
+
+from seoul_opendata.utils.metrics import Counter
+
+Commit = Callable[[dict[str, Any], list[str]], None]
+
+log: Final[logging.Logger] = logging.getLogger(__name__)
+
+FailedWrites: Final[Counter] = Counter("firebase_write_behind_failures_total", "Queued writes whose batch failed to commit.")
+
+
+def overlaps(path: str, other: str) -> bool:
+    """Whether one of the paths is an ancestor of the other. Firebase rejects such paths in a single multi-path update."""
+    return path != other and (path.startswith(f"{other}/") or other.startswith(f"{path}/"))
+
+
+def covers(path: str, other: str) -> bool:
+    """Whether the path is the other path or one of its ancestors."""
+    return path == other or other.startswith(f"{path}/")
+
+
+def descend(data: Any, keys: list[str]) -> Any:
+    """Node of the data at the keys. None if it doesn't exist."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def assign(data: Any, keys: list[str], value: Any) -> Any:
+    """Data with the node at the keys set to the value, dropping nodes left empty as firebase does. None deletes the node."""
+    if not keys:
+        return value
+    node: dict[str, Any] = data if isinstance(data, dict) else {}
+    child: Any = assign(node.get(keys[0]), keys[1:], value)
+    if child is None:
+        node.pop(keys[0], None)
+    else:
+        node[keys[0]] = child
+    return node or None
+
+
+class Batch:
+    """Writes coalesced into a single multi-path update."""
+    __slots__ = ("updates", "touch", "callbacks", "futures", "openedAt", "sealed")
+
+    def __init__(self) -> None:
+        self.updates: dict[str, Any] = {}
+        self.touch: set[str] = set()
+        self.callbacks: list[Callable[[], None]] = []
+        self.futures: list[Future] = []
+        self.openedAt: float = monotonic()
+        self.sealed: bool = False       # set when the batch is being committed. Sealed batches take no more writes.
+
+    def conflicts(self, updates: dict[str, Any]) -> bool:
+        return any(overlaps(path, pending) for path in updates for pending in self.updates)
+
+
+class WriteBehindQueue:
+    """
+    Queue coalescing repository writes of a short window into a single multi-path update.
+    Writes on the same path are applied in submission order, the last one winning within a batch.
+    A write whose paths are ancestors or descendants of pending paths starts a new batch, committed after the current one.
+    Until its batch is committed, a written value is visible to this worker through `overlay()`.
+    A failed batch is logged and its futures fail with the error; callers which must not answer before
+    the write is durable wait on the future returned by `submit()`.
+    """
+    commit: Final[Commit]
+    window: float
+    maxBatch: int
+
+    def __init__(self, commit: Commit, window: float = 0.05, maxBatch: int = 500) -> None:
+        """
+        Args:
+            commit (Commit): function applying a multi-path update with the extra touched paths.
+            window (float, optional): seconds to wait for more writes after the first write of a batch.
+            maxBatch (int, optional): number of paths which commits a batch without waiting for the window.
+        """
+        self.commit = commit
+        self.window = window
+        self.maxBatch = maxBatch
+        self.committed: int = 0         # number of writes committed.
+        self.batches: int = 0           # number of multi-path updates sent.
+        self.failed: int = 0            # number of writes whose batch failed to commit.
+        self._condition = Condition()
+        self._batches: list[Batch] = []
+        self._closed: bool = False
+        self._thread = Thread(target=self.run, name="firebase-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, updates: dict[str, Any], touch: Iterable[str] = (), onCommit: Callable[[], None] | None = None) -> Future:
+        """
+        Queue a multi-path update.
+
+        Args:
+            updates (dict[str, Any]): paths relative to the database root, mapped to their new values.
+            touch (Iterable[str]): extra paths whose readers embed the written entries.
+            onCommit (Callable[[], None] | None, optional): called after the update is committed, in submission order.
+
+        Returns:
+            Future: resolved when the update is committed, or failed with the error of the commit.
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("write-behind queue is closed.")
+            if not self._batches or self._batches[-1].sealed or self._batches[-1].conflicts(updates):
+                self._batches.append(Batch())
+            batch: Batch = self._batches[-1]
+            batch.updates.update(updates)
+            batch.touch.update(touch)
+            if onCommit is not None:
+                batch.callbacks.append(onCommit)
+            batch.futures.append(future)
+            self._condition.notify()
+        return future
+
+    def pending(self, path: str) -> list[tuple[str, Any]]:
+        """Writes of batches not committed yet on the path, its ancestors or its descendants, in submission order."""
+        path = path.strip("/")
+        with self._condition:
+            return [
+                (written, value)
+                for batch in self._batches
+                for written, value in batch.updates.items()
+                if covers(written, path) or covers(path, written)
+            ]
+
+    def overlay(self, path: str, read: Callable[[], Any]) -> Any:
+        """
+        Read a node with the writes of batches not committed yet applied on it.
+        `read` is not called if a pending write on the node or one of its ancestors replaces it as a whole.
+
+        Args:
+            path (str): path of the node, relative to the database root.
+            read (Callable[[], Any]): function reading the committed data of the node.
+
+        Returns:
+            Any: data of the node. None if the node doesn't exist.
+        """
+        path = path.strip("/")
+        writes: list[tuple[str, Any]] = self.pending(path)
+        if not writes:
+            return read()
+        depth: int = len(path.split("/"))
+        # the latest write replacing the whole node, if any, is the base the later writes under the node apply on.
+        start: int = next((i for i in reversed(range(len(writes))) if covers(writes[i][0], path)), -1)
+        if start < 0:
+            data: Any = copy.deepcopy(read())      # the read may be shared with the last known good copy.
+        else:
+            written, value = writes[start]
+            data = copy.deepcopy(descend(value, path.split("/")[len(written.split("/")):]))
+        for written, value in writes[start + 1:]:
+            data = assign(data, written.split("/")[depth:], copy.deepcopy(value))
+        return data
+
+    def _next(self) -> Batch | None:
+        """Wait until a batch is due, and take it. None if the queue is closed and drained."""
+        with self._condition:
+            while True:
+                if self._batches:
+                    batch: Batch = self._batches[0]
+                    due: float = batch.openedAt + self.window
+                    if self._closed or len(self._batches) > 1 or len(batch.updates) >= self.maxBatch or monotonic() >= due:
+                        batch.sealed = True
+                        return batch
+                    self._condition.wait(due - monotonic())
+                elif self._closed:
+                    return None
+                else:
+                    self._condition.wait()
+
+    def run(self) -> None:
+        while (batch := self._next()) is not None:
+            error: Exception | None = None
+            try:
+                self.commit(batch.updates, sorted(batch.touch))
+            except Exception as e:
+                error = e
+                log.exception("write-behind batch of %d writes on %d paths failed to commit", len(batch.futures), len(batch.updates))
+                FailedWrites.inc(len(batch.futures))
+            with self._condition:
+                # the batch stays visible to overlay() until it is committed.
+                self._batches.pop(0)
+                if error is None:
+                    self.committed += len(batch.futures)
+                    self.batches += 1
+                else:
+                    self.failed += len(batch.futures)
+            for callback in batch.callbacks if error is None else ():
+                try:
+                    callback()
+                except Exception:
+                    traceback.print_exc()
+            for future in batch.futures:
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Wait until every write submitted so far is committed."""
+        with self._condition:
+            futures: list[Future] = [future for batch in self._batches for future in batch.futures]
+            for batch in self._batches:
+                batch.openedAt = -inf      # commit without waiting for the window.
+            self._condition.notify()
+        for future in futures:
+            future.exception(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Commit the remaining writes and stop the queue."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
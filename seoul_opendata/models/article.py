@@ -1,26 +1,37 @@
 from datetime import date
-from typing import Any
-from uuid import UUID, uuid4
+from typing import Any, ClassVar
+from uuid import UUID
 from pydantic import BaseModel, Field
 
 from seoul_opendata.utils.dateutils import date2yyyy_mm_dd
+from seoul_opendata.utils.uuidutils import uuid7
 
 from .child_school import ChildSchool
 from .location import Location
 
 class Article(BaseModel):
     """게시글 모델."""
-    id: UUID = Field(default_factory=uuid4)
+    __indexed__: ClassVar[tuple[str, ...]] = ("location",)     # 보조 인덱스를 유지할 필드
+    __ordered__: ClassVar[tuple[str, ...]] = ("uploadAt", "eventStart")     # 서버 측 범위 질의에 사용할 필드
+    
+    id: UUID = Field(default_factory=uuid7)     # 작성 시각 순서로 정렬되는 UUID
     title: str
     content: str
     attachments: list[str]
     location: Location
+    latitude: float | None = Field(default=None)     # 위도. 행사 게시글은 행사 장소의 좌표를 가집니다.
+    longitude: float | None = Field(default=None)    # 경도
     childSchool: ChildSchool | None = Field(default=None, )
     uploadAt: date = Field(default_factory=date.today)
+    eventStart: date | None = Field(default=None)   # 행사 시작일. 행사 게시글만 가집니다.
+    eventEnd: date | None = Field(default=None)     # 행사 종료일
     
     def dict(self, *args, **kwargs) -> dict[str, Any]:
-        data: dict[str, Any] = super().dict(*args, exclude={"id", "uploadAt", "childSchool"}, **kwargs)
+        exclude: set[str] = {"id", "uploadAt", "eventStart", "eventEnd", "childSchool"} | set(kwargs.pop("exclude", None) or ())
+        data: dict[str, Any] = super().dict(*args, exclude=exclude, **kwargs)
         data["id"] = str(self.id)
         data["uploadAt"] = date2yyyy_mm_dd(self.uploadAt)
+        data["eventStart"] = date2yyyy_mm_dd(self.eventStart) if self.eventStart else None
+        data["eventEnd"] = date2yyyy_mm_dd(self.eventEnd) if self.eventEnd else None
         data["childSchoolId"] = self.childSchool.code if self.childSchool else None
         return data
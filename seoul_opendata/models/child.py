@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
@@ -10,6 +10,9 @@ if TYPE_CHECKING:
 
 class Child(BaseModel):
     """아이 정보 모델."""
+    __queried__: ClassVar[tuple[str, ...]] = ("parentId", "schoolCode")     # 서버 측 일치 질의에 사용할 필드 (저장된 데이터 기준)
+    __ordered__: ClassVar[tuple[str, ...]] = ("age",)                       # 서버 측 범위 질의에 사용할 필드
+    
     id: UUID = Field(default_factory=uuid4)
     name: str
     age: int
@@ -17,9 +20,9 @@ class Child(BaseModel):
     school: ChildSchool | None = None
     
     def dict(self, *args, **kwargs):
-        data: dict = super().dict(*args, **kwargs)
-        data.pop("parent")
+        exclude: set[str] = {"parent", "school"} | set(kwargs.pop("exclude", None) or ())     # parent and school refers back to this child.
+        data: dict = super().dict(*args, exclude=exclude, **kwargs)
+        data["id"] = str(self.id)
         data["parentId"] = self.parent.id
-        
-        data.pop("school")
         data["schoolCode"] = self.school.code if self.school else None
+        return data
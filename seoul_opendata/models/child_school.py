@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any
+from typing import Any, ClassVar
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -15,6 +15,9 @@ from .child import Child
 
 class ChildSchool(BaseModel):
     """유치원, 어린이집 모두가 공통으로 가지는 정보를 표현하는 모델."""
+    __queried__: ClassVar[tuple[str, ...]] = ("location", "establishType")   # 서버 측 일치 질의에 사용할 필드
+    __ordered__: ClassVar[tuple[str, ...]] = ("establishAt",)                # 서버 측 범위 질의에 사용할 필드
+    
     code: str                                           # 유치원 고유 id
     name: str                                           # 시설명
     representerName: str                                # 대표자명
@@ -24,6 +27,8 @@ class ChildSchool(BaseModel):
     establishType: EstablishType                        # 설립유형
     establishAt: date                                   # 설립일자
     openingTime: str                                    # 운영 시간
+    latitude: float | None = None                       # 위도
+    longitude: float | None = None                      # 경도
     articles: list[UUID]                                # 시설이 등록한 게시글 id 목록
     children: list[Child] = Field(default_factory=list)    # 해당 시설에 등록된 아이들
     
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from datetime import date
 
 from typing import Optional, TypedDict, TypeVar
 
@@ -146,6 +145,8 @@ class ChildSchoolCreate(BaseModel):
     establishAt: str                # 설립일자
     openingTime: str                # 운영 시간
     children: list[str]             # 자녀 목록
+    latitude: Optional[float] = Field(default=None)     # 위도
+    longitude: Optional[float] = Field(default=None)    # 경도
 
 class ChildSchoolRead(BaseModel):
     code: str        # 유치원 고유 id
@@ -172,6 +173,8 @@ class ChildSchoolData(TypedDict):
     establishAt: str                # 설립일자
     openingTime: str                # 운영 시간
     children: list[str]
+    latitude: Optional[float]       # 위도
+    longitude: Optional[float]      # 경도
 
 class ArticleCreate(BaseModel):
     title: str
@@ -179,7 +182,11 @@ class ArticleCreate(BaseModel):
     attachments: list[str]
     location: Location
     childSchoolId: Optional[str] = Field(default=None)
-    uploadAt: Optional[str] = Field(default_factory=date.today)
+    uploadAt: Optional[str] = Field(default=None)       # YYYY-MM-DD. 시각이 포함될 수 있습니다. 기본 값은 오늘입니다.
+    latitude: Optional[float] = Field(default=None)     # 위도
+    longitude: Optional[float] = Field(default=None)    # 경도
+    eventStart: Optional[str] = Field(default=None)     # 행사 시작일 (YYYY-MM-DD)
+    eventEnd: Optional[str] = Field(default=None)       # 행사 종료일 (YYYY-MM-DD)
 
 class ArticleRead(BaseModel):
     id: str
@@ -205,3 +212,7 @@ class ArticleData(TypedDict):
     location: str
     uploadAt: str
     childSchoolId: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    eventStart: Optional[str]
+    eventEnd: Optional[str]
@@ -2,10 +2,20 @@ from .user_route import user_router
 from .child_school_route import child_school_router
 from .child_route import child_router
 from .article_route import article_router
+from .search_route import search_router
+from .stats_route import stats_router
+from .ingest_route import ingest_router
+from .metrics_route import metrics_router
+from .admin_route import admin_router
 
 __all__ = (
     "user_router",
     "child_school_router",
     "child_router",
-    "article_router"
+    "article_router",
+    "search_router",
+    "stats_router",
+    "ingest_router",
+    "metrics_router",
+    "admin_router"
 )
\ No newline at end of file
@@ -0,0 +1,87 @@
+import hmac
+import os
+from threading import BoundedSemaphore
+from typing import Final
+import anyio
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse
+
+from seoul_opendata.utils.profiler import RequestProfiles, SamplingProfiler
+
+__all__ = ("admin_router", "authorized", "Profilers")
+
+admin_router: Final[APIRouter] = APIRouter(prefix="/admin")
+
+MaxProfileSeconds: Final[float] = 60
+# 동시에 도는 프로파일러 수. 샘플링 스레드가 늘어나 워커가 느려지지 않도록 제한합니다.
+Profilers: Final[BoundedSemaphore] = BoundedSemaphore(int(os.environ.get("ADMIN_MAX_PROFILERS", 2)))
+
+def authorized(request: Request) -> bool:
+    """
+    요청이 관리자 토큰을 가지고 있는지 확인합니다.
+    토큰은 `Authorization: Bearer <토큰>` 또는 `X-Admin-Token` 헤더로 받으며, `ADMIN_TOKEN` 환경 변수가 없으면 항상 거부합니다.
+    """
+    token: str | None = os.environ.get("ADMIN_TOKEN")
+    if not token:
+        return False
+    given: str = request.headers.get("X-Admin-Token", "")
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer":
+        given = credentials.strip()
+    return hmac.compare_digest(given.encode(), token.encode())
+
+def denied(response: Response) -> dict[str, str]:
+    if not os.environ.get("ADMIN_TOKEN"):
+        response.status_code = status.HTTP_403_FORBIDDEN
+        return {"message": "Admin routes are disabled.", "code": "ADMIN_DISABLED"}
+    response.status_code = status.HTTP_401_UNAUTHORIZED
+    return {"message": "Invalid admin token.", "code": "UNAUTHORIZED"}
+
+@admin_router.get("/profile")
+async def profile_worker(
+    request: Request,
+    response: Response,
+    seconds: float = Query(default=10, gt=0, le=MaxProfileSeconds),
+    interval: float = Query(default=0.005, ge=0.001, le=1)
+):
+    """
+    이 워커를 주어진 시간 동안 샘플링 프로파일러로 프로파일합니다.
+    결과는 flamegraph.pl, speedscope 등에서 바로 읽을 수 있는 collapsed stack 형식이며,
+    각 스택은 라우트 처리기나 레포지토리 메소드 등 `seoul_opendata`의 첫 프레임부터 시작합니다.
+    요청 하나만 프로파일하려면 그 요청에 관리자 토큰과 `X-Profile: 1` 헤더를 붙이세요. 응답의 `X-Profile-Id`로 결과를 조회할 수 있습니다.
+
+    Returns:
+        PlainTextResponse: `함수;...;함수 샘플 수` 형식의 줄들. 권한이 없거나 이미 다른 프로파일이 실행 중이면 오류 메세지로 응답합니다.
+    """
+    if not authorized(request):
+        return denied(response)
+    if not Profilers.acquire(blocking=False):
+        response.status_code = status.HTTP_409_CONFLICT
+        return {"message": "Too many profiles are running.", "code": "PROFILER_BUSY"}
+    try:
+        profiler = SamplingProfiler(interval).start()
+        try:
+            await anyio.sleep(seconds)
+        finally:
+            profiler.stop()
+    finally:
+        Profilers.release()
+    return PlainTextResponse(profiler.collapsed(), headers={"X-Profile-Samples": str(profiler.samples.total())})
+
+@admin_router.get("/profile/requests/{profile_id}")
+def get_request_profile(profile_id: str, request: Request, response: Response):
+    """
+    `X-Profile` 헤더로 프로파일한 요청의 결과를 가져옵니다. 최근 결과만 보관합니다.
+
+    Args:
+        profile_id (str): 프로파일한 요청의 응답에 포함된 `X-Profile-Id`
+
+    Returns:
+        PlainTextResponse: collapsed stack 형식의 결과. 권한이 없거나 결과가 없으면 오류 메세지로 응답합니다.
+    """
+    if not authorized(request):
+        return denied(response)
+    if (collapsed := RequestProfiles.get(profile_id)) is None:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return {"message": "Profile not found.", "code": "NOT_FOUND"}
+    return PlainTextResponse(collapsed)
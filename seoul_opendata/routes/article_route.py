@@ -1,41 +1,155 @@
+from datetime import date
 from typing import Final
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request, Response
 from seoul_opendata.firebase.controller import DB
 from seoul_opendata.models.payloads import ArticleCreate, ArticleDelete, ArticleRead, ArticleUpdate
+from seoul_opendata.routes.conditional import notModified
+from seoul_opendata.models import Location
+from seoul_opendata.search import DistrictGraph, eventGrid
+from seoul_opendata.seoul_openapi import OpenData
 
 __all__ = ("article_router",)
 
 article_router: Final[APIRouter] = APIRouter(prefix="/articles")
+DefaultPageSize: Final[int] = 20
+
+def isFeedRequest(since: date | None, until: date | None, limit: int | None, before: str | None) -> bool:
+    """피드 파라미터가 하나라도 주어졌는지 확인합니다. 주어지지 않으면 기존처럼 모든 게시글을 응답합니다."""
+    return any(param is not None for param in (since, until, limit, before))
 
 @article_router.get("/")
-def get_all_articles():
+def get_all_articles(
+    request: Request,
+    response: Response,
+    since: date | None = None,
+    until: date | None = None,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    before: str | None = None
+):
     """
     모든 Article을 반환합니다.
+    since, until, limit, before 중 하나라도 주어지면, 해당 기간에 작성된 게시글을 최신 순으로 limit개만 반환합니다.
+    If-None-Match 헤더의 ETag가 최신이면 304 응답을 보냅니다.
+
+    Args:
+        since (date | None): 작성일의 하한 (YYYY-MM-DD, 포함)
+        until (date | None): 작성일의 상한 (YYYY-MM-DD, 포함)
+        limit (int | None): 가져올 게시글 수. 기본 값은 20개입니다.
+        before (str | None): 이전 페이지의 마지막 게시글 id. 이보다 먼저 작성된 게시글만 가져옵니다.
 
     Returns:
-        dict[str, dict[str, Article]]: 
+        dict[str, dict[str, Article]] | list[dict[str, Any]]: 
     """
-    return DB.article.readAll()
+    if (cached := notModified(request, response, "articles")) is not None:
+        return cached
+    if not isFeedRequest(since, until, limit, before):
+        return DB.article.readAll()
+    return [
+        article.dict()
+        for article in DB.article.readLatest(limit or DefaultPageSize, since=since, until=until, before=before)
+    ]
 
 @article_router.get("/events")
-def get_all_event_articles():
+def get_all_event_articles(
+    request: Request,
+    response: Response,
+    since: date | None = None,
+    until: date | None = None,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    before: str | None = None,
+    upcoming: bool = False
+):
     """
     모든 행사 관련 Article을 반환합니다.
+    since, until, limit, before 중 하나라도 주어지면, 해당 기간에 작성된 게시글을 최신 순으로 limit개만 반환합니다.
+    upcoming이 참이면, 행사 시작일이 since(기본 값은 오늘)와 until 사이인 게시글을 시작일 순으로 limit개만 반환합니다.
+    If-None-Match 헤더의 ETag가 최신이면 304 응답을 보냅니다.
+
+    Args:
+        since (date | None): 작성일(upcoming이면 행사 시작일)의 하한 (YYYY-MM-DD, 포함)
+        until (date | None): 작성일(upcoming이면 행사 시작일)의 상한 (YYYY-MM-DD, 포함)
+        limit (int | None): 가져올 게시글 수. 기본 값은 20개입니다.
+        before (str | None): 이전 페이지의 마지막 게시글 id. upcoming이 아닐 때에만 사용합니다.
+        upcoming (bool): 다가오는 행사만 가져올 지 여부
 
     Returns:
-        dict[str, Article]: 
+        dict[str, Article] | list[dict[str, Any]]: 
     """
-    return DB.article.readAllEventArticles()
+    # 다가오는 행사는 오늘 날짜에 따라 달라지므로, 실제로 적용한 조건을 ETag에 포함합니다.
+    variant: str | None = f"upcoming.{since or date.today()}.{until}.{limit or DefaultPageSize}" if upcoming else None
+    if (cached := notModified(request, response, "articles/events", variant)) is not None:
+        return cached
+    if upcoming:
+        return [article.dict() for article in DB.article.readUpcomingEvents(limit or DefaultPageSize, since or date.today(), until)]
+    if not isFeedRequest(since, until, limit, before):
+        return DB.article.readAllEventArticles()
+    return [
+        article.dict()
+        for article in DB.article.readLatest(limit or DefaultPageSize, since=since, until=until, before=before, group="events")
+    ]
+
+@article_router.get("/events/nearby")
+def get_nearby_event_articles(
+    lat: float = Query(ge=-90, le=90),
+    lng: float = Query(ge=-180, le=180),
+    radius: float = Query(default=3.0, gt=0, le=50)
+):
+    """
+    주어진 좌표로부터 반경 안에서 열리는 행사 게시글을 가까운 순서로 반환합니다.
+
+    Args:
+        lat (float): 위도
+        lng (float): 경도
+        radius (float): 검색 반경(km)
+
+    Returns:
+        list[dict[str, Any]]: 거리(km)가 포함된 게시글 목록으로 응답합니다.
+    """
+    return [
+        {"distanceKm": round(distance, 3), **event.dict()}
+        for distance, event in OpenData.derive(eventGrid).within(lat, lng, radius)
+    ]
+
+@article_router.get("/events/recommend")
+def recommend_event_articles(location: Location, limit: int = Query(default=20, ge=1, le=100)):
+    """
+    주어진 지역구의 행사 게시글부터, 중심점이 가까운 이웃 지역구의 행사 게시글 순서로 추천합니다.
+
+    Args:
+        location (Location): 기준 지역구
+        limit (int): 가져올 게시글 수
+
+    Returns:
+        list[dict[str, Any]]: 지역구 사이의 거리(km)와 인접 여부가 포함된 게시글 목록으로 응답합니다.
+    """
+    return OpenData.derive(DistrictGraph).recommendEvents(location, limit)
 
 @article_router.get("/{child_school_id}")
-def get_all_child_school_articles(child_school_id: str):
+def get_all_child_school_articles(
+    child_school_id: str,
+    request: Request,
+    response: Response,
+    since: date | None = None,
+    until: date | None = None,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    before: str | None = None
+):
     """
     특정 기관의 모든 Article을 반환합니다.
+    since, until, limit, before 중 하나라도 주어지면, 해당 기간에 작성된 게시글을 최신 순으로 limit개만 반환합니다.
+    If-None-Match 헤더의 ETag가 최신이면 304 응답을 보냅니다.
 
     Returns:
-        dict[str, Article]: 
+        dict[str, Article] | list[dict[str, Any]]: 
     """
-    return DB.article.readAllChildSchoolArticles(child_school_id)
+    if (cached := notModified(request, response, f"articles/{child_school_id}")) is not None:
+        return cached
+    if not isFeedRequest(since, until, limit, before):
+        return DB.article.readAllChildSchoolArticles(child_school_id)
+    return [
+        article.dict()
+        for article in DB.article.readLatest(limit or DefaultPageSize, since=since, until=until, before=before, group=child_school_id)
+    ]
 
 @article_router.post("/events")
 def create_event_article(body: ArticleCreate):
@@ -48,7 +162,7 @@ def create_event_article(body: ArticleCreate):
     Returns:
         Article: 게시글 모델
     """
-    return DB.article.createChildSchoolArticle(body)
+    return DB.article.createEventArticle(body)
 
 @article_router.get("/events/{article_id}")
 def get_event_article(article_id: str):
@@ -61,7 +175,7 @@ def get_event_article(article_id: str):
     Returns:
         Article: 게시글 모델
     """
-    return DB.article.readChildSchoolArticle(ArticleRead(id=article_id, childSchoolId=None))
+    return DB.article.readEventArticle(ArticleRead(id=article_id, childSchoolId=None))
 
 @article_router.put("/events/{article_id}")
 def update_event_article(article_id: str, body: ArticleUpdate):
@@ -1,23 +1,135 @@
 from typing import Final
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request, Response
 
 from seoul_opendata.firebase.controller import DB
 from seoul_opendata.models.payloads import ChildSchoolCreate, ChildSchoolRead, ChildSchoolUpdate
+from seoul_opendata.routes.conditional import notModified
+from seoul_opendata.models import Location
+from seoul_opendata.search import DistrictGraph, schoolGrid
+from seoul_opendata.seoul_openapi import OpenData
+from seoul_opendata.seoul_openapi.facets import FacetIndex, FacetsByName
+from seoul_opendata.seoul_openapi.scoring import SchoolScorer
 
 __all__ = ("child_school_router",)
 
 child_school_router: Final[APIRouter] = APIRouter(prefix="/childschools")
 
 @child_school_router.get("/all")
-def get_all_childschools():
+def get_all_childschools(request: Request, response: Response):
     """
     모든 유치원 정보를 가져옵니다.
+    If-None-Match 헤더의 ETag가 최신이면 304 응답을 보냅니다.
 
     Returns:
         dict[str, ChildSchool]: 유치원 고유 코드와 유치원 모델 데이터로 구성된 맵을 응답으로 보냅니다.
     """
+    if (cached := notModified(request, response, "childschool")) is not None:
+        return cached
     return DB.childSchool.readAll()
 
+@child_school_router.get("/search")
+def search_childschools(request: Request, page: int = Query(default=1, ge=1), size: int = Query(default=20, ge=1, le=100)):
+    """
+    공공데이터의 속성으로 유치원을 필터링하고, 패싯별 개수를 함께 응답합니다.
+    범주형/여부 패싯은 `location=강남구&establishType=공립&bus=true` 처럼 값으로,
+    수치 패싯은 `classroomsMin=6&teachersMax=20` 처럼 `{패싯}Min`, `{패싯}Max`로 필터링합니다.
+    같은 패싯을 여러 번 지정하면 OR 조건으로 결합합니다.
+
+    Returns:
+        dict[str, Any]: 전체 결과 수, 패싯별 개수, 해당 페이지의 유치원 요약 목록으로 응답합니다. 알 수 없는 패싯이 있으면 오류 메세지로 응답합니다.
+    """
+    filters: dict[str, list[str]] = {}
+    ranges: dict[str, tuple[float | None, float | None]] = {}
+    for key, value in request.query_params.multi_items():
+        if key in ("page", "size"):
+            continue
+        name, bound = (key[:-3], key[-3:]) if key.endswith(("Min", "Max")) else (key, None)
+        facet = FacetsByName.get(name)
+        if facet is None or (facet.kind == "range") != (bound is not None):
+            return {"message": f"Unknown facet filter {key}.", "code": "INVALID_REQUEST"}
+        if bound is None:
+            filters.setdefault(name, []).append(value)
+            continue
+        try:
+            low, high = ranges.get(name, (None, None))
+            ranges[name] = (float(value), high) if bound == "Min" else (low, float(value))
+        except ValueError:
+            return {"message": f"Facet filter {key} must be a number.", "code": "INVALID_REQUEST"}
+    
+    return OpenData.derive(FacetIndex).search(filters, ranges, page, size)
+
+@child_school_router.get("/ranking")
+def rank_childschools(
+    safety: float = Query(default=1.0, ge=0),
+    hygiene: float = Query(default=1.0, ge=0),
+    meal: float = Query(default=1.0, ge=0),
+    tenure: float = Query(default=1.0, ge=0),
+    space: float = Query(default=1.0, ge=0),
+    distance: float = Query(default=1.0, ge=0),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    k: int = Query(default=20, ge=1, le=100)
+):
+    """
+    사용자가 정한 기준별 가중치로 유치원의 점수를 매겨, 점수가 높은 순서로 가져옵니다.
+    각 기준은 0~1로 정규화되며, 점수는 가중치의 합으로 나눈 가중 평균입니다.
+
+    Args:
+        safety (float): 안전 점검(CCTV, 소방대피훈련, 가스/전기/놀이시설 점검) 가중치
+        hygiene (float): 위생 점검(실내공기질, 정기소독) 가중치
+        meal (float): 급식(영양교사, 집단급식소) 가중치
+        tenure (float): 교직원 평균 근속연수 가중치
+        space (float): 원아 1명당 교실 면적 가중치
+        distance (float): 거리 가중치. lat, lng가 주어진 경우에만 사용합니다.
+        lat (float | None): 거리 기준의 위도
+        lng (float | None): 거리 기준의 경도
+        k (int): 가져올 유치원 수
+
+    Returns:
+        list[dict[str, Any]]: 점수와 기준별 값이 포함된 유치원 요약 목록으로 응답합니다.
+    """
+    weights: dict[str, float] = {
+        "safety": safety, "hygiene": hygiene, "meal": meal, "tenure": tenure, "space": space, "distance": distance
+    }
+    return OpenData.derive(SchoolScorer).rank(weights, k, lat, lng)
+
+@child_school_router.get("/nearby")
+def get_nearby_childschools(
+    lat: float = Query(ge=-90, le=90),
+    lng: float = Query(ge=-180, le=180),
+    k: int = Query(default=10, ge=1, le=100)
+):
+    """
+    주어진 좌표에서 가장 가까운 유치원 k개를 가까운 순서로 가져옵니다.
+
+    Args:
+        lat (float): 위도
+        lng (float): 경도
+        k (int): 가져올 유치원 수
+
+    Returns:
+        list[dict[str, Any]]: 거리(km)가 포함된 유치원 요약 목록으로 응답합니다.
+    """
+    dataset = OpenData.dataset
+    return [
+        {"distanceKm": round(distance, 3), **dataset.summary(i)}
+        for distance, i in OpenData.derive(schoolGrid).nearest(lat, lng, k)
+    ]
+
+@child_school_router.get("/recommend")
+def recommend_childschools(location: Location, limit: int = Query(default=20, ge=1, le=100)):
+    """
+    주어진 지역구의 유치원부터, 중심점이 가까운 이웃 지역구의 유치원 순서로 추천합니다.
+
+    Args:
+        location (Location): 기준 지역구
+        limit (int): 가져올 유치원 수
+
+    Returns:
+        list[dict[str, Any]]: 지역구 사이의 거리(km)와 인접 여부가 포함된 유치원 요약 목록으로 응답합니다.
+    """
+    return OpenData.derive(DistrictGraph).recommendSchools(OpenData.dataset, location, limit)
+
 @child_school_router.get("/{code}")
 def get_childschool(code: str):
     """
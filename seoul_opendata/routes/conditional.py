@@ -0,0 +1,52 @@
+from fastapi import Request, Response, status
+
+from seoul_opendata.firebase.controller import DB
+from seoul_opendata.utils.metrics import CacheLookups
+
+__all__ = ("notModified", "matchETag")
+
+
+def notModified(request: Request, response: Response, subtree: str, variant: str | None = None) -> Response | None:
+    """
+    ETag를 응답 헤더에 추가하고, 클라이언트의 캐시가 최신인 경우 304 응답을 만듭니다.
+    데이터베이스에 접근하거나 데이터를 직렬화하지 않고, 서브트리의 버전 카운터만을 비교합니다.
+
+    Args:
+        request (Request): 요청 객체
+        response (Response): 엔드포인트의 응답 객체
+        subtree (str): 엔드포인트가 반환하는 데이터베이스 서브트리의 경로
+        variant (str | None, optional): 데이터가 같아도 응답이 달라지는 조건. 예) 오늘 날짜에 따라 달라지는 기본 값
+
+    Returns:
+        Response | None: 클라이언트의 캐시가 최신이면 304 응답을, 아니라면 None을 반환합니다.
+    """
+    etag: str = DB.versions.etag(subtree)
+    if variant is not None:
+        etag = f'{etag[:-1]}-{variant}"'
+    return matchETag(request, response, etag)
+
+
+def matchETag(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    주어진 ETag를 응답 헤더에 추가하고, 클라이언트의 If-None-Match 헤더와 일치하면 304 응답을 만듭니다.
+
+    Args:
+        request (Request): 요청 객체
+        response (Response): 엔드포인트의 응답 객체
+        etag (str): 따옴표로 감싼 ETag 값
+
+    Returns:
+        Response | None: 클라이언트의 캐시가 최신이면 304 응답을, 아니라면 None을 반환합니다.
+    """
+    response.headers["ETag"] = etag
+
+    ifNoneMatch: str | None = request.headers.get("if-none-match")
+    if ifNoneMatch is None:
+        return None
+
+    tags: list[str] = [tag.strip().removeprefix("W/") for tag in ifNoneMatch.split(",")]
+    if "*" in tags or etag in tags:
+        CacheLookups.inc(cache="etag", result="hit")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    CacheLookups.inc(cache="etag", result="miss")
+    return None
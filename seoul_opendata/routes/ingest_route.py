@@ -0,0 +1,19 @@
+from typing import Final
+from fastapi import APIRouter
+
+from seoul_opendata.seoul_openapi import OpenData, Scheduler
+
+__all__ = ("ingest_router",)
+
+ingest_router: Final[APIRouter] = APIRouter(prefix="/ingest")
+
+@ingest_router.get("/")
+def get_ingest_metrics():
+    """
+    공공데이터 수집 파이프라인의 상태를 가져옵니다.
+    공공데이터는 리더 워커만 수집하므로, 다른 워커는 빈 지표로 응답합니다.
+
+    Returns:
+        dict[str, Any]: 데이터 버전, 리더 여부, 단계별 처리량(processed, throughput)과 큐 깊이(queueDepth, maxQueueDepth)로 응답합니다.
+    """
+    return {"version": OpenData.version, "leader": Scheduler.leader, **OpenData.ingestMetrics()}
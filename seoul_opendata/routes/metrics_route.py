@@ -0,0 +1,25 @@
+from typing import Final
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from seoul_opendata.utils.metrics import Gauge, Histogram, render
+
+__all__ = ("metrics_router", "RequestDuration", "RequestsInFlight")
+
+metrics_router: Final[APIRouter] = APIRouter()
+
+RequestDuration: Final[Histogram] = Histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests by route.", ("method", "route", "status")
+)
+RequestsInFlight: Final[Gauge] = Gauge("http_requests_in_flight", "HTTP requests being handled by this worker.")
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    이 워커의 운영 지표를 Prometheus 텍스트 형식으로 가져옵니다.
+    라우트별 응답 시간, 레포지토리 메소드와 firebase 경로별 호출 시간, 캐시 적중률, 공공데이터 수집 지표를 포함합니다.
+
+    Returns:
+        PlainTextResponse: Prometheus 텍스트 형식(0.0.4)의 지표
+    """
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
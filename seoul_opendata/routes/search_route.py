@@ -0,0 +1,29 @@
+from typing import Final
+from fastapi import APIRouter, Query
+
+from seoul_opendata.search import Search, SearchTarget
+
+__all__ = ("search_router",)
+
+search_router: Final[APIRouter] = APIRouter(prefix="/search")
+
+@search_router.get("/")
+def search(
+    q: str = Query(min_length=1),
+    target: SearchTarget = "all",
+    page: int = Query(default=1, ge=1),
+    size: int = Query(default=20, ge=1, le=100)
+):
+    """
+    유치원(이름, 대표자명, 주소)과 게시글(제목, 내용)을 검색합니다.
+
+    Args:
+        q (str): 검색어. 주소나 이름의 일부만으로도 검색할 수 있습니다.
+        target (SearchTarget): 검색 대상. all, childschool, article 중 하나입니다.
+        page (int): 1부터 시작하는 페이지 번호
+        size (int): 페이지 크기
+
+    Returns:
+        dict[str, Any]: 전체 결과 수와, 점수 순으로 정렬된 해당 페이지의 결과 목록으로 응답합니다.
+    """
+    return Search.search(q, target, page, size)
@@ -0,0 +1,47 @@
+from typing import Final
+from fastapi import APIRouter, Request, Response
+
+from seoul_opendata.models import Location
+from seoul_opendata.routes.conditional import matchETag
+from seoul_opendata.seoul_openapi import OpenData
+from seoul_opendata.seoul_openapi.stats import DistrictStats
+
+__all__ = ("stats_router",)
+
+stats_router: Final[APIRouter] = APIRouter(prefix="/stats")
+
+def opendataETag() -> str:
+    """병합된 공공데이터의 버전으로 만든 ETag입니다."""
+    return f'"opendata-{OpenData.version}"'
+
+@stats_router.get("/")
+def get_all_stats(request: Request, response: Response):
+    """
+    서울시 전체와 지역구별 유치원 통계를 가져옵니다.
+    통계는 공공데이터가 갱신될 때에만 다시 계산됩니다.
+
+    Returns:
+        dict[str, Any]: 데이터 버전과, 지역구(전체는 all)별 통계로 응답합니다.
+    """
+    if (cached := matchETag(request, response, opendataETag())) is not None:
+        return cached
+    stats: DistrictStats = OpenData.derive(DistrictStats)
+    return {"version": stats.version, "districts": stats.districts}
+
+@stats_router.get("/{location}")
+def get_district_stats(location: Location, request: Request, response: Response):
+    """
+    지역구의 유치원 통계를 가져옵니다.
+
+    Args:
+        location (Location): 지역구
+
+    Returns:
+        dict[str, Any]: 지역구의 통계로 응답합니다. 해당 지역구의 유치원이 없으면 오류 메시지를 보냅니다.
+    """
+    if (cached := matchETag(request, response, opendataETag())) is not None:
+        return cached
+    stats: DistrictStats = OpenData.derive(DistrictStats)
+    if location.value not in stats.districts:
+        return {"message": f"No child school in {location.value}.", "code": "INVALID_REQUEST"}
+    return {"version": stats.version, "location": location, **stats.districts[location.value]}
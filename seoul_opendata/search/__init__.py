@@ -0,0 +1,21 @@
+from typing import Final, cast
+
+from seoul_opendata.firebase.controller import DB
+from .index import SearchIndex, SearchTarget
+from .spatial import GeoGrid, eventGrid, schoolGrid
+from .districts import DistrictGraph
+from .tokenizer import tokenize
+from seoul_opendata.utils.lazy import Lazy
+
+__all__ = (
+    "SearchIndex",
+    "SearchTarget",
+    "tokenize",
+    "GeoGrid",
+    "schoolGrid",
+    "eventGrid",
+    "DistrictGraph",
+    "Search"
+)
+
+Search: Final[SearchIndex] = cast(SearchIndex, Lazy(lambda: SearchIndex(DB)))
@@ -0,0 +1,96 @@
+from typing import Any, Final, Iterator
+
+from seoul_opendata.models.article import Article
+from seoul_opendata.models.location import Location
+from seoul_opendata.seoul_openapi.dataset import Dataset
+from seoul_opendata.utils.geo import distance_km
+
+AdjacentCount: Final[int] = 4       # 인접 구로 볼, 중심점이 가까운 구의 수
+
+
+class DistrictGraph:
+    """
+    서울시 자치구 사이의 거리 그래프입니다.
+    각 구의 중심점은 공공데이터 유치원 좌표의 평균으로 계산하고,
+    모든 구 쌍의 거리와 구마다 가까운 순으로 정렬한 이웃 목록을 미리 계산해 둡니다.
+    """
+    centroids: Final[dict[Location, tuple[float, float]]]
+    distances: Final[dict[Location, dict[Location, float]]]
+    ranked: Final[dict[Location, list[Location]]]
+    adjacent: Final[dict[Location, set[Location]]]
+    schools: Final[dict[Location, list[int]]]
+    events: Final[dict[Location, list[Article]]]
+
+    def __init__(self, dataset: Dataset) -> None:
+        sums: dict[Location, list[float]] = {}
+        self.schools = {}
+        for i, location in enumerate(dataset.locations):
+            if location is None:
+                continue
+            self.schools.setdefault(location, []).append(i)
+            lat, lng = dataset.latitudes[i], dataset.longitudes[i]
+            if lat is not None and lng is not None:
+                acc: list[float] = sums.setdefault(location, [0.0, 0.0, 0])
+                acc[0] += lat
+                acc[1] += lng
+                acc[2] += 1
+
+        self.events = {}
+        for event in dataset.events:
+            self.events.setdefault(event.location, []).append(event)
+
+        self.centroids = {location: (lat / n, lng / n) for location, (lat, lng, n) in sums.items()}
+        self.distances = {
+            a: {b: distance_km(*ca, *cb) for b, cb in self.centroids.items()}
+            for a, ca in self.centroids.items()
+        }
+        self.ranked = {
+            a: sorted((b for b in row if b != a), key=row.__getitem__)
+            for a, row in self.distances.items()
+        }
+        # 가까운 구 관계를 대칭으로 만들어, 한 쪽에서만 가까운 경우도 인접한 것으로 봅니다.
+        self.adjacent = {location: set() for location in self.centroids}
+        for a, neighbors in self.ranked.items():
+            for b in neighbors[:AdjacentCount]:
+                self.adjacent[a].add(b)
+                self.adjacent[b].add(a)
+
+    def expand(self, location: Location) -> Iterator[tuple[Location, float]]:
+        """
+        주어진 구에서 시작해, 중심점이 가까운 구 순서로 순회합니다.
+        좌표가 없어 중심점을 알 수 없는 구라면 자기 자신만 순회합니다.
+
+        Yields:
+            tuple[Location, float]: 구와, 주어진 구의 중심점으로부터의 거리(km)
+        """
+        yield location, 0.0
+        for neighbor in self.ranked.get(location, []):
+            yield neighbor, self.distances[location][neighbor]
+
+    def recommendSchools(self, dataset: Dataset, location: Location, limit: int) -> list[dict[str, Any]]:
+        """주어진 구의 유치원부터, 가까운 구의 유치원 순으로 최대 limit개를 반환합니다."""
+        results: list[dict[str, Any]] = []
+        for district, distance in self.expand(location):
+            for i in self.schools.get(district, []):
+                if len(results) >= limit:
+                    return results
+                results.append({
+                    "districtDistanceKm": round(distance, 3),
+                    "adjacent": district in self.adjacent.get(location, ()),
+                    **dataset.summary(i)
+                })
+        return results
+
+    def recommendEvents(self, location: Location, limit: int) -> list[dict[str, Any]]:
+        """주어진 구의 행사 게시글부터, 가까운 구의 행사 게시글 순으로 최대 limit개를 반환합니다."""
+        results: list[dict[str, Any]] = []
+        for district, distance in self.expand(location):
+            for event in self.events.get(district, []):
+                if len(results) >= limit:
+                    return results
+                results.append({
+                    "districtDistanceKm": round(distance, 3),
+                    "adjacent": district in self.adjacent.get(location, ()),
+                    **event.dict()
+                })
+        return results
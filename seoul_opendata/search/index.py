@@ -0,0 +1,234 @@
+import heapq
+import logging
+from collections import Counter
+from math import log
+from threading import Event, Lock, Thread
+from typing import Any, ClassVar, Final, Literal
+
+from seoul_opendata.firebase.controller import DBException, FirebaseController
+from seoul_opendata.firebase.deadline import Deadline, currentDeadline
+from seoul_opendata.firebase.indexes import walkEntries
+from seoul_opendata.search.tokenizer import isHangul, tokenize
+
+SearchTarget = Literal["all", "childschool", "article"]
+logger: Final[logging.Logger] = logging.getLogger(__name__)
+
+# Indexed subtrees mapped to (depth of entry keys, searchable fields with their weights).
+SearchFields: Final[dict[str, tuple[int, dict[str, float]]]] = {
+    "childschool": (1, {"name": 3.0, "representerName": 1.5, "address": 1.0}),
+    "articles": (2, {"title": 3.0, "content": 1.0})
+}
+# Subtrees mapped to the document type shown in search results, which is also the search target name.
+DocumentTypes: Final[dict[str, str]] = {
+    "childschool": "childschool",
+    "articles": "article"
+}
+# Fields kept in search results, so that results can be rendered without reading the database.
+SummaryFields: Final[dict[str, tuple[str, ...]]] = {
+    "childschool": ("code", "name", "address", "location", "establishType"),
+    "articles": ("id", "title", "location", "uploadAt", "childSchoolId")
+}
+
+
+class SearchIndexNotReady(DBException):
+    """The search index is not built yet, and wasn't built within the deadline of the request."""
+    status: ClassVar[int] = 503
+
+    def __init__(self) -> None:
+        super().__init__({
+            "message": "Search index is being built. Try again later.",
+            "code": "SEARCH_NOT_READY"
+        })
+
+
+class SearchIndex:
+    """
+    유치원과 게시글을 검색하는 인메모리 역색인입니다.
+    저장소의 쓰기 이벤트로 점진적으로 갱신되고, 다른 워커의 쓰기는 서브트리 버전 카운터로 감지해 백그라운드에서 다시 빌드합니다.
+    """
+    controller: Final[FirebaseController]
+
+    def __init__(self, controller: FirebaseController) -> None:
+        self.controller = controller
+        self.postings: dict[str, dict[str, float]] = {}     # token -> {document path: weighted term frequency}
+        self.documents: dict[str, dict[str, Any]] = {}      # document path -> summary
+        self.terms: dict[str, dict[str, float]] = {}        # document path -> {token: weighted term frequency}
+        self.syllables: dict[str, set[str]] = {}            # hangul syllable -> bigram tokens containing it
+        self.seen: dict[str, int] = {}                      # subtree -> writes of the other workers reflected in this index
+        self.built: bool = False
+        self._lock = Lock()
+        self._buildLock = Lock()
+        self._building: Event | None = None                 # set when the running build finishes.
+        self._backlog: list[tuple[str, Any]] | None = None  # writes made while a build reads the database, replayed on it.
+        controller.addWriteListener(self.onWrite)
+
+    @staticmethod
+    def subtreeOf(path: str) -> str:
+        return path.split("/", 1)[0]
+
+    def _remove(self, path: str) -> None:
+        for token in self.terms.pop(path, {}):
+            docs: dict[str, float] = self.postings[token]
+            del docs[path]
+            if not docs:
+                del self.postings[token]
+                if len(token) == 2 and isHangul(token):
+                    for syllable in set(token):
+                        bigrams: set[str] = self.syllables[syllable]
+                        bigrams.discard(token)
+                        if not bigrams:
+                            del self.syllables[syllable]
+        self.documents.pop(path, None)
+
+    def _add(self, path: str, data: dict[str, Any]) -> None:
+        subtree: str = self.subtreeOf(path)
+        terms: Counter[str] = Counter()
+        for field, weight in SearchFields[subtree][1].items():
+            for token in tokenize(str(data.get(field) or "")):
+                terms[token] += weight
+
+        self.terms[path] = dict(terms)
+        for token, tf in terms.items():
+            if token not in self.postings and len(token) == 2 and isHangul(token):
+                for syllable in token:
+                    self.syllables.setdefault(syllable, set()).add(token)
+            self.postings.setdefault(token, {})[path] = tf
+        self.documents[path] = {"type": DocumentTypes[subtree], **{f: data.get(f) for f in SummaryFields[subtree]}}
+
+    def onWrite(self, path: str, before: Any, after: Any) -> None:
+        subtree: str = self.subtreeOf(path)
+        if subtree not in SearchFields:
+            return
+        with self._lock:
+            if self._backlog is not None:
+                self._backlog.append((path, after))     # the running build may have read the data before the write.
+            if not self.built:
+                return
+            self._remove(path)
+            if after is not None:
+                self._add(path, after)
+
+    def rebuild(self) -> None:
+        """Build the index from scratch with the data stored on firebase."""
+        with self._lock:
+            self._backlog = []
+        try:
+            self.controller.versions.invalidate()
+            seen: dict[str, int] = {subtree: self.controller.versions.foreign(subtree) for subtree in SearchFields}
+            snapshot: dict[str, Any] = {
+                subtree: self.controller.read(subtree)
+                for subtree in SearchFields
+            }
+        except Exception:
+            with self._lock:
+                self._backlog = None
+            raise
+
+        with self._lock:
+            self.postings.clear()
+            self.documents.clear()
+            self.terms.clear()
+            self.syllables.clear()
+            for subtree, node in snapshot.items():
+                for key, data in walkEntries(node, SearchFields[subtree][0]):
+                    if isinstance(data, dict):
+                        self._add(f"{subtree}/{key}", data)
+            for path, after in self._backlog or ():
+                self._remove(path)
+                if after is not None:
+                    self._add(path, after)
+            self._backlog = None
+            self.seen = seen
+            self.built = True
+
+    def start(self) -> Event:
+        """Start building the index in background, unless a build is running. Returns the event set when the build finishes."""
+        with self._buildLock:
+            if self._building is None:
+                self._building = Event()
+                Thread(target=self._rebuildInBackground, args=(self._building,), name="search-rebuild", daemon=True).start()
+            return self._building
+
+    def _rebuildInBackground(self, done: Event) -> None:
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Failed to build the search index.")
+        finally:
+            with self._buildLock:
+                self._building = None
+            done.set()
+
+    def ensureFresh(self) -> None:
+        """
+        Wait for the first build, no longer than the deadline of the request. If other workers wrote to the indexed subtrees since,
+        rebuild it in background while serving the current one. Writes of this worker are applied by `onWrite()`.
+
+        Raises:
+            SearchIndexNotReady: the first build didn't finish in time.
+        """
+        if not self.built:
+            deadline: Deadline | None = currentDeadline.get()
+            self.start().wait(deadline.remaining() if deadline is not None else None)
+            if not self.built:
+                raise SearchIndexNotReady()
+            return
+        if self._building is None and any(self.controller.versions.foreign(subtree) > self.seen.get(subtree, 0) for subtree in SearchFields):
+            self.start()
+
+    def _postingsOf(self, token: str) -> dict[str, float]:
+        """
+        Documents containing the token, with its weighted term frequency. Callers must hold the lock.
+        A one-syllable hangul token, which bigrams never equal, matches every bigram containing the syllable.
+        """
+        if len(token) != 1 or not isHangul(token):
+            return self.postings.get(token, {})
+        docs: dict[str, float] = dict(self.postings.get(token, {}))     # the syllable indexed as a one-syllable word.
+        for bigram in self.syllables.get(token, ()):
+            for path, tf in self.postings[bigram].items():
+                docs[path] = max(docs.get(path, 0.0), tf)
+        return docs
+
+    def search(self, query: str, target: SearchTarget = "all", page: int = 1, size: int = 20) -> dict[str, Any]:
+        """
+        검색어의 모든 토큰을 포함하는 문서를 tf-idf 점수 순으로 반환합니다. 한 음절의 한글 검색어는 그 음절을 포함하는 문서와 일치합니다.
+
+        Args:
+            query (str): 검색어
+            target (SearchTarget, optional): 검색 대상. 기본 값은 모든 대상입니다.
+            page (int, optional): 1부터 시작하는 페이지 번호
+            size (int, optional): 페이지 크기
+
+        Returns:
+            dict[str, Any]: 전체 결과 수와, 해당 페이지의 결과 목록
+        """
+        self.ensureFresh()
+        tokens: set[str] = set(tokenize(query))
+        prefix: str | None = next((f"{subtree}/" for subtree, t in DocumentTypes.items() if t == target), None)
+
+        with self._lock:
+            lists: list[tuple[str, dict[str, float]]] = sorted(
+                ((token, self._postingsOf(token)) for token in tokens),
+                key=lambda item: len(item[1])
+            )
+            if not lists or not lists[0][1]:
+                return {"total": 0, "page": page, "size": size, "results": []}
+
+            candidates: set[str] = set(lists[0][1])
+            for _, docs in lists[1:]:
+                candidates.intersection_update(docs)
+            if prefix is not None:
+                candidates = {path for path in candidates if path.startswith(prefix)}
+
+            total: int = len(self.documents)
+            idf: list[tuple[float, dict[str, float]]] = [(log(1 + total / len(docs)), docs) for _, docs in lists]
+            top: list[tuple[float, str]] = heapq.nlargest(
+                page * size,
+                ((sum(w * docs[path] for w, docs in idf), path) for path in candidates)
+            )
+            results: list[dict[str, Any]] = [
+                {"score": round(score, 4), **self.documents[path]}
+                for score, path in top[(page - 1) * size:]
+            ]
+
+        return {"total": len(candidates), "page": page, "size": size, "results": results}
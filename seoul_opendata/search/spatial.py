@@ -0,0 +1,133 @@
+import heapq
+from array import array
+from math import floor
+from typing import Final, Generic, Iterable, TypeVar
+
+from seoul_opendata.models.article import Article
+from seoul_opendata.seoul_openapi.dataset import Dataset
+from seoul_opendata.utils.geo import KmPerDegreeLatitude, km_per_degree_longitude
+
+T = TypeVar("T")    # Item stored in the index.
+SeoulLatitude: Final[float] = 37.55     # 경도 1도의 거리를 계산할 기준 위도
+
+
+class GridCell:
+    """격자 한 칸에 속한 항목들의 좌표를 열 단위 배열로 저장합니다."""
+    __slots__ = ("latitudes", "longitudes", "items")
+
+    def __init__(self) -> None:
+        self.latitudes: array = array("d")
+        self.longitudes: array = array("d")
+        self.items: list[int] = []
+
+
+class GeoGrid(Generic[T]):
+    """
+    좌표를 가진 항목에 대한 균일 격자 공간 색인입니다.
+    질의 지점 주변의 격자 칸만 방문하고, 칸 안의 거리는 열 단위 좌표 배열로 한 번에 계산합니다.
+    """
+    cellKm: Final[float]
+    items: Final[list[T]]
+
+    def __init__(self, entries: Iterable[tuple[T, float, float]], cellKm: float = 1.0) -> None:
+        """
+        Args:
+            entries (Iterable[tuple[T, float, float]]): 항목과 위도, 경도
+            cellKm (float, optional): 격자 한 칸의 크기(km)
+        """
+        self.cellKm = cellKm
+        self.latStep: float = cellKm / KmPerDegreeLatitude
+        self.lngStep: float = cellKm / km_per_degree_longitude(SeoulLatitude)
+        self.items = []
+        self.cells: dict[tuple[int, int], GridCell] = {}
+
+        for item, lat, lng in entries:
+            cell: GridCell = self.cells.setdefault(self.cellOf(lat, lng), GridCell())
+            cell.latitudes.append(lat)
+            cell.longitudes.append(lng)
+            cell.items.append(len(self.items))
+            self.items.append(item)
+        
+        rows: list[int] = [y for y, _ in self.cells]
+        cols: list[int] = [x for _, x in self.cells]
+        self.bounds: tuple[int, int, int, int] | None = (min(rows), max(rows), min(cols), max(cols)) if self.cells else None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def cellOf(self, lat: float, lng: float) -> tuple[int, int]:
+        return floor(lat / self.latStep), floor(lng / self.lngStep)
+
+    def _distances(self, cell: GridCell, lat: float, lng: float) -> list[float]:
+        kx: float = km_per_degree_longitude(lat)
+        return [
+            (((x - lng) * kx) ** 2 + ((y - lat) * KmPerDegreeLatitude) ** 2) ** 0.5
+            for y, x in zip(cell.latitudes, cell.longitudes)
+        ]
+
+    def _ring(self, center: tuple[int, int], r: int) -> Iterable[GridCell]:
+        """중심 칸으로부터 체비셰프 거리가 r인 칸들을 순회합니다."""
+        cy, cx = center
+        for dy in range(-r, r + 1):
+            for dx in ((-r, r) if abs(dy) != r else range(-r, r + 1)):
+                if (cell := self.cells.get((cy + dy, cx + dx))) is not None:
+                    yield cell
+
+    def within(self, lat: float, lng: float, radiusKm: float) -> list[tuple[float, T]]:
+        """
+        질의 지점으로부터 반경 안에 있는 항목을 가까운 순으로 반환합니다.
+
+        Returns:
+            list[tuple[float, T]]: 거리(km)와 항목
+        """
+        center: tuple[int, int] = self.cellOf(lat, lng)
+        found: list[tuple[float, int]] = []
+        for r in range(int(radiusKm / self.cellKm) + 2):
+            for cell in self._ring(center, r):
+                found.extend((d, i) for d, i in zip(self._distances(cell, lat, lng), cell.items) if d <= radiusKm)
+        found.sort()
+        return [(d, self.items[i]) for d, i in found]
+
+    def nearest(self, lat: float, lng: float, k: int) -> list[tuple[float, T]]:
+        """
+        질의 지점에서 가장 가까운 k개의 항목을 가까운 순으로 반환합니다.
+        링을 넓혀가다가, k번째 거리보다 다음 링까지의 최소 거리가 멀어지면 멈춥니다.
+
+        Returns:
+            list[tuple[float, T]]: 거리(km)와 항목
+        """
+        center: tuple[int, int] = self.cellOf(lat, lng)
+        best: list[tuple[float, int]] = []      # max-heap of (-distance, index)
+        maxRing: int = -1
+        if self.bounds is not None:
+            top, bottom, left, right = self.bounds
+            maxRing = max(abs(top - center[0]), abs(bottom - center[0]), abs(left - center[1]), abs(right - center[1]))
+
+        for r in range(maxRing + 1):
+            if len(best) >= k and -best[0][0] <= (r - 1) * self.cellKm:
+                break       # every item in ring r or farther is at least (r - 1) cells away.
+            for cell in self._ring(center, r):
+                for d, i in zip(self._distances(cell, lat, lng), cell.items):
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+        return [(-nd, self.items[i]) for nd, i in sorted(best, reverse=True)]
+
+
+def schoolGrid(dataset: Dataset) -> GeoGrid[int]:
+    """공공데이터 유치원의 행 번호에 대한 공간 색인을 만듭니다. `SeoulOpenData.derive`에 사용합니다."""
+    return GeoGrid(
+        (i, lat, lng)
+        for i, (lat, lng) in enumerate(zip(dataset.latitudes, dataset.longitudes))
+        if lat is not None and lng is not None
+    )
+
+
+def eventGrid(dataset: Dataset) -> GeoGrid[Article]:
+    """행사 게시글에 대한 공간 색인을 만듭니다. `SeoulOpenData.derive`에 사용합니다."""
+    return GeoGrid(
+        (event, event.latitude, event.longitude)
+        for event in dataset.events
+        if event.latitude is not None and event.longitude is not None
+    )
@@ -0,0 +1,35 @@
+import re
+import unicodedata
+from typing import Final
+
+TokenRegex: Final[re.Pattern] = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+
+
+def isHangul(word: str) -> bool:
+    """한글 음절로 이루어진 토큰인지 여부. 토큰은 한글과 그 외의 문자를 섞지 않으므로, 첫 글자만 확인합니다."""
+    return bool(word) and "가" <= word[0] <= "힣"
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    한글 음절은 bigram으로, 그 외의 단어는 통째로 토큰화합니다.
+    한글은 띄어쓰기와 조사가 불규칙하므로, 음절 bigram을 사용하면 부분 문자열로도 검색할 수 있습니다.
+
+    Example:
+        >>> tokenize("서울특별시 용산구 회나무로13가길")
+        ['서울', '울특', '특별', '별시', '용산', '산구', '회나', '나무', '무로', '13', '가길']
+
+    Args:
+        text (str): 토큰화할 문자열
+
+    Returns:
+        list[str]: 토큰 목록. 중복된 토큰이 포함될 수 있습니다.
+    """
+    tokens: list[str] = []
+    for match in TokenRegex.finditer(unicodedata.normalize("NFC", text).lower()):
+        word: str = match.group()
+        if len(word) > 1 and isHangul(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
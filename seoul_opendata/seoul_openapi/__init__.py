@@ -1 +1,12 @@
-from .client import SeoulOpenData
+from .client import SeoulOpenData, OpenData
+from .dataset import Dataset
+from .scheduler import RefreshScheduler, Scheduler
+
+__all__ = (
+    "SeoulOpenData",
+    "OpenData",
+    "Dataset",
+    "RefreshScheduler",
+    "Scheduler"
+)
+
@@ -1,23 +1,87 @@
 from contextlib import suppress
-from functools import wraps
+from functools import cached_property, wraps
 import json
 import os
 import re
-from typing import Any, Callable, ClassVar, Final, Optional, TypedDict
+from datetime import date
+from random import Random
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Any, Callable, ClassVar, Final, Mapping, Optional, TypedDict, TypeVar, cast
 
 import requests
 
-from seoul_opendata.firebase.controller import DB, EntryAlreadyExist
+from seoul_opendata.firebase.controller import DB, ArticleRepository, EntryAlreadyExist
 from seoul_opendata.models.article import Article
 from seoul_opendata.models.child_school import EstablishType
 from seoul_opendata.models.location import Location
 from seoul_opendata.models.payloads import ArticleCreate, ChildSchoolCreate
+from seoul_opendata.seoul_openapi.dataset import Dataset
+from seoul_opendata.seoul_openapi.pipeline import Emit, Pipeline, Stage
+from seoul_opendata.seoul_openapi.snapshot import Snapshot
+from seoul_opendata.utils.dateutils import yyyy_mm_dd2date
+from seoul_opendata.utils.geo import parse_coordinate
 from seoul_opendata.utils.location_utils import parse_location
-from setup import set_keys
+from seoul_opendata.utils.metrics import CacheLookups, Counter, Gauge, Histogram
+from seoul_opendata.utils.ratelimit import TokenBucket
 
 ChildSchoolUniqueKey: Final[str] = "KINDERCODE"
 OpenDataAPICallers: Final[list[str]] = []
-set_keys()
+OpenDataAPIRanges: Final[dict[str, tuple[int, int]]] = {}      # 서비스 명칭과, 가져올 데이터의 시작/끝 인덱스
+D = TypeVar("D")    # Data derived from Dataset.
+IngestWorkers: Final[dict[str, int]] = {"fetch": 4, "decode": 2, "merge": 1, "validate": 2, "write": 8}   # 단계별 스레드 수
+IngestQueueCapacity: Final[int] = 256       # 단계 사이 큐의 최대 크기
+
+# 공공데이터 api 호출 설정. 속도 제한은 한 워커의 모든 호출(동시에 실행되는 수집 단계 포함)이 함께 따릅니다.
+RequestRate: Final[float] = float(os.environ.get("SEOUL_OPENDATA_RATE", 5))                    # 초당 호출 수. 0이면 제한하지 않습니다.
+RequestBurst: Final[float] = float(os.environ.get("SEOUL_OPENDATA_BURST", IngestWorkers["fetch"]))  # 한 번에 몰아 보낼 수 있는 호출 수
+RequestTimeout: Final[tuple[float, float]] = (5.0, float(os.environ.get("SEOUL_OPENDATA_TIMEOUT", 30)))   # (연결, 응답) 제한 시간(초)
+RetryAttempts: Final[int] = int(os.environ.get("SEOUL_OPENDATA_RETRIES", 4))                   # 처음 호출을 포함한 최대 시도 횟수
+RetryBaseDelay: Final[float] = 0.5      # 두 번째 시도 전 최대 대기 시간(초). 시도마다 두 배로 늘어납니다.
+RetryMaxDelay: Final[float] = 30.0
+RetryableStatus: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+# api가 RESULT.CODE로 알리는 결과. 서버 오류와 데이터베이스 연결 오류만 다시 시도합니다.
+ResultOk: Final[str] = "INFO-000"
+ResultNoData: Final[str] = "INFO-200"
+RetryableResults: Final[frozenset[str]] = frozenset({"ERROR-500", "ERROR-600", "ERROR-601"})
+InvalidResponse: Final[str] = "INVALID_RESPONSE"
+
+# 공공데이터 수집 지표
+FetchDuration: Final[Histogram] = Histogram(
+    "opendata_fetch_duration_seconds", "Latency of open data api calls by service.", ("service",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+FetchedPages: Final[Counter] = Counter("opendata_pages_fetched_total", "Open data api pages fetched by service.", ("service",))
+FetchedBytes: Final[Counter] = Counter("opendata_bytes_fetched_total", "Bytes of open data api responses by service.", ("service",))
+FetchedRows: Final[Counter] = Counter("opendata_rows_fetched_total", "Rows of open data api responses by service.", ("service",))
+FetchErrors: Final[Counter] = Counter("opendata_fetch_errors_total", "Failed open data api calls by service.", ("service",))
+FetchRetries: Final[Counter] = Counter("opendata_fetch_retries_total", "Retried open data api calls by service.", ("service",))
+RateLimitWait: Final[Counter] = Counter("opendata_rate_limit_wait_seconds_total", "Time open data api calls waited for the rate limiter.")
+
+class OpenApiError(Exception):
+    """공공데이터 api가 응답 본문의 RESULT.CODE로 알린 오류입니다."""
+    service: Final[str]
+    code: Final[str]
+    message: Final[str]
+    
+    def __init__(self, service: str, code: str, message: str) -> None:
+        super().__init__(f"{service}: {code} {message}")
+        self.service = service
+        self.code = code
+        self.message = message
+    
+    @property
+    def retryable(self) -> bool:
+        """다시 시도하면 성공할 수 있는 오류인지 여부. 인증키, 요청 형식, 호출 한도 오류는 다시 시도하지 않습니다."""
+        return self.code in RetryableResults or self.code == InvalidResponse
+
+
+def retryAfter(resp: requests.Response) -> float | None:
+    """Retry-After 헤더의 대기 시간(초). 헤더가 없거나 초 단위 숫자가 아니면 None을 반환합니다."""
+    with suppress(KeyError, ValueError):
+        return max(0.0, float(resp.headers["Retry-After"]))
+    return None
+
 
 class OpenApiOptionExtras(TypedDict):
     startIndex: int
@@ -69,10 +133,45 @@ def build_event(event_resp: dict[str, Any]) -> ArticleCreate:
         attachments=[],
         location=location,
         childSchoolId=None,
-        uploadAt=event_resp["REGIST_DT"]
+        uploadAt=event_resp["REGIST_DT"],
+        latitude=parse_coordinate(event_resp.get("Y_CRDNT_VALUE")),
+        longitude=parse_coordinate(event_resp.get("X_CRDNT_VALUE")),
+        eventStart=event_resp["EVENT_PD_BGNDE"] or None,
+        eventEnd=event_resp["EVENT_PD_ENDDE"] or None
     )
         
 
+def build_child_school(data: dict[str, Any]) -> ChildSchoolCreate | None:
+    """
+    병합된 공공데이터 행으로부터 ChildSchoolCreate 객체를 생성합니다.
+    
+    Args:
+        data (dict[str, Any]): KINDERCODE로 병합된 유치원 정보
+    
+    Returns:
+        ChildSchoolCreate | None: 서울시 주소가 아니라면 None을 반환합니다. 필수 필드가 없으면 예외가 발생합니다.
+    """
+    addr: str = data["ADDR"]
+    location: Location | None = parse_location(addr)
+    if location is None:
+        return None
+    
+    return ChildSchoolCreate(
+        code=data["KINDERCODE"],
+        name=data["KINDERNAME"],
+        representerName=data["RPPNNAME"],
+        location=location,
+        address=addr,
+        establishType=EstablishType(data["ESTABLISH"][:2]),
+        establishAt=data["EDATE"],
+        openingTime=data["OPERTIME"],
+        tel=data["TELNO"],
+        children=[],
+        latitude=parse_coordinate(data.get("LTTDCDNT")),
+        longitude=parse_coordinate(data.get("LNGTDCDNT"))
+    )
+
+
 def opendata(collect: bool = True, startIndex: int = 1, endIndex: int = 1000):
     """공공데이터 api를 호출하는 메소드를 자동 구현하는 데코레이터입니다.
     API의 서비스 명칭이 모두 childSchool~로 시작한다는 점에서 착안했습니다.
@@ -97,20 +196,16 @@ def opendata(collect: bool = True, startIndex: int = 1, endIndex: int = 1000):
 
             Returns:
                 dict[str, Any]: api의 응답 데이터.
-            """
-            url=f"{self.base}/json/{meth.__name__}/{startIndex}/{endIndex}"
-                
-            resp: requests.Response = self.session.get(url)
-            # print(resp.content)
-            
-            if (resp.status_code != 200):
-                # handle exceptions
-                return {}
             
-            data: dict[str, Any] = resp.json()
+            Raises:
+                OpenApiError | requests.RequestException: 다시 시도해도 실패한 경우
+            """
+            data: dict[str, Any] = self.fetch(meth.__name__)
+            FetchedRows.inc(len(data[meth.__name__]["row"]), service=meth.__name__)
             self.saveData(data, meth.__name__)
             return data
         
+        OpenDataAPIRanges[wrapper.__name__] = (startIndex, endIndex)
         if collect:
             OpenDataAPICallers.append(wrapper.__name__)
         return wrapper
@@ -122,11 +217,122 @@ class SeoulOpenAPI:
     base: Final[str]
     __api_calls__: ClassVar[list[str]] = []
     
-    def __init__(self):
+    def __init__(
+        self,
+        rate: float = RequestRate,
+        burst: float = RequestBurst,
+        attempts: int = RetryAttempts,
+        timeout: tuple[float, float] = RequestTimeout
+    ):
+        """
+        Args:
+            rate (float, optional): 초당 호출 수. 0이면 제한하지 않습니다.
+            burst (float, optional): 한 번에 몰아 보낼 수 있는 호출 수
+            attempts (int, optional): 처음 호출을 포함한 최대 시도 횟수
+            timeout (tuple[float, float], optional): 연결과 응답의 제한 시간(초)
+        """
         self.base = f"http://openapi.seoul.go.kr:8088/{os.environ['SEOUL_OPENDATA_KEY']}"
         self.session = requests.Session()
+        self.limiter = TokenBucket(rate, burst)
+        self.attempts = attempts
+        self.timeout = timeout
+        self._random = Random()
+    
+    def request(self, service: str) -> requests.Response:
+        """
+        공공데이터 api를 한 번 호출합니다. 속도 제한을 따르지만 다시 시도하거나 응답을 해석하지는 않습니다.
+
+        Args:
+            service (str): @opendata로 등록된 서비스 명칭
+
+        Returns:
+            requests.Response: api의 응답
+        """
+        startIndex, endIndex = OpenDataAPIRanges[service]
+        RateLimitWait.inc(self.limiter.acquire())
+        startedAt: float = perf_counter()
+        try:
+            resp: requests.Response = self.session.get(f"{self.base}/json/{service}/{startIndex}/{endIndex}", timeout=self.timeout)
+        except requests.RequestException:
+            FetchErrors.inc(service=service)
+            raise
+        finally:
+            FetchDuration.observe(perf_counter() - startedAt, service=service)
+        FetchedPages.inc(service=service)
+        FetchedBytes.inc(len(resp.content), service=service)
+        if resp.status_code != 200:
+            FetchErrors.inc(service=service)
+        return resp
+    
+    def fetch(self, service: str) -> dict[str, Any]:
+        """
+        공공데이터 api를 호출하고, 응답 본문을 검증해 반환합니다.
+        연결 오류, 시간 초과, 429/5xx 응답과 api의 서버 오류는 지터를 준 지수 백오프로 다시 시도합니다.
+        429 응답을 받으면 같은 속도 제한기를 쓰는 모든 호출을 Retry-After만큼 멈춥니다.
+        해당하는 데이터가 없다는 결과(INFO-200)는 행이 없는 응답으로 바꿉니다.
+
+        Args:
+            service (str): @opendata로 등록된 서비스 명칭
+
+        Returns:
+            dict[str, Any]: `{service: {"list_total_count": ..., "RESULT": ..., "row": [...]}}` 형식의 응답 본문
+        
+        Raises:
+            OpenApiError: 다시 시도할 수 없거나, 모든 시도가 실패한 api 오류
+            requests.RequestException: 다시 시도할 수 없거나, 모든 시도가 실패한 네트워크/HTTP 오류
+        """
+        error: Exception | None = None
+        for attempt in range(max(1, self.attempts)):
+            if attempt > 0:
+                FetchRetries.inc(service=service)
+                sleep(self.backoff(attempt))
+            try:
+                resp: requests.Response = self.request(service)
+                if resp.status_code == 429:
+                    self.limiter.pause(retryAfter(resp) or self.backoff(attempt + 1))
+                resp.raise_for_status()
+                return self.parse(service, resp)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in RetryableStatus:
+                    raise
+                error = e
+            except OpenApiError as e:
+                FetchErrors.inc(service=service)
+                if not e.retryable:
+                    raise
+                error = e
+        assert error is not None
+        raise error
+    
+    def backoff(self, attempt: int) -> float:
+        """`attempt`번째 다시 시도 전에 기다릴 시간(초). 0부터 지수적으로 늘어나는 상한 사이에서 무작위로 고릅니다(full jitter)."""
+        return self._random.uniform(0, min(RetryMaxDelay, RetryBaseDelay * 2 ** (attempt - 1)))
+    
+    @staticmethod
+    def parse(service: str, resp: requests.Response) -> dict[str, Any]:
+        """
+        응답 본문을 해석하고 RESULT.CODE를 확인합니다.
+        api 오류는 `{"RESULT": {...}}`처럼 서비스 명칭 없이 오기도 하므로, 두 위치를 모두 확인합니다.
+        """
+        try:
+            body: dict[str, Any] = resp.json()
+        except ValueError as e:
+            raise OpenApiError(service, InvalidResponse, f"Response is not JSON: {e}") from e
+        content: dict[str, Any] = body.get(service) or body
+        result: dict[str, Any] = content.get("RESULT") or {}
+        code: str = result.get("CODE", ResultOk)
+        if code == ResultNoData:
+            return {service: {"list_total_count": 0, "RESULT": result, "row": []}}
+        if code != ResultOk:
+            raise OpenApiError(service, code, result.get("MESSAGE", ""))
+        if not isinstance(body.get(service), dict) or "row" not in body[service]:
+            raise OpenApiError(service, InvalidResponse, "Response has no rows.")
+        return body
     
     def saveData(self, data: dict[str, Any], filename: str):
+        os.makedirs("./seoul_opendata/seoul_openapi/data", exist_ok=True)
         with open(f"./seoul_opendata/seoul_openapi/data/{filename}.json", mode="wt", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
     
@@ -286,22 +492,176 @@ class SeoulOpenAPI:
 class SeoulOpenData:
     """서울 공공데이터 이용 클라이언트."""
     def __init__(self):
-        self.api: SeoulOpenAPI = SeoulOpenAPI()
-        self.data: dict[str, dict[str, Any]] = {}
+        self.data: Mapping[str, dict[str, Any]] = {}                  # 수집한 워커는 dict를, 나머지 워커는 Snapshot을 가집니다.
         self.events: list[Article] = []
+        self.version: int = 0                                           # 병합된 데이터가 바뀔 때마다 증가합니다.
+        self._derived: dict[Callable[[Dataset], Any], Any] = {}         # 현재 버전의 데이터로부터 만든 파생 데이터
+        self._derivedLock = Lock()
+        self.pipeline: Pipeline | None = None                           # 마지막으로 실행한 수집 파이프라인
+    
+    @cached_property
+    def api(self) -> SeoulOpenAPI:
+        """공공데이터 API 클라이언트. 처음 공공데이터를 가져올 때 만들어집니다."""
+        return SeoulOpenAPI()
     
     def prefetch(self):
-        data: dict[str, list[dict[str, Any]]] = self.api.fetchall()
-        for childSchoolData in data.values():
-            for e in childSchoolData:
-                uniqueKey: str = e[ChildSchoolUniqueKey]
-                if uniqueKey not in self.data:
-                    self.data[uniqueKey] = e
-                self.data[uniqueKey].update(e)
+        """공공데이터를 새로 가져와 병합하고, 기존 데이터와 교체합니다. 데이터베이스에는 아무것도 쓰지 않습니다."""
+        self.ingest(write=False)
+    
+    def ingest(self, write: bool = True, workers: dict[str, int] | None = None) -> None:
+        """
+        공공데이터를 호출 → 해석 → 병합 → 검증 → 저장 단계의 파이프라인으로 가져와, 기존 데이터와 교체합니다.
+        단계들은 크기가 제한된 큐로 연결되어 동시에 실행됩니다. 모든 api의 행이 모인 유치원은 나머지 api 응답을 기다리지 않고 저장됩니다.
+        호출, 해석, 병합 중 하나라도 실패하면 일부만 모인 데이터로 교체하지 않고, 기존 데이터를 그대로 둡니다.
+        
+        Args:
+            write (bool, optional): 유치원 정보와 행사 게시글을 firebase에 저장할 지 여부.
+                False이면 검증과 저장 단계를 생략하고, 행사 게시글도 메모리에서만 만듭니다.
+            workers (dict[str, int] | None, optional): 단계 이름과 스레드 수. 주어지지 않은 단계는 IngestWorkers를 따릅니다.
+        
+        Raises:
+            StageFailed: 호출, 해석, 병합 단계가 일부 항목을 처리하지 못한 경우
+        """
+        workers = IngestWorkers | (workers or {})
+        data: dict[str, dict[str, Any]] = {}
+        sources: dict[str, int] = {}        # 유치원마다 병합된 api 응답의 수
+        expected: int = len(OpenDataAPICallers)
+        
+        def fetch(service: str, emit: Emit) -> None:
+            # 다시 시도와 속도 제한은 api 클라이언트가 처리하며, 모든 fetch 스레드가 같은 속도 제한기를 씁니다.
+            emit((service, self.api.fetch(service)))
+        
+        def decode(item: tuple[str, dict[str, Any]], emit: Emit) -> None:
+            service, body = item
+            self.api.saveData(body, service)
+            FetchedRows.inc(len(body[service]["row"]), service=service)
+            for row in body[service]["row"]:
+                emit(row)
+        
+        def merge(row: dict[str, Any], emit: Emit) -> None:
+            key: str = row[ChildSchoolUniqueKey]
+            data.setdefault(key, {}).update(row)
+            sources[key] = sources.get(key, 0) + 1
+            if sources[key] == expected:
+                emit(dict(data[key]))
+        
+        def flushMerge(emit: Emit) -> None:
+            # 일부 api에만 있는 유치원은, 모든 응답을 병합한 뒤에 내보냅니다.
+            for key, count in sources.items():
+                if count < expected:
+                    emit(dict(data[key]))
+        
+        def validate(row: dict[str, Any], emit: Emit) -> None:
+            if (payload := build_child_school(row)) is not None:
+                emit(payload)
+        
+        def store(payload: ChildSchoolCreate, emit: Emit) -> None:
+            with suppress(EntryAlreadyExist):
+                DB.childSchool.create(payload)
+        
+        stages: list[Stage] = [
+            Stage("fetch", fetch, workers["fetch"], IngestQueueCapacity),
+            Stage("decode", decode, workers["decode"], IngestQueueCapacity),
+            Stage("merge", merge, 1, IngestQueueCapacity, flush=flushMerge),    # 병합 상태를 가지므로 한 스레드로 처리합니다.
+        ]
+        if write:
+            stages += [
+                Stage("validate", validate, workers["validate"], IngestQueueCapacity),
+                Stage("write", store, workers["write"], IngestQueueCapacity)
+            ]
+        self.pipeline = Pipeline(stages)
+        self.pipeline.run(OpenDataAPICallers)
+        self.pipeline.check("fetch", "decode", "merge")
         
         eventData: dict[str, Any] = self.api.TnFcltySttusInfo2001()
-        for event in eventData["TnFcltySttusInfo2001"]["row"]:
-            self.events.append(DB.article.create(build_event(event)))
+        events: list[Article] = self.ingestEvents(eventData["TnFcltySttusInfo2001"]["row"], write)
+        if write:
+            DB.flush()      # 쓰기 지연 모드라면, 수집한 데이터가 모두 데이터베이스에 반영될 때까지 기다립니다.
+        self.load(data, events)
+    
+    def ingestMetrics(self) -> dict[str, Any]:
+        """마지막으로 실행한(또는 실행 중인) 수집 파이프라인의 단계별 처리량과 큐 깊이 지표입니다."""
+        if self.pipeline is None:
+            return {"running": False, "elapsed": 0.0, "stages": {}}
+        return self.pipeline.metrics()
+    
+    def ingestEvents(self, rows: list[dict[str, Any]], write: bool = True) -> list[Article]:
+        """
+        행사 정보를 게시글로 작성합니다. 이미 작성된 행사(같은 제목과 등록일)는 다시 작성하지 않습니다.
+
+        Args:
+            rows (list[dict[str, Any]]): 행사 정보 api 응답의 행 목록
+            write (bool, optional): 게시글을 firebase에 작성할 지 여부. False이면 데이터베이스를 읽거나 쓰지 않고, 게시글을 메모리에서만 만듭니다.
+
+        Returns:
+            list[Article]: 행사 정보에 해당하는 게시글 목록
+        """
+        if not write:
+            return [ArticleRepository.build(build_event(event), None) for event in rows]
+        existing: dict[tuple[str, date], Article] = {
+            (article.title, article.uploadAt): article for article in DB.article.readAllEventArticles().values()
+        }
+        events: list[Article] = []
+        for event in rows:
+            payload: ArticleCreate = build_event(event)
+            article: Article | None = existing.get((payload.title, yyyy_mm_dd2date(cast(str, payload.uploadAt))))
+            events.append(article if article is not None else DB.article.create(payload))
+        return events
+    
+    def load(self, data: Mapping[str, dict[str, Any]], events: list[Article], version: int | None = None) -> None:
+        """
+        병합된 데이터를 교체하고, 이전 버전의 파생 데이터를 버립니다. 파생 데이터는 다음 접근 시 다시 만들어집니다.
+
+        Args:
+            data (Mapping[str, dict[str, Any]]): 유치원 코드와 병합된 행
+            events (list[Article]): 행사 게시글 목록
+            version (int | None, optional): 데이터 버전. 주어지지 않으면 현재 버전에서 1 증가합니다.
+        """
+        with self._derivedLock:
+            self.data, self.events = data, events
+            self.version = version if version is not None else self.version + 1
+            self._derived = {}
+    
+    def publish(self, path: str) -> None:
+        """
+        병합된 데이터를 메모리 매핑용 스냅샷 파일로 저장하고, 이 워커도 그 스냅샷을 사용합니다.
+        다른 워커는 공공데이터 api를 호출하는 대신 attach()로 이 파일을 매핑합니다.
+        """
+        with self._derivedLock:
+            data, events, version = self.data, self.events, self.version
+        Snapshot.write(path, version, data, [event.dict() for event in events])
+        self.attach(path)
+    
+    def attach(self, path: str) -> None:
+        """publish()로 저장한 스냅샷 파일을 매핑해, 스냅샷의 데이터와 버전으로 교체합니다."""
+        snapshot = Snapshot(path)
+        self.load(snapshot, [Article(**event) for event in snapshot.events], snapshot.version)
+    
+    @property
+    def dataset(self) -> Dataset:
+        """현재 버전의 병합된 데이터를 행 번호로 고정한 스냅샷입니다."""
+        return self.derive(Dataset)
+    
+    def derive(self, builder: Callable[[Dataset], D]) -> D:
+        """
+        병합된 데이터로부터 파생 데이터(패싯, 통계 등)를 만들고, 데이터가 바뀔 때까지 캐싱합니다.
+
+        Args:
+            builder (Callable[[Dataset], D]): 파생 데이터를 만드는 함수. 함수 객체가 캐시 키로 사용됩니다.
+
+        Returns:
+            D: 현재 버전의 데이터로 만든 파생 데이터
+        """
+        with self._derivedLock:
+            # Dataset 자신도 파생 데이터로 캐싱되며, 버전이 바뀌면 모든 파생 데이터를 버립니다.
+            if self._derived.get(Dataset) is None or self._derived[Dataset].version != self.version:
+                self._derived = {Dataset: Dataset(self.data, self.events, self.version)}
+            if builder not in self._derived:
+                CacheLookups.inc(cache="opendata_derived", result="miss")
+                self._derived[builder] = builder(self._derived[Dataset])
+            else:
+                CacheLookups.inc(cache="opendata_derived", result="hit")
+            return self._derived[builder]
     
     def create(self):
         """Create ChildSchool entries on firebase."""
@@ -309,24 +669,11 @@ class SeoulOpenData:
         
         for data in self.data.values():
             # print(f"SeoulOpenData.create() : code = {data['KINDERCODE']}")
-            addr: str = data["ADDR"]
-            
-            location: Location | None = parse_location(addr)
-            if location is None:
+            payload: ChildSchoolCreate | None = build_child_school(data)
+            if payload is None:
                 continue
             with suppress(EntryAlreadyExist):
-                DB.childSchool.create(ChildSchoolCreate(
-                    code=data["KINDERCODE"],
-                    name=data["KINDERNAME"],
-                    representerName=data["RPPNNAME"],
-                    location=location,
-                    address=addr,
-                    establishType=EstablishType(data["ESTABLISH"][:2]),
-                    establishAt=data["EDATE"],
-                    openingTime=data["OPERTIME"],
-                    tel=data["TELNO"],
-                    children=[]
-                ))
+                DB.childSchool.create(payload)
         print("Done!")
         
     def test(self):
@@ -334,8 +681,29 @@ class SeoulOpenData:
         self.api.childSchoolClassArea()
         
 
+OpenData: Final[SeoulOpenData] = SeoulOpenData()
+
+
+def ingestStageItems() -> dict[tuple[str, ...], float]:
+    """마지막 수집 파이프라인의 단계별 처리 결과 수입니다."""
+    stages: dict[str, dict[str, Any]] = OpenData.ingestMetrics()["stages"]
+    return {
+        (name, result): stage[result]
+        for name, stage in stages.items()
+        for result in ("processed", "failed")
+    }
+
+
+DataVersion: Final[Gauge] = Gauge("opendata_version", "Version of the merged open data served by this worker.", collect=lambda: {(): OpenData.version})
+DataSchools: Final[Gauge] = Gauge("opendata_schools", "Child schools in the merged open data.", collect=lambda: {(): len(OpenData.data)})
+IngestStageItems: Final[Gauge] = Gauge(
+    "opendata_ingest_stage_items", "Items handled by stages of the last ingest run.", ("stage", "result"), collect=ingestStageItems
+)
+
+
 if __name__ == "__main__":
     os.environ["SEOUL_OPENDATA_KEY"] = "6c514452756c61703839496c494c72"
     client = SeoulOpenData()
     client.prefetch()
     client.api.saveData(client.data, "formatted")
+
@@ -0,0 +1,106 @@
+from typing import Any, Callable, Final, Mapping, Sequence
+
+from seoul_opendata.models.article import Article
+from seoul_opendata.models.establish_type import EstablishType
+from seoul_opendata.models.location import Location
+from seoul_opendata.seoul_openapi.snapshot import Snapshot
+from seoul_opendata.utils.geo import parse_coordinate
+from seoul_opendata.utils.location_utils import parse_location
+
+FlagValues: Final[dict[str, bool]] = {"Y": True, "N": False, "예": True, "아니오": False}
+
+
+def number(row: dict[str, Any], *fields: str) -> float | None:
+    """
+    공공데이터 행의 숫자 필드 값을 읽습니다. 여러 필드가 주어지면 그 합을 반환합니다.
+
+    Args:
+        row (dict[str, Any]): 병합된 공공데이터 행
+        fields (str): 읽을 필드 이름들
+
+    Returns:
+        float | None: 필드 값의 합. 읽을 수 있는 필드가 하나도 없으면 None을 반환합니다.
+    """
+    total: float | None = None
+    for field in fields:
+        try:
+            value = float(row[field])
+        except (KeyError, TypeError, ValueError):
+            continue
+        total = value if total is None else total + value
+    return total
+
+
+def flag(row: dict[str, Any], field: str) -> bool | None:
+    """공공데이터 행의 Y/N 필드 값을 읽습니다. 값이 없거나 알 수 없는 값이면 None을 반환합니다."""
+    return FlagValues.get(str(row.get(field, "")).strip())
+
+
+def establishType(row: dict[str, Any]) -> EstablishType | None:
+    """`공립(병설)`, `사립(사인)` 형태의 설립유형 값을 EstablishType으로 변환합니다."""
+    try:
+        return EstablishType(str(row.get("ESTABLISH", ""))[:2])
+    except ValueError:
+        return None
+
+
+class Dataset:
+    """
+    병합된 공공데이터를 행 번호로 접근할 수 있도록 고정한 스냅샷입니다.
+    패싯, 통계, 점수 계산 등 파생 데이터는 모두 같은 행 번호를 사용합니다.
+    """
+    version: Final[int]
+    codes: Final[list[str]]
+    rows: Final[Sequence[dict[str, Any]]]
+    locations: Final[list[Location | None]]
+    establishTypes: Final[list[EstablishType | None]]
+    latitudes: Final[list[float | None]]
+    longitudes: Final[list[float | None]]
+    events: Final[list[Article]]
+
+    def __init__(self, data: Mapping[str, dict[str, Any]], events: list[Article], version: int) -> None:
+        self.version = version
+        self.codes = list(data.keys())
+        # 스냅샷의 행은 복사하지 않고, 매핑된 파일에서 필요할 때 해석합니다.
+        self.rows = data.rows if isinstance(data, Snapshot) else [data[code] for code in self.codes]
+        self.locations, self.establishTypes, self.latitudes, self.longitudes = self.columns([
+            lambda row: parse_location(str(row.get("ADDR", ""))),
+            establishType,
+            lambda row: parse_coordinate(row.get("LTTDCDNT")),
+            lambda row: parse_coordinate(row.get("LNGTDCDNT"))
+        ])
+        self.events = list(events)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def columns(self, extractors: Sequence[Callable[[dict[str, Any]], Any]]) -> list[list[Any]]:
+        """
+        행들을 한 번만 순회하며 여러 열을 추출합니다.
+        스냅샷의 행은 접근할 때마다 해석되므로, 열마다 모든 행을 다시 순회하지 않도록 합니다.
+
+        Args:
+            extractors (Sequence[Callable[[dict[str, Any]], Any]]): 행에서 열 값을 읽는 함수들
+
+        Returns:
+            list[list[Any]]: 함수마다 행 순서대로 추출한 값 목록
+        """
+        columns: list[list[Any]] = [[] for _ in extractors]
+        for row in self.rows:
+            for values, extract in zip(columns, extractors):
+                values.append(extract(row))
+        return columns
+
+    def summary(self, i: int) -> dict[str, Any]:
+        """검색 결과 등에 사용할, i번째 행의 요약 정보입니다."""
+        row: dict[str, Any] = self.rows[i]
+        return {
+            "code": self.codes[i],
+            "name": row.get("KINDERNAME"),
+            "address": row.get("ADDR"),
+            "location": self.locations[i],
+            "establishType": self.establishTypes[i],
+            "tel": row.get("TELNO"),
+            "latitude": self.latitudes[i],
+            "longitude": self.longitudes[i]
+        }
@@ -0,0 +1,177 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Final, Iterable, Iterator, Literal, NamedTuple
+
+from seoul_opendata.seoul_openapi.dataset import Dataset, flag, number
+
+FacetKind = Literal["category", "flag", "range"]
+TeacherFields: Final[tuple[str, ...]] = (
+    "DRCNT", "ADCNT", "HDST_THCNT", "ASPS_THCNT", "GNRL_THCNT", "SPCN_THCNT", "NTCNT", "NTRT_THCNT", "SHCNT_THCNT"
+)
+ChildrenFields: Final[tuple[str, ...]] = ("PPCNT3", "PPCNT4", "PPCNT5", "MIXPPCNT", "SHPPCNT")
+
+
+def passed(row: dict[str, Any], field: str) -> bool | None:
+    """`적합`/`부적합` 형태의 점검 결과 필드 값을 읽습니다."""
+    result: str = str(row.get(field) or "")
+    if "부적합" in result:
+        return False
+    return True if "적합" in result else None
+
+
+class Facet(NamedTuple):
+    """필터링과 집계가 가능한 공공데이터 속성입니다."""
+    name: str
+    kind: FacetKind
+    extract: Callable[[Dataset, int], Any]
+    description: str
+
+
+Facets: Final[tuple[Facet, ...]] = (
+    Facet("location", "category", lambda ds, i: ds.locations[i], "지역구"),
+    Facet("establishType", "category", lambda ds, i: ds.establishTypes[i], "설립유형"),
+    Facet("establish", "category", lambda ds, i: ds.rows[i].get("ESTABLISH"), "세부 설립유형"),
+    Facet("mealType", "category", lambda ds, i: ds.rows[i].get("MLSR_OPRN_WAY_TP_CD"), "급식 운영 방식"),
+    Facet("bus", "flag", lambda ds, i: flag(ds.rows[i], "VHCL_OPRN_YN"), "통학차량 운영 여부"),
+    Facet("nutritionTeacher", "flag", lambda ds, i: flag(ds.rows[i], "NTRT_TCHR_AGMT_YN"), "영양교사 배치 여부"),
+    Facet("massMeal", "flag", lambda ds, i: flag(ds.rows[i], "MAS_MSPL_DCLR_YN"), "집단급식소 신고 여부"),
+    Facet("cctv", "flag", lambda ds, i: flag(ds.rows[i], "CCTV_IST_YN"), "CCTV 설치 여부"),
+    Facet("fireDrill", "flag", lambda ds, i: flag(ds.rows[i], "FIRE_AVD_YN"), "소방대피훈련 실시 여부"),
+    Facet("gasCheck", "flag", lambda ds, i: flag(ds.rows[i], "GAS_CK_YN"), "가스점검 실시 여부"),
+    Facet("electricCheck", "flag", lambda ds, i: flag(ds.rows[i], "ELECT_CK_YN"), "전기설비점검 실시 여부"),
+    Facet("playgroundCheck", "flag", lambda ds, i: flag(ds.rows[i], "PLYFC_CK_YN"), "놀이시설 안전검사 여부"),
+    Facet("airQuality", "flag", lambda ds, i: passed(ds.rows[i], "ARQL_CHK_RSLT_TP_CD"), "실내공기질 점검 적합 여부"),
+    Facet("disinfection", "flag", lambda ds, i: passed(ds.rows[i], "FXTM_DSNF_CHK_RSLT_TP_CD"), "정기소독 적합 여부"),
+    Facet("classrooms", "range", lambda ds, i: number(ds.rows[i], "CRCNT"), "교실 수"),
+    Facet("classArea", "range", lambda ds, i: number(ds.rows[i], "CLSRAREA"), "교실 면적(㎡)"),
+    Facet("teachers", "range", lambda ds, i: number(ds.rows[i], *TeacherFields), "교직원 수"),
+    Facet("buses", "range", lambda ds, i: number(ds.rows[i], "OPRA_VHCNT"), "운행 차량 수"),
+    Facet("children", "range", lambda ds, i: number(ds.rows[i], *ChildrenFields), "원아 수"),
+)
+FacetsByName: Final[dict[str, Facet]] = {facet.name: facet for facet in Facets}
+
+
+def toBitmap(indices: Iterable[int], size: int) -> int:
+    """행 번호 목록을 정수 비트맵으로 변환합니다."""
+    bits = bytearray((size + 7) // 8)
+    for i in indices:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iterBits(bitmap: int) -> Iterator[int]:
+    """비트맵에 포함된 행 번호를 오름차순으로 순회합니다."""
+    while bitmap:
+        low: int = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+def valueKey(value: Any) -> str:
+    """패싯 값을 질의 문자열과 비교할 수 있는 키로 변환합니다."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class FacetIndex:
+    """
+    병합된 공공데이터에 대한 패싯 필터 엔진입니다.
+    범주형/여부 속성은 값마다 정수 비트맵을, 수치 속성은 정렬된 배열을 만들어 두고,
+    필터 조합은 비트 연산으로, 패싯별 개수는 popcount로 계산합니다.
+    """
+    dataset: Final[Dataset]
+    size: Final[int]
+    everything: Final[int]
+    bitmaps: Final[dict[str, dict[str, int]]]                       # facet -> value -> bitmap
+    ranges: Final[dict[str, tuple[list[float], list[int]]]]         # facet -> (sorted values, row indices)
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.dataset = dataset
+        self.size = len(dataset)
+        self.everything = (1 << self.size) - 1
+        self.bitmaps = {}
+        self.ranges = {}
+
+        # 스냅샷의 각 행을 한 번만 해석하도록, 패싯별이 아니라 행별로 값을 추출합니다.
+        columns: list[list[Any]] = [[] for _ in Facets]
+        for i in range(self.size):
+            for values, facet in zip(columns, Facets):
+                values.append(facet.extract(dataset, i))
+
+        for facet, values in zip(Facets, columns):
+            if facet.kind == "range":
+                pairs = sorted((v, i) for i, v in enumerate(values) if v is not None)
+                self.ranges[facet.name] = ([v for v, _ in pairs], [i for _, i in pairs])
+            else:
+                groups: dict[str, list[int]] = {}
+                for i, v in enumerate(values):
+                    if v is not None:
+                        groups.setdefault(valueKey(v), []).append(i)
+                self.bitmaps[facet.name] = {v: toBitmap(rows, self.size) for v, rows in groups.items()}
+
+    def rangeBitmap(self, name: str, low: float | None, high: float | None) -> int:
+        values, rows = self.ranges[name]
+        start: int = bisect_left(values, low) if low is not None else 0
+        end: int = bisect_right(values, high) if high is not None else len(values)
+        return toBitmap(rows[start:end], self.size)
+
+    def match(self, filters: dict[str, list[str]], ranges: dict[str, tuple[float | None, float | None]]) -> int:
+        """
+        필터 조건을 만족하는 행의 비트맵을 계산합니다.
+        같은 패싯의 여러 값은 OR로, 서로 다른 패싯은 AND로 결합합니다.
+        """
+        result: int = self.everything
+        for name, values in filters.items():
+            bitmaps: dict[str, int] = self.bitmaps[name]
+            any_: int = 0
+            for value in values:
+                any_ |= bitmaps.get(value, 0)
+            result &= any_
+        for name, (low, high) in ranges.items():
+            result &= self.rangeBitmap(name, low, high)
+        return result
+
+    def counts(self, bitmap: int) -> dict[str, Any]:
+        """결과 비트맵에 대한 패싯별 값의 개수, 수치 속성의 최솟값과 최댓값을 계산합니다."""
+        facets: dict[str, Any] = {}
+        for name, bitmaps in self.bitmaps.items():
+            facets[name] = {value: count for value, b in bitmaps.items() if (count := (b & bitmap).bit_count())}
+        for name, (values, rows) in self.ranges.items():
+            low: float | None = next((values[k] for k, i in enumerate(rows) if bitmap >> i & 1), None)
+            high: float | None = next((values[k] for k in range(len(rows) - 1, -1, -1) if bitmap >> rows[k] & 1), None)
+            facets[name] = {"min": low, "max": high}
+        return facets
+
+    def search(
+        self,
+        filters: dict[str, list[str]],
+        ranges: dict[str, tuple[float | None, float | None]],
+        page: int = 1,
+        size: int = 20
+    ) -> dict[str, Any]:
+        """
+        필터 조건을 만족하는 유치원 목록과 패싯별 개수를 반환합니다.
+
+        Args:
+            filters (dict[str, list[str]]): 범주형/여부 패싯 이름과 허용할 값 목록
+            ranges (dict[str, tuple[float | None, float | None]]): 수치 패싯 이름과 (최솟값, 최댓값). 경계를 포함합니다.
+            page (int, optional): 1부터 시작하는 페이지 번호
+            size (int, optional): 페이지 크기
+
+        Returns:
+            dict[str, Any]: 전체 결과 수, 패싯별 개수, 해당 페이지의 유치원 요약 목록
+        """
+        bitmap: int = self.match(filters, ranges)
+        results: list[dict[str, Any]] = []
+        for n, i in enumerate(iterBits(bitmap)):
+            if n >= page * size:
+                break
+            if n >= (page - 1) * size:
+                results.append(self.dataset.summary(i))
+        return {
+            "total": bitmap.bit_count(),
+            "page": page,
+            "size": size,
+            "facets": self.counts(bitmap),
+            "results": results
+        }
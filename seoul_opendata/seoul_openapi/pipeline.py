@@ -0,0 +1,193 @@
+from queue import Queue
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Final, Iterable
+
+Emit = Callable[[Any], None]
+StageFunction = Callable[[Any, Emit], None]     # (입력 항목, 다음 단계로 항목을 보내는 함수)
+StageFlush = Callable[[Emit], None]             # 앞 단계가 모두 끝난 뒤 한 번 호출됩니다.
+
+_Done: Final[object] = object()     # 앞 단계가 끝났음을 알리는 표식
+
+
+class Stage:
+    """
+    파이프라인의 한 단계입니다.
+    크기가 제한된 입력 큐에서 항목을 꺼내 처리하고, 처리 결과를 다음 단계의 입력 큐에 넣습니다.
+    다음 단계의 큐가 가득 차면 빌 때까지 기다리므로, 느린 단계가 앞 단계의 속도를 제한합니다.
+    """
+    name: Final[str]
+    function: Final[StageFunction]
+    flush: Final[StageFlush | None]
+    workers: Final[int]
+    inbox: Final[Queue]
+
+    def __init__(
+        self,
+        name: str,
+        function: StageFunction,
+        workers: int = 1,
+        capacity: int = 64,
+        flush: StageFlush | None = None
+    ) -> None:
+        """
+        Args:
+            name (str): 단계 이름
+            function (StageFunction): 항목 하나를 처리하는 함수. emit으로 다음 단계에 0개 이상의 항목을 보냅니다.
+            workers (int, optional): 이 단계를 처리할 스레드 수. 상태를 가진 단계는 1이어야 합니다.
+            capacity (int, optional): 입력 큐의 최대 크기
+            flush (StageFlush | None, optional): 입력이 모두 처리된 뒤, 남은 항목을 내보낼 함수
+        """
+        self.name = name
+        self.function = function
+        self.flush = flush
+        self.workers = workers
+        self.inbox = Queue(maxsize=capacity)
+        self._lock = Lock()
+        self._running: int = 0
+        self.processed: int = 0
+        self.failed: int = 0
+        self.busy: float = 0.0              # 모든 스레드가 항목을 처리하는 데 쓴 시간의 합(초)
+        self.maxDepth: int = 0
+        self.lastError: str | None = None
+
+    def record(self, elapsed: float, error: Exception | None) -> None:
+        with self._lock:
+            self.busy += elapsed
+            if error is None:
+                self.processed += 1
+            else:
+                self.failed += 1
+                self.lastError = f"{type(error).__name__}: {error}"
+            self.maxDepth = max(self.maxDepth, self.inbox.qsize())
+
+    def metrics(self, elapsed: float) -> dict[str, Any]:
+        """
+        단계의 처리량과 큐 깊이 지표입니다.
+
+        Args:
+            elapsed (float): 파이프라인이 실행된 시간(초)
+        """
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput": round(self.processed / elapsed, 3) if elapsed else None,     # 초당 처리한 항목 수
+            "utilization": round(self.busy / (elapsed * self.workers), 3) if elapsed else None,
+            "queueDepth": self.inbox.qsize(),
+            "queueCapacity": self.inbox.maxsize,
+            "maxQueueDepth": self.maxDepth,
+            "lastError": self.lastError
+        }
+
+
+class StageFailed(Exception):
+    """단계가 일부 항목을 처리하지 못해, 파이프라인의 결과가 불완전함을 알리는 오류입니다."""
+    stage: Final[str]
+    failed: Final[int]
+
+    def __init__(self, stage: Stage) -> None:
+        super().__init__(f"{stage.name}: {stage.failed} items failed, last error {stage.lastError}")
+        self.stage = stage.name
+        self.failed = stage.failed
+
+
+class Pipeline:
+    """
+    여러 단계를 크기가 제한된 큐로 연결한 파이프라인입니다.
+    모든 단계가 동시에 실행되므로, 앞 단계가 끝나기 전에 뒤 단계가 처리를 시작합니다.
+    """
+    stages: Final[list[Stage]]
+
+    def __init__(self, stages: list[Stage]) -> None:
+        self.stages = stages
+        self.startedAt: float | None = None
+        self.finishedAt: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.startedAt is None:
+            return 0.0
+        return (self.finishedAt or monotonic()) - self.startedAt
+
+    def _emitter(self, index: int) -> Emit:
+        if index + 1 < len(self.stages):
+            return self.stages[index + 1].inbox.put
+        return lambda item: None        # 마지막 단계의 결과는 버립니다.
+
+    def _work(self, index: int) -> None:
+        stage: Stage = self.stages[index]
+        emit: Emit = self._emitter(index)
+        while (item := stage.inbox.get()) is not _Done:
+            started: float = perf_counter()
+            error: Exception | None = None
+            try:
+                stage.function(item, emit)
+            except Exception as e:
+                error = e
+            stage.record(perf_counter() - started, error)
+
+        with stage._lock:
+            stage._running -= 1
+            last: bool = stage._running == 0
+        if not last:
+            return
+        # 이 단계의 마지막 스레드가, 남은 항목을 내보내고 다음 단계에 종료를 알립니다.
+        if stage.flush is not None:
+            try:
+                stage.flush(emit)
+            except Exception as e:
+                stage.record(0.0, e)
+        if index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                emit(_Done)
+
+    def run(self, items: Iterable[Any]) -> None:
+        """
+        첫 단계에 항목들을 넣고, 모든 단계가 끝날 때까지 기다립니다.
+
+        Args:
+            items (Iterable[Any]): 첫 단계의 입력 항목들
+        """
+        self.startedAt, self.finishedAt = monotonic(), None
+        threads: list[Thread] = []
+        for index, stage in enumerate(self.stages):
+            stage._running = stage.workers
+            for n in range(stage.workers):
+                thread = Thread(target=self._work, args=(index,), name=f"pipeline-{stage.name}-{n}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        first: Stage = self.stages[0]
+        for item in items:
+            first.inbox.put(item)
+        for _ in range(first.workers):
+            first.inbox.put(_Done)
+
+        for thread in threads:
+            thread.join()
+        self.finishedAt = monotonic()
+
+    def check(self, *names: str) -> None:
+        """
+        주어진 단계들이 모든 항목을 처리했는지 확인합니다.
+
+        Args:
+            *names (str): 확인할 단계 이름. 주어지지 않으면 모든 단계를 확인합니다.
+
+        Raises:
+            StageFailed: 처리하지 못한 항목이 있는 첫 단계
+        """
+        for stage in self.stages:
+            if (not names or stage.name in names) and stage.failed:
+                raise StageFailed(stage)
+
+    def metrics(self) -> dict[str, Any]:
+        """파이프라인 실행 시간과 단계별 지표입니다. 실행 중에도 호출할 수 있습니다."""
+        elapsed: float = self.elapsed
+        return {
+            "running": self.startedAt is not None and self.finishedAt is None,
+            "elapsed": round(elapsed, 3),
+            "stages": {stage.name: stage.metrics(elapsed) for stage in self.stages}
+        }
@@ -0,0 +1,146 @@
+import fcntl
+import os
+import random
+import traceback
+from threading import Event, Thread
+from time import monotonic
+from typing import Final, TextIO
+
+from seoul_opendata.seoul_openapi.client import OpenData, SeoulOpenData
+
+DataDirectory: Final[str] = os.environ.get("SEOUL_OPENDATA_DIR", "./seoul_opendata/seoul_openapi/data")
+RefreshInterval: Final[float] = float(os.environ.get("SEOUL_OPENDATA_REFRESH_INTERVAL", 6 * 60 * 60))    # 초
+RefreshJitter: Final[float] = float(os.environ.get("SEOUL_OPENDATA_REFRESH_JITTER", 10 * 60))            # 초
+PollInterval: Final[float] = float(os.environ.get("SEOUL_OPENDATA_POLL_INTERVAL", 5))                    # 초
+
+
+class RefreshScheduler:
+    """
+    공공데이터를 요청 처리와 별개의 스레드에서 주기적으로 새로 가져오는 스케줄러입니다.
+    여러 워커 중 파일 잠금을 얻은 하나의 워커(리더)만 공공데이터 api를 호출하고, 병합된 데이터를 스냅샷 파일로 저장합니다.
+    나머지 워커는 스냅샷 파일이 바뀔 때마다 새로 매핑하며, 리더가 종료되면 그 중 하나가 잠금을 얻어 리더가 됩니다.
+    """
+    openData: Final[SeoulOpenData]
+    interval: Final[float]
+    jitter: Final[float]
+    pollInterval: Final[float]
+    lockPath: Final[str]
+    snapshotPath: Final[str]
+
+    def __init__(
+        self,
+        openData: SeoulOpenData,
+        interval: float = RefreshInterval,
+        jitter: float = RefreshJitter,
+        pollInterval: float = PollInterval,
+        directory: str = DataDirectory
+    ) -> None:
+        """
+        Args:
+            openData (SeoulOpenData): 갱신할 공공데이터 클라이언트
+            interval (float, optional): 리더가 공공데이터를 새로 가져오는 주기(초)
+            jitter (float, optional): 여러 서버의 api 호출이 몰리지 않도록, 주기에 더하거나 뺄 최대 시간(초)
+            pollInterval (float, optional): 리더가 아닌 워커가 저장된 파일을 확인하고, 리더 잠금을 시도하는 주기(초)
+            directory (str, optional): 잠금 파일과 스냅샷 파일을 둘 디렉토리
+        """
+        self.openData = openData
+        self.interval = interval
+        self.jitter = jitter
+        self.pollInterval = pollInterval
+        self.lockPath = os.path.join(directory, "refresh.lock")
+        self.snapshotPath = os.path.join(directory, "snapshot.bin")
+        self.leader: bool = False
+        self.ready: Final[Event] = Event()      # 첫 데이터를 읽어 들이면 설정됩니다.
+        self._stop: Final[Event] = Event()
+        self._lockFile: TextIO | None = None
+        self._loadedAt: float = 0.0             # 마지막으로 읽어 들인 파일의 수정 시각
+        self._thread: Thread | None = None
+
+    def tryLead(self) -> bool:
+        """리더 잠금을 얻어 봅니다. 잠금은 프로세스가 종료될 때 운영체제가 해제합니다."""
+        os.makedirs(os.path.dirname(self.lockPath) or ".", exist_ok=True)
+        lockFile: TextIO = open(self.lockPath, mode="a")
+        try:
+            fcntl.flock(lockFile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lockFile.close()
+            return False
+        self._lockFile = lockFile
+        self.leader = True
+        return True
+
+    def refresh(self) -> None:
+        """(리더) 공공데이터를 가져와 데이터베이스에 반영하고, 다른 워커를 위해 스냅샷 파일로 저장합니다."""
+        self.openData.ingest()
+        self.openData.publish(self.snapshotPath)
+        self._loadedAt = os.stat(self.snapshotPath).st_mtime
+        self.ready.set()
+
+    def follow(self) -> None:
+        """(리더가 아닌 워커) 리더가 저장한 스냅샷 파일이 바뀌었으면 새로 매핑합니다."""
+        try:
+            modifiedAt: float = os.stat(self.snapshotPath).st_mtime
+        except FileNotFoundError:
+            return
+        if modifiedAt > self._loadedAt:
+            self.openData.attach(self.snapshotPath)
+            self._loadedAt = modifiedAt
+            self.ready.set()
+
+    def nextDelay(self) -> float:
+        return max(self.interval + random.uniform(-self.jitter, self.jitter), self.pollInterval)
+
+    def retryDelay(self, failures: int) -> float:
+        """연속으로 `failures`번 실패한 뒤 다시 시도하기까지의 시간(초). 실패할 때마다 두 배로 늘리되, 갱신 주기를 넘지 않습니다."""
+        return min(self.interval, self.pollInterval * 2 ** min(failures, 32))
+
+    def run(self) -> None:
+        nextRefresh: float = 0.0
+        failures: int = 0       # 연속으로 실패한 갱신 횟수
+        try:
+            # 이전에 저장된 데이터가 있으면, 새로 가져오기 전에 먼저 읽어 들여 바로 응답할 수 있도록 합니다.
+            self.follow()
+        except Exception:
+            traceback.print_exc()
+        while not self._stop.is_set():
+            delay: float = self.pollInterval
+            try:
+                if self.leader or self.tryLead():
+                    if monotonic() >= nextRefresh:
+                        try:
+                            self.refresh()
+                        except Exception:
+                            # 실패하면 이전 데이터로 계속 응답하고, 간격을 늘려 가며 다시 시도합니다.
+                            failures += 1
+                            nextRefresh = monotonic() + self.retryDelay(failures)
+                            raise
+                        failures = 0
+                        nextRefresh = monotonic() + self.nextDelay()
+                    delay = nextRefresh - monotonic()
+                else:
+                    self.follow()
+            except Exception:
+                traceback.print_exc()
+            self._stop.wait(max(delay, 0.0))
+
+    def start(self) -> None:
+        """스케줄러 스레드를 시작합니다. 이미 시작되었다면 아무것도 하지 않습니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self.run, name="opendata-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """스케줄러 스레드를 멈추고, 리더였다면 잠금을 해제합니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._lockFile is not None:
+            self._lockFile.close()      # 파일을 닫으면 잠금도 해제됩니다.
+            self._lockFile = None
+            self.leader = False
+
+
+Scheduler: Final[RefreshScheduler] = RefreshScheduler(OpenData)
@@ -0,0 +1,140 @@
+import heapq
+from array import array
+from functools import lru_cache
+from math import fsum
+from operator import add
+from typing import Any, Final
+
+from seoul_opendata.seoul_openapi.dataset import Dataset, number
+from seoul_opendata.seoul_openapi.facets import ChildrenFields, FacetsByName
+from seoul_opendata.seoul_openapi.stats import ServiceYearFields
+from seoul_opendata.utils.geo import distance_km
+
+# 점수 기준 이름과, 기준을 구성하는 여부 패싯들. 기준 값은 만족하는 패싯의 비율입니다.
+FlagCriteria: Final[dict[str, tuple[str, ...]]] = {
+    "safety": ("cctv", "fireDrill", "gasCheck", "electricCheck", "playgroundCheck"),
+    "hygiene": ("airQuality", "disinfection"),
+    "meal": ("nutritionTeacher", "massMeal")
+}
+# 근속연수 구간별 대표 값(년)
+ServiceYearMidpoints: Final[dict[str, float]] = {"under1": 0.5, "1to2": 1.5, "2to4": 3.0, "4to6": 5.0, "over6": 7.0}
+Criteria: Final[tuple[str, ...]] = (*FlagCriteria, "tenure", "space", "distance")
+DistanceScaleKm: Final[float] = 2.0     # 이 거리만큼 떨어지면 거리 점수가 절반이 됩니다.
+
+
+def flagRatio(dataset: Dataset, i: int, facets: tuple[str, ...]) -> float | None:
+    """i번째 행에서 값이 있는 여부 패싯 중 참인 비율입니다."""
+    values: list[bool] = [v for name in facets if (v := FacetsByName[name].extract(dataset, i)) is not None]
+    return sum(values) / len(values) if values else None
+
+
+def tenure(row: dict[str, Any]) -> float | None:
+    """교직원의 평균 근속연수를 근속연수 구간별 교직원 수로 추정합니다."""
+    counts: dict[str, float] = {name: n for name, field in ServiceYearFields.items() if (n := number(row, field))}
+    total: float = fsum(counts.values())
+    return fsum(ServiceYearMidpoints[name] * n for name, n in counts.items()) / total if total else None
+
+
+def space(row: dict[str, Any]) -> float | None:
+    """원아 1명당 교실 면적(㎡)입니다."""
+    area: float | None = number(row, "CLSRAREA")
+    children: float | None = number(row, *ChildrenFields)
+    return area / children if area is not None and children else None
+
+
+def normalize(values: list[float | None]) -> array:
+    """
+    값을 0~1 범위로 min-max 정규화합니다.
+    값이 없는 칸은, 점수에 유리하거나 불리하지 않도록 정규화된 값의 평균으로 채웁니다.
+    """
+    present: list[float] = [v for v in values if v is not None]
+    if not present:
+        return array("d", bytes(8 * len(values)))
+    low, high = min(present), max(present)
+    scale: float = high - low or 1.0
+    mean: float = (fsum(present) / len(present) - low) / scale
+    return array("d", (mean if v is None else (v - low) / scale for v in values))
+
+
+class SchoolScorer:
+    """
+    사용자가 정한 가중치로 유치원의 점수를 매기고, 상위 k개를 고르는 엔진입니다.
+    기준마다 0~1로 정규화한 특성 열을 데이터가 바뀔 때 한 번만 만들어 두고,
+    질의마다 가중치가 0이 아닌 열만 가중합한 뒤 부분 정렬합니다.
+    같은 질의의 결과는 캐싱되어, 입력 중 반복되는 요청에 바로 응답합니다.
+    """
+    dataset: Final[Dataset]
+    features: Final[dict[str, array]]
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.dataset = dataset
+        names: list[str] = [*FlagCriteria, "tenure", "space"]
+        # 스냅샷의 각 행을 한 번만 해석하도록, 기준별이 아니라 행별로 값을 계산합니다.
+        columns: list[list[float | None]] = [[] for _ in names]
+        for i in range(len(dataset)):
+            row: dict[str, Any] = dataset.rows[i]
+            values: list[float | None] = [*(flagRatio(dataset, i, facets) for facets in FlagCriteria.values()), tenure(row), space(row)]
+            for column, value in zip(columns, values):
+                column.append(value)
+        self.features = {name: normalize(column) for name, column in zip(names, columns)}
+        self.top = lru_cache(maxsize=1024)(self._top)
+
+    def distances(self, lat: float, lng: float) -> array:
+        """주어진 좌표와의 거리 점수 열입니다. 좌표가 없는 유치원은 0점입니다."""
+        return array("d", (
+            DistanceScaleKm / (DistanceScaleKm + distance_km(lat, lng, la, ln)) if la is not None and ln is not None else 0.0
+            for la, ln in zip(self.dataset.latitudes, self.dataset.longitudes)
+        ))
+
+    def _top(
+        self,
+        weights: tuple[tuple[str, float], ...],
+        k: int,
+        lat: float | None = None,
+        lng: float | None = None
+    ) -> tuple[tuple[float, int], ...]:
+        scores: list[float] = [0.0] * len(self.dataset)
+        for name, weight in weights:
+            if name == "distance":
+                if lat is None or lng is None:
+                    continue
+                column: array = self.distances(lat, lng)
+            else:
+                column = self.features[name]
+            scores = list(map(add, scores, map(weight.__mul__, column)))
+        return tuple(heapq.nlargest(k, zip(scores, range(len(scores)))))
+
+    def rank(
+        self,
+        weights: dict[str, float],
+        k: int = 20,
+        lat: float | None = None,
+        lng: float | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        가중치에 따른 점수가 높은 유치원 k개를 반환합니다.
+
+        Args:
+            weights (dict[str, float]): 기준 이름과 가중치. 가중치의 합으로 나눠 0~1 점수로 만듭니다.
+            k (int, optional): 가져올 유치원 수
+            lat (float | None, optional): 거리 기준의 위도
+            lng (float | None, optional): 거리 기준의 경도
+
+        Returns:
+            list[dict[str, Any]]: 점수와 기준별 값이 포함된 유치원 요약 목록
+        """
+        active: dict[str, float] = {name: w for name, w in weights.items() if w > 0}
+        if lat is None or lng is None:
+            active.pop("distance", None)
+        total: float = fsum(active.values())
+        if not total:
+            return []
+
+        key: tuple[tuple[str, float], ...] = tuple(sorted((name, w / total) for name, w in active.items()))
+        if "distance" not in active:
+            lat = lng = None
+        results: list[dict[str, Any]] = []
+        for score, i in self.top(key, k, lat, lng):
+            features: dict[str, float] = {name: round(column[i], 3) for name, column in self.features.items()}
+            results.append({"score": round(score, 4), "features": features, **self.dataset.summary(i)})
+        return results
@@ -0,0 +1,118 @@
+import json
+import marshal
+import mmap
+import os
+import struct
+from typing import Any, Final, Iterator, Mapping, Sequence, overload
+
+Magic: Final[bytes] = b"SODSNAP1"
+# magic, 데이터 버전, 행 수, 오프셋 배열 위치, 키 목록 위치와 길이, 행사 목록 위치와 길이
+Header: Final[struct.Struct] = struct.Struct("<8sQQQQQQQ")
+
+
+class SnapshotRows(Sequence[dict[str, Any]]):
+    """
+    스냅샷의 행들을 행 번호로 접근하는 시퀀스입니다. 행은 접근할 때마다 매핑된 파일에서 해석되며, 메모리에 보관하지 않습니다.
+    한 행의 여러 필드를 연달아 읽는 경우가 많으므로, 마지막으로 해석한 한 행만 보관합니다.
+    """
+    __slots__ = ("_buffer", "_offsets", "_last")
+
+    def __init__(self, buffer: memoryview, offsets: memoryview) -> None:
+        self._buffer: memoryview = buffer
+        self._offsets: memoryview = offsets     # 행 i는 buffer[offsets[i]:offsets[i + 1]]에 있습니다.
+        self._last: tuple[int, dict[str, Any]] = (-1, {})
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, i: int) -> dict[str, Any]: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, i: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        last: tuple[int, dict[str, Any]] = self._last
+        if last[0] == i:
+            return last[1]
+        row: dict[str, Any] = marshal.loads(self._buffer[self._offsets[i]:self._offsets[i + 1]])
+        self._last = (i, row)
+        return row
+
+
+class Snapshot(Mapping[str, dict[str, Any]]):
+    """
+    병합된 공공데이터를 담은 읽기 전용 스냅샷 파일입니다.
+    여러 워커가 같은 파일을 메모리 매핑하므로, 행 데이터는 운영체제의 페이지 캐시에 한 벌만 올라갑니다.
+    유치원 코드로 행을 찾는 Mapping으로, 또는 rows를 통해 행 번호로 접근할 수 있습니다.
+    """
+    version: Final[int]
+    rows: Final[SnapshotRows]
+    events: Final[list[dict[str, Any]]]
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): write()로 만든 스냅샷 파일의 경로
+        """
+        with open(path, mode="rb") as f:
+            self._mmap: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        magic, version, count, offsetsAt, keysAt, keysLength, eventsAt, eventsLength = Header.unpack_from(buffer)
+        if magic != Magic:
+            raise ValueError(f"{path} is not an open data snapshot.")
+
+        self.version = version
+        self.rows = SnapshotRows(buffer, buffer[offsetsAt:offsetsAt + 8 * (count + 1)].cast("Q"))
+        self.codes: list[str] = marshal.loads(buffer[keysAt:keysAt + keysLength])
+        self._index: dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+        self.events = json.loads(bytes(buffer[eventsAt:eventsAt + eventsLength]))
+
+    def __getitem__(self, code: str) -> dict[str, Any]:
+        return self.rows[self._index[code]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @staticmethod
+    def write(path: str, version: int, data: Mapping[str, dict[str, Any]], events: list[dict[str, Any]]) -> None:
+        """
+        병합된 데이터를 스냅샷 파일로 저장합니다.
+        임시 파일에 쓴 뒤 교체하므로, 이미 파일을 매핑한 워커는 이전 스냅샷을 그대로 읽고, 새로 여는 워커는 새 스냅샷을 읽습니다.
+
+        Args:
+            path (str): 스냅샷 파일의 경로
+            version (int): 데이터 버전
+            data (Mapping[str, dict[str, Any]]): 유치원 코드와 병합된 행
+            events (list[dict[str, Any]]): 행사 게시글 데이터
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        codes: list[str] = list(data.keys())
+        blobs: list[bytes] = [marshal.dumps(dict(data[code])) for code in codes]
+        keys: bytes = marshal.dumps(codes)
+        eventsBlob: bytes = json.dumps(events, ensure_ascii=False).encode("utf-8")     # 게시글의 enum 값은 marshal로 저장할 수 없습니다.
+
+        offsetsAt: int = Header.size
+        rowsAt: int = offsetsAt + 8 * (len(blobs) + 1)
+        offsets: list[int] = [rowsAt]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        keysAt: int = offsets[-1]
+        eventsAt: int = keysAt + len(keys)
+
+        with open(f"{path}.tmp", mode="wb") as f:
+            f.write(Header.pack(Magic, version, len(blobs), offsetsAt, keysAt, len(keys), eventsAt, len(eventsBlob)))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            for blob in blobs:
+                f.write(blob)
+            f.write(keys)
+            f.write(eventsBlob)
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,105 @@
+from array import array
+from math import fsum, isnan, nan
+from statistics import median
+from typing import Any, Final, Iterable
+
+from seoul_opendata.seoul_openapi.dataset import Dataset, flag, number
+from seoul_opendata.seoul_openapi.facets import ChildrenFields, TeacherFields
+
+AllDistricts: Final[str] = "all"        # 서울시 전체 통계의 키
+# 근속연수 구간 이름과, 해당 구간의 교직원 수 필드
+ServiceYearFields: Final[dict[str, str]] = {
+    "under1": "YY1_UNDR_THCNT",
+    "1to2": "YY1_ABV_YY2_UNDR_THCNT",
+    "2to4": "YY2_ABV_YY4_UNDR_THCNT",
+    "4to6": "YY4_ABV_YY6_UNDR_THCNT",
+    "over6": "YY6_ABV_THCNT"
+}
+
+
+def column(values: Iterable[float | bool | None]) -> array:
+    """값이 없는 칸을 NaN으로 채운 실수 열을 만듭니다."""
+    return array("d", (nan if value is None else float(value) for value in values))
+
+
+def known(col: array, rows: Iterable[int]) -> list[float]:
+    """주어진 행들 중 값이 있는 칸의 값만 모읍니다."""
+    return [value for i in rows if not isnan(value := col[i])]
+
+
+def describe(values: list[float]) -> dict[str, float | int | None]:
+    """값 목록의 개수, 평균, 중앙값, 최솟값, 최댓값을 계산합니다."""
+    if not values:
+        return {"count": 0, "mean": None, "median": None, "min": None, "max": None}
+    return {
+        "count": len(values),
+        "mean": round(fsum(values) / len(values), 3),
+        "median": median(values),
+        "min": min(values),
+        "max": max(values)
+    }
+
+
+class DistrictStats:
+    """
+    병합된 공공데이터의 지역구별 집계 통계입니다.
+    필요한 속성을 한 번만 실수 열로 추출해 두고, 지역구마다 행 번호 목록으로 열을 집계합니다.
+    """
+    version: Final[int]
+    districts: Final[dict[str, dict[str, Any]]]
+
+    def __init__(self, dataset: Dataset) -> None:
+        self.version = dataset.version
+        classArea, teachers, children, bus, *serviceYears = dataset.columns([
+            lambda row: number(row, "CLSRAREA"),
+            lambda row: number(row, *TeacherFields),
+            lambda row: number(row, *ChildrenFields),
+            lambda row: flag(row, "VHCL_OPRN_YN"),
+            *(lambda row, field=field: number(row, field) for field in ServiceYearFields.values())
+        ])
+        self.classArea: array = column(classArea)
+        self.teachers: array = column(teachers)
+        self.children: array = column(children)
+        self.bus: array = column(bus)
+        self.serviceYears: dict[str, array] = {
+            name: column(values) for name, values in zip(ServiceYearFields, serviceYears)
+        }
+
+        groups: dict[str, list[int]] = {AllDistricts: list(range(len(dataset)))}
+        for i, location in enumerate(dataset.locations):
+            if location is not None:
+                groups.setdefault(location.value, []).append(i)
+        self.districts = {name: self.aggregate(group) for name, group in groups.items()}
+
+    def aggregate(self, rows: list[int]) -> dict[str, Any]:
+        """
+        주어진 행들에 대한 통계를 계산합니다.
+
+        Args:
+            rows (list[int]): 집계할 행 번호 목록
+
+        Returns:
+            dict[str, Any]: 유치원 수, 교실 면적/교직원 수/원아 수 분포, 교직원 1인당 원아 수, 통학차량 운영 비율, 근속연수 분포
+        """
+        # 교직원 1인당 원아 수는, 두 값이 모두 있는 유치원만으로 계산합니다.
+        paired: list[int] = [i for i in rows if not isnan(self.teachers[i]) and not isnan(self.children[i])]
+        teachers: float = fsum(self.teachers[i] for i in paired)
+        children: float = fsum(self.children[i] for i in paired)
+
+        bus: list[float] = known(self.bus, rows)
+
+        years: dict[str, float] = {name: fsum(known(col, rows)) for name, col in self.serviceYears.items()}
+        total: float = fsum(years.values())
+
+        return {
+            "schools": len(rows),
+            "classArea": describe(known(self.classArea, rows)),
+            "teachers": describe(known(self.teachers, rows)),
+            "children": describe(known(self.children, rows)),
+            "childrenPerTeacher": round(children / teachers, 3) if teachers else None,
+            "busCoverage": round(fsum(bus) / len(bus), 3) if bus else None,
+            "serviceYears": {
+                name: {"teachers": int(count), "ratio": round(count / total, 3) if total else None}
+                for name, count in years.items()
+            }
+        }
@@ -0,0 +1,45 @@
+from threading import Lock
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    첫 속성 접근 시에 객체를 만드는 프록시입니다.
+    모듈을 import할 때 외부 서비스에 연결하지 않도록, 전역 객체를 감쌀 때 사용합니다.
+    """
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        """
+        Args:
+            factory (Callable[[], T]): 감쌀 객체를 만드는 함수. 한 번만 호출됩니다.
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", Lock())
+
+    @property
+    def initialized(self) -> bool:
+        """감싼 객체가 이미 만들어졌는지 여부"""
+        return self._instance is not None
+
+    def get(self) -> T:
+        """감싼 객체를 반환합니다. 아직 만들어지지 않았다면 만듭니다."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, "_instance", self._factory())
+        return self._instance       # type: ignore
+
+    def use(self, instance: T) -> None:
+        """감싼 객체를 주어진 객체로 바꿉니다. 벤치마크처럼 외부 서비스 대신 로컬 구현을 쓸 때 사용합니다."""
+        with self._lock:
+            object.__setattr__(self, "_instance", instance)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.get(), name, value)
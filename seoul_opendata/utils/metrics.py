@@ -0,0 +1,170 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Final, Iterable, Iterator
+
+Labels = tuple[str, ...]
+DefaultBuckets: Final[tuple[float, ...]] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape(value: str) -> str:
+    """Prometheus 텍스트 형식의 라벨 값으로 쓸 수 있도록 이스케이프합니다."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def formatLabels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs: list[str] = [f'{name}="{escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def formatValue(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """
+    Prometheus 텍스트 형식으로 내보내는 지표의 기반 클래스입니다.
+    라벨 값의 조합마다 값을 따로 보관하며, 값의 갱신은 잠금 하나로 보호되는 산술 연산뿐이므로 요청 처리 중에 호출해도 부담이 적습니다.
+    """
+    kind: str = "untyped"
+    name: Final[str]
+    help: Final[str]
+    labelNames: Final[Labels]
+
+    def __init__(self, name: str, help: str, labelNames: Labels = ()) -> None:
+        """
+        Args:
+            name (str): 지표 이름
+            help (str): 지표 설명
+            labelNames (Labels, optional): 라벨 이름들
+        """
+        self.name = name
+        self.help = help
+        self.labelNames = labelNames
+        self._lock = Lock()
+        Registry.append(self)
+
+    def key(self, labels: dict[str, str]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelNames)
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        """(이름 접미사, 추가 라벨 이름, 라벨 값, 값) 목록입니다."""
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for suffix, extraNames, values, value in self.samples():
+            yield f"{self.name}{suffix}{formatLabels(self.labelNames + extraNames, values)} {formatValue(value)}"
+
+
+class Counter(Metric):
+    """증가하기만 하는 지표입니다."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelNames: Labels = ()) -> None:
+        super().__init__(name, help, labelNames)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key: Labels = self.key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self.key(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        with self._lock:
+            items: list[tuple[Labels, float]] = list(self.values.items())
+        for key, value in items:
+            yield "", (), key, value
+
+
+class Gauge(Metric):
+    """
+    늘거나 줄어드는 지표입니다.
+    collect가 주어지면 값을 보관하지 않고, 내보낼 때마다 collect가 반환한 라벨 값과 값을 사용합니다.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelNames: Labels = (), collect: Callable[[], dict[Labels, float]] | None = None) -> None:
+        super().__init__(name, help, labelNames)
+        self.values: dict[Labels, float] = {}
+        self.collect = collect
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key: Labels = self.key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self.values[self.key(labels)] = value
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        if self.collect is not None:
+            items: list[tuple[Labels, float]] = list(self.collect().items())
+        else:
+            with self._lock:
+                items = list(self.values.items())
+        for key, value in items:
+            yield "", (), key, value
+
+
+class Histogram(Metric):
+    """관측 값의 분포를 구간별 개수와 합으로 보관하는 지표입니다."""
+    kind = "histogram"
+    buckets: Final[tuple[float, ...]]
+
+    def __init__(self, name: str, help: str, labelNames: Labels = (), buckets: tuple[float, ...] = DefaultBuckets) -> None:
+        super().__init__(name, help, labelNames)
+        self.buckets = buckets
+        self.values: dict[Labels, tuple[list[int], list[float]]] = {}      # 라벨 값 -> (구간별 개수, [합])
+
+    def observe(self, value: float, **labels: str) -> None:
+        key: Labels = self.key(labels)
+        index: int = bisect_left(self.buckets, value)       # 구간의 상한은 값을 포함합니다.
+        with self._lock:
+            if (entry := self.values.get(key)) is None:
+                entry = self.values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        with self._lock:
+            items: list[tuple[Labels, list[int], float]] = [(key, list(counts), total[0]) for key, (counts, total) in self.values.items()]
+        for key, counts, total in items:
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield "_bucket", ("le",), key + (formatValue(bound),), cumulative
+            yield "_sum", (), key, total
+            yield "_count", (), key, cumulative
+
+
+Registry: Final[list[Metric]] = []
+
+
+def render() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 내보냅니다."""
+    return "\n".join(line for metric in Registry for line in metric.render()) + "\n"
+
+
+# 여러 모듈에서 함께 쓰는 지표
+CacheLookups: Final[Counter] = Counter("cache_lookups_total", "Cache lookups by cache and result (hit, miss).", ("cache", "result"))
+
+
+def cacheHitRatios() -> dict[Labels, float]:
+    totals: dict[str, list[float]] = {}
+    for (cache, result), value in list(CacheLookups.values.items()):
+        entry: list[float] = totals.setdefault(cache, [0.0, 0.0])
+        entry[result != "hit"] += value
+    return {(cache,): hits / (hits + misses) for cache, (hits, misses) in totals.items() if hits + misses}
+
+
+CacheHitRatio: Final[Gauge] = Gauge("cache_hit_ratio", "Ratio of cache lookups which hit.", ("cache",), collect=cacheHitRatios)
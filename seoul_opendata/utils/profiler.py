@@ -0,0 +1,124 @@
+import sys
+from collections import Counter, OrderedDict
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import ClassVar, Final
+from uuid import uuid4
+
+AppModules: Final[tuple[str, ...]] = ("seoul_opendata", "main")
+# 호출 트리를 기록하는 래퍼는 모든 레포지토리 메소드 사이에 끼어 있으므로 스택에서 뺍니다.
+HiddenModules: Final[tuple[str, ...]] = ("seoul_opendata.firebase.tracing", "seoul_opendata.utils.profiler")
+Stack = tuple[CodeType, ...]
+
+
+def isApp(module: str) -> bool:
+    return any(module == name or module.startswith(f"{name}.") for name in AppModules)
+
+
+class SamplingProfiler:
+    """
+    워커의 모든 스레드 스택을 일정 주기로 샘플링하는 통계적 프로파일러입니다.
+    `sys._current_frames()`로 스택을 읽기만 하므로 프로파일 대상 코드에 추적 훅을 걸지 않으며, 샘플 주기만큼의 부담만 생깁니다.
+    스택은 `seoul_opendata`(또는 `main`)의 첫 프레임부터 기록하고, 앱 프레임이 없는 스택은 버립니다.
+    """
+    samplers: ClassVar[set[int]] = set()        # 샘플링 스레드의 id. 서로의 스택은 기록하지 않습니다.
+    interval: Final[float]
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """
+        Args:
+            interval (float, optional): 샘플링 주기(초)
+        """
+        self.interval = interval
+        self.samples: Counter[Stack] = Counter()
+        self.labels: dict[CodeType, str] = {}
+        self.elapsed: float = 0.0
+        self._stop = Event()
+        self._thread = Thread(target=self.run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self._startedAt: float = perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = perf_counter() - self._startedAt
+        return self
+
+    def run(self) -> None:
+        SamplingProfiler.samplers.add(get_ident())
+        try:
+            while not self._stop.wait(self.interval):
+                self.sample()
+        finally:
+            SamplingProfiler.samplers.discard(get_ident())
+
+    def sample(self) -> None:
+        for thread, frame in sys._current_frames().items():
+            if thread in SamplingProfiler.samplers:
+                continue
+            if stack := self.stack(frame):
+                self.samples[stack] += 1
+
+    def stack(self, frame: FrameType | None) -> Stack:
+        """프레임에서 바깥쪽으로 올라가며 스택을 읽고, 가장 바깥의 앱 프레임부터 잘라 반환합니다."""
+        codes: list[CodeType] = []
+        outermost: int = -1
+        while frame is not None:
+            code: CodeType = frame.f_code
+            if (label := self.labels.get(code)) is None:
+                module: str = frame.f_globals.get("__name__", "?")
+                label = self.labels[code] = f"{module}:{code.co_qualname}"
+            module = label.split(":", 1)[0]
+            if not module.startswith(HiddenModules):
+                codes.append(code)
+                if isApp(module):
+                    outermost = len(codes)
+            frame = frame.f_back
+        return tuple(reversed(codes[:outermost])) if outermost > 0 else ()
+
+    def collapsed(self, within: CodeType | None = None) -> str:
+        """
+        샘플을 flamegraph.pl, speedscope 등에서 읽을 수 있는 collapsed stack 형식으로 반환합니다.
+
+        Args:
+            within (CodeType | None, optional): 주어지면 이 함수를 거치는 스택만 포함합니다.
+
+        Returns:
+            str: `바깥 함수;...;안쪽 함수 샘플 수` 형식의 줄들
+        """
+        lines: list[str] = [
+            f"{';'.join(self.labels[code] for code in stack)} {count}"
+            for stack, count in self.samples.most_common()
+            if within is None or within in stack
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class ProfileStore:
+    """요청 단위 프로파일 결과를 최근 것부터 일정 개수만 보관합니다."""
+    capacity: Final[int]
+
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity = capacity
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+        self._lock = Lock()
+
+    def put(self, collapsed: str) -> str:
+        """결과를 보관하고 조회할 때 쓸 id를 반환합니다."""
+        profileId: str = uuid4().hex
+        with self._lock:
+            self._profiles[profileId] = collapsed
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+        return profileId
+
+    def get(self, profileId: str) -> str | None:
+        with self._lock:
+            return self._profiles.get(profileId)
+
+
+RequestProfiles: Final[ProfileStore] = ProfileStore()
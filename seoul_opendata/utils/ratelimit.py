@@ -0,0 +1,59 @@
+from threading import Lock
+from time import monotonic, sleep
+from typing import Final
+
+
+class TokenBucket:
+    """
+    여러 스레드가 함께 쓰는 토큰 버킷 속도 제한기입니다.
+    초당 `rate`개의 토큰이 최대 `capacity`개까지 쌓이고, 호출마다 토큰을 하나 씁니다.
+    토큰이 모자라면 미리 예약한 뒤 토큰이 생길 시각까지 기다리므로, 동시에 기다리는 호출자들도 `rate`의 간격으로 차례로 실행됩니다.
+    """
+    rate: Final[float]
+    capacity: Final[float]
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        Args:
+            rate (float): 초당 토큰 수. 0 이하이면 제한하지 않습니다.
+            capacity (float | None, optional): 한 번에 몰아 쓸 수 있는 최대 토큰 수. 기본 값은 max(1, rate)입니다.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._lock = Lock()
+        self._tokens: float = self.capacity
+        self._updatedAt: float = monotonic()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 예약하고, 예약한 토큰을 쓸 수 있을 때까지 기다려야 할 시간(초)을 반환합니다.
+        토큰이 모자라면 빚으로 남겨, 다음 호출자는 빚을 갚을 시간만큼 더 기다립니다.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now: float = monotonic()
+            if now > self._updatedAt:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updatedAt) * self.rate)
+                self._updatedAt = now
+            self._tokens -= tokens
+            # pause()로 멈춘 동안에는 _updatedAt이 미래이므로, 멈춘 시간이 대기 시간에 더해집니다.
+            return max(0.0, self._updatedAt - now) + max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 쓸 수 있을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        wait: float = self.reserve(tokens)
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        서버가 속도 제한을 알렸을 때, 모든 호출자를 `seconds`초 동안 멈춥니다.
+        멈춘 동안에는 토큰이 쌓이지 않으며, 다시 시작한 뒤에도 한꺼번에 몰리지 않도록 남은 토큰을 버립니다.
+        """
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._updatedAt = max(self._updatedAt, monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,77 @@
+import os
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+from typing import Final
+from uuid import UUID
+
+Version7: Final[int] = 0x7000 << 64             # 버전 비트 (0111)
+Variant: Final[int] = 0b10 << 62                # RFC 4122 variant 비트 (10)
+RandomBMask: Final[int] = (1 << 62) - 1
+
+_lastMillis: int = 0
+_lastCounter: int = 0
+_lock: Final[Lock] = Lock()
+
+
+def to_millis(at: datetime) -> int:
+    """datetime 객체를 유닉스 시간(ms)으로 변환합니다. 시간대가 없으면 서버의 지역 시간으로 해석합니다."""
+    return int(at.timestamp() * 1000)
+
+
+def uuid7(at: datetime | None = None) -> UUID:
+    """
+    생성 시각 순서로 정렬되는 UUID(version 7)를 생성합니다.
+    앞 48비트가 유닉스 시간(ms)이므로, 문자열 표현도 시간 순서대로 정렬됩니다.
+    같은 밀리초에 생성된 UUID는 12비트 카운터로 생성 순서를 유지합니다.
+
+    Args:
+        at (datetime | None, optional): UUID에 기록할 시각. 기본 값은 현재 시각입니다.
+
+    Returns:
+        UUID: 생성된 UUID
+    """
+    global _lastMillis, _lastCounter
+    randomBits: int = int.from_bytes(os.urandom(10), "big")
+
+    if at is not None:
+        millis: int = to_millis(at)
+        counter: int = randomBits >> 68
+    else:
+        with _lock:
+            millis = max(to_millis(datetime.now()), _lastMillis)
+            if millis == _lastMillis:
+                _lastCounter += 1
+                if _lastCounter > 0xFFF:        # 카운터가 넘치면 다음 밀리초로 넘어갑니다.
+                    millis += 1
+                    _lastCounter = 0
+            else:
+                _lastCounter = (randomBits >> 68) & 0x7FF       # 절반 아래에서 시작해, 같은 ms의 여유 공간을 남깁니다.
+            _lastMillis, counter = millis, _lastCounter
+
+    return UUID(int=(millis & 0xFFFFFFFFFFFF) << 80 | Version7 | counter << 64 | Variant | randomBits & RandomBMask)
+
+
+def is_uuid7(value: str) -> bool:
+    """문자열이 UUID(version 7)인지 확인합니다. 이전에 저장된 게시글은 uuid4 id를 가질 수 있습니다."""
+    try:
+        return UUID(value).version == 7
+    except ValueError:
+        return False
+
+
+def uuid7_bound(day: date, upper: bool = False) -> str:
+    """
+    주어진 날짜에 생성된 UUID(version 7)의 범위 경계를 반환합니다. 키 범위 질의에 사용합니다.
+
+    Args:
+        day (date): 날짜
+        upper (bool, optional): True이면 그 날짜의 마지막 UUID를, False이면 첫 UUID를 반환합니다.
+
+    Returns:
+        str: 경계 UUID의 문자열 표현
+    """
+    if upper:
+        millis: int = to_millis(datetime.combine(day + timedelta(days=1), time())) - 1
+        return str(UUID(int=millis << 80 | Version7 | 0xFFF << 64 | Variant | RandomBMask))
+    millis = to_millis(datetime.combine(day, time()))
+    return str(UUID(int=millis << 80 | Version7 | Variant))
@@ -3,4 +3,3 @@ import os
 def set_keys():
     os.environ["SEOUL_OPENDATA_KEY"] = "6c514452756c61703839496c494c72"
 
-set_keys()
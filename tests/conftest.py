@@ -0,0 +1,29 @@
+from typing import Iterator, cast
+
+import pytest
+from firebase_admin import db
+
+from benchmarks.memorydb import MemoryDatabase
+from seoul_opendata.firebase.controller import FirebaseController
+from seoul_opendata.firebase.deadline import currentDeadline
+
+
+@pytest.fixture
+def database() -> MemoryDatabase:
+    return MemoryDatabase()
+
+
+@pytest.fixture
+def controller(database: MemoryDatabase) -> Iterator[FirebaseController]:
+    """firebase 대신 `MemoryDatabase`에 연결한 컨트롤러입니다."""
+    controller = FirebaseController(cast(db.Reference, database.reference()))
+    controller.versions.syncInterval = 0        # 다른 워커의 쓰기가 바로 보이도록, 버전 카운터를 매번 읽습니다.
+    yield controller
+    controller.close()
+
+
+@pytest.fixture(autouse=True)
+def noDeadline() -> Iterator[None]:
+    token = currentDeadline.set(None)
+    yield
+    currentDeadline.reset(token)
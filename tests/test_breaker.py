@@ -0,0 +1,37 @@
+import pytest
+
+from seoul_opendata.firebase.breaker import CircuitBreaker, FallbackCache, Refresh, State
+from seoul_opendata.firebase.replica import Miss
+
+
+def test_breaker_opens_after_consecutive_outages() -> None:
+    breaker = CircuitBreaker(failureThreshold=2, cooldown=0, slowCall=1)
+    assert not breaker.record(0, OSError())
+    assert not breaker.record(0, None)          # a success resets the count.
+    assert not breaker.record(0, ValueError())  # not an outage: the database answered.
+    assert not breaker.record(0, OSError())
+    assert breaker.state is State.Closed
+    assert breaker.record(2, None)              # slow calls count as failures.
+    assert breaker.state is State.Open and not breaker.allow()
+
+
+def test_probe_closes_or_reopens_the_breaker() -> None:
+    breaker = CircuitBreaker(failureThreshold=1, cooldown=0, slowCall=1)
+    breaker.record(0, OSError())
+    with pytest.raises(OSError):
+        breaker.probe(lambda: (_ for _ in ()).throw(OSError()))
+    assert breaker.state is State.Open
+    assert breaker.probe(lambda: 1) == 1
+    assert breaker.state is State.Closed and breaker.allow()
+
+
+def test_fallback_serves_copies_of_the_last_good_read() -> None:
+    cache = FallbackCache(capacity=1)
+    refresh = Refresh("get", "a", lambda: None)
+    cache.put("a", {"x": [1]})
+    served = cache.serve("a", refresh)
+    served["x"].append(2)
+    assert cache.serve("a", refresh) == {"x": [1]}
+    assert set(cache.stalled()) == {"a"}
+    cache.put("b", 1)                           # evicts the least recently used copy.
+    assert cache.serve("a", refresh) is Miss
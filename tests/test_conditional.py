@@ -0,0 +1,34 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from seoul_opendata.firebase.controller import FirebaseController
+from seoul_opendata.models import Location
+from seoul_opendata.models.payloads import ChildCreate, ChildUpdate, UserCreate
+from seoul_opendata.models.user import Gender
+from seoul_opendata.routes.child_school_route import child_school_router
+
+
+@pytest.fixture
+def client(controller: FirebaseController, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr("seoul_opendata.routes.conditional.DB", controller)
+    monkeypatch.setattr("seoul_opendata.routes.child_school_route.DB", controller)
+    app = FastAPI()
+    app.include_router(child_school_router)
+    return TestClient(app)
+
+
+def test_child_without_school_changes_etag(controller: FirebaseController, client: TestClient) -> None:
+    controller.parentUser.create(
+        UserCreate(id="parent", password="pw", name="부모", tel="010", gender=Gender.Female, location=Location.GangNam)
+    )
+    child = controller.child.create(ChildCreate(name="아이", age=3, parentId="parent"))
+
+    first = client.get("/childschools/all")
+    etag: str = first.headers["ETag"]
+    assert client.get("/childschools/all", headers={"If-None-Match": etag}).status_code == 304
+
+    controller.child.update(ChildUpdate(id=str(child.id), parentId="parent", age=4))
+    second = client.get("/childschools/all", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
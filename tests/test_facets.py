@@ -0,0 +1,36 @@
+from seoul_opendata.seoul_openapi.dataset import Dataset
+from seoul_opendata.seoul_openapi.facets import FacetIndex, iterBits, toBitmap
+
+
+def row(district: str, establish: str, bus: str, classrooms: int) -> dict:
+    return {"ADDR": f"서울특별시 {district} 테스트로 1", "ESTABLISH": establish, "VHCL_OPRN_YN": bus, "CRCNT": str(classrooms)}
+
+
+def facetIndex() -> FacetIndex:
+    rows: list[dict] = [
+        row("강남구", "사립(사인)", "Y", 3),
+        row("강남구", "공립(병설)", "N", 5),
+        row("마포구", "사립(법인)", "Y", 8),
+        row("마포구", "공립(단설)", "Y", 1),
+    ]
+    return FacetIndex(Dataset({f"k{i}": r for i, r in enumerate(rows)}, [], 0))
+
+
+def test_bitmap_round_trip() -> None:
+    assert list(iterBits(toBitmap([0, 5, 9, 64], 70))) == [0, 5, 9, 64]
+    assert toBitmap([], 10) == 0
+
+
+def test_values_of_a_facet_are_or_and_facets_are_and() -> None:
+    index = facetIndex()
+    assert list(iterBits(index.match({"location": ["강남구"]}, {}))) == [0, 1]
+    assert list(iterBits(index.match({"location": ["강남구", "마포구"], "bus": ["true"]}, {}))) == [0, 2, 3]
+    assert list(iterBits(index.match({"establishType": ["사립"]}, {"classrooms": (3, 8)}))) == [0, 2]
+    assert index.match({"location": ["종로구"]}, {}) == 0
+
+
+def test_counts_of_the_matching_rows() -> None:
+    index = facetIndex()
+    counts: dict = index.counts(index.match({"bus": ["true"]}, {}))
+    assert counts["location"] == {"강남구": 1, "마포구": 2}
+    assert counts["classrooms"] == {"min": 1.0, "max": 8.0}
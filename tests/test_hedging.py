@@ -0,0 +1,64 @@
+import threading
+from time import sleep
+
+import pytest
+
+from seoul_opendata.firebase.controller import DeadlineExceeded, FirebaseController
+from seoul_opendata.firebase.deadline import Deadline, startDeadline
+from seoul_opendata.firebase.hedging import Hedger, LatencyWindow, readKind
+
+
+def test_latency_window_quantile() -> None:
+    window = LatencyWindow(0.5, minSamples=3)
+    window.observe(1)
+    window.observe(3)
+    assert window.value() is None
+    window.observe(2)
+    assert window.value() == 2
+
+
+def test_reads_run_inline_until_enough_samples() -> None:
+    hedger = Hedger(0.9)
+    threads: list[str] = []
+    for _ in range(hedger.window("get /a").minSamples):
+        hedger.run("get /a", lambda: threads.append(threading.current_thread().name), timeout=1)
+    assert set(threads) == {threading.current_thread().name}
+    hedger.close()
+
+
+def test_slow_read_is_hedged() -> None:
+    hedger = Hedger(0.9, minDelay=0.001)
+    for _ in range(hedger.window("get /a").minSamples):
+        hedger.run("get /a", lambda: None)
+    calls: list[int] = []
+
+    def read() -> int:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            sleep(0.5)
+        return len(calls)
+
+    assert hedger.run("get /a", read, timeout=5) == 2     # the duplicate answered first.
+    with pytest.raises(TimeoutError):
+        hedger.run("get /a", lambda: sleep(0.5), timeout=0.05)
+    hedger.close()
+
+
+def test_read_kind() -> None:
+    assert readKind("get", "/children/c1") == "get /children/*"
+    assert readKind("query", "articles?orderBy=$key") == "query /articles"
+
+
+def test_deadline() -> None:
+    deadline = Deadline(0.05)
+    assert not deadline.expired and 0 < deadline.remaining() <= 0.05
+    sleep(0.06)
+    assert deadline.expired and deadline.remaining() == 0
+    assert startDeadline(0) is None
+
+
+def test_operations_fail_once_the_deadline_passed(controller: FirebaseController) -> None:
+    startDeadline(0.001)
+    sleep(0.01)
+    with pytest.raises(DeadlineExceeded):
+        controller.read("children")
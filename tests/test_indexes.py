@@ -0,0 +1,60 @@
+from seoul_opendata.firebase.controller import FirebaseController
+from seoul_opendata.firebase.indexes import buildIndex, escapeKey, feedUpdates, indexPath, indexUpdates, walkEntries
+from seoul_opendata.models import Location
+from seoul_opendata.models.payloads import ArticleCreate, ArticleDelete
+
+from benchmarks.memorydb import MemoryDatabase
+
+
+def test_escape_key() -> None:
+    assert escapeKey("a.b/c") == "a%2Eb%2Fc"
+    assert indexPath("articles", "location", "a#b") == "indexes/articles/location/a%23b"
+
+
+def test_index_updates_on_create_move_and_delete() -> None:
+    assert indexUpdates("children", ["parentId"], "c1", None, {"parentId": "p1"}) == {
+        "indexes/children/parentId/p1/c1": True
+    }
+    assert indexUpdates("children", ["parentId"], "c1", {"parentId": "p1"}, {"parentId": "p2"}) == {
+        "indexes/children/parentId/p1/c1": None,
+        "indexes/children/parentId/p2/c1": True
+    }
+    assert indexUpdates("children", ["parentId"], "c1", {"parentId": "p1"}, {"parentId": "p1", "age": 3}) == {}
+    assert indexUpdates("children", ["parentId"], "c1", {"parentId": "p1"}, None) == {
+        "indexes/children/parentId/p1/c1": None
+    }
+
+
+def test_feed_updates() -> None:
+    assert feedUpdates("articles", "events/a1", {"title": "t"}) == {"indexes/articles/_feed/a1": "events/a1"}
+    assert feedUpdates("articles", "events/a1", None) == {"indexes/articles/_feed/a1": None}
+
+
+def test_build_index_nests_keys() -> None:
+    entries = list(walkEntries({"events": {"a1": {"location": "강남구"}}, "s1": {"a2": {"location": None}}}, 2))
+    assert entries == [("events/a1", {"location": "강남구"}), ("s1/a2", {"location": None})]
+    assert buildIndex(["location"], entries) == {"location": {"강남구": {"events": {"a1": True}}}}
+
+
+def articleIndex(database: MemoryDatabase) -> dict:
+    return database.reference("indexes/articles").get() or {}
+
+
+def test_repository_writes_keep_index_in_sync(controller: FirebaseController, database: MemoryDatabase) -> None:
+    article = controller.article.createEventArticle(
+        ArticleCreate(title="행사", content="내용", attachments=[], location=Location.GangNam)
+    )
+    key: str = f"events/{article.id}"
+    assert controller.article.lookup("location", Location.GangNam) == [key]
+
+    data: dict = controller.article.current(key)
+    controller.article.store(key, data, data | {"location": Location.MaPo.value})
+    assert controller.article.lookup("location", Location.GangNam) == []
+    assert controller.article.lookup("location", Location.MaPo) == [key]
+
+    incremental: dict = articleIndex(database)
+    controller.article.rebuildIndexes()
+    assert articleIndex(database) == incremental
+
+    controller.article.delete(ArticleDelete(id=str(article.id)))
+    assert articleIndex(database) == {}
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.generators import generateOpenApiPages
+from benchmarks.memorydb import MemoryDatabase
+from benchmarks.openapi import FixtureAdapter, OpenApiPrefix
+from seoul_opendata.firebase.controller import FirebaseController
+from seoul_opendata.seoul_openapi.client import OpenDataAPICallers, SeoulOpenData
+from seoul_opendata.seoul_openapi.pipeline import StageFailed
+from seoul_opendata.utils.ratelimit import TokenBucket
+
+
+@pytest.fixture
+def openData(controller: FirebaseController, monkeypatch: pytest.MonkeyPatch, tmp_path) -> SeoulOpenData:
+    """고정 응답으로 공공데이터를 가져오는 클라이언트입니다. 응답 본문은 임시 디렉토리 아래에 저장됩니다."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SEOUL_OPENDATA_KEY", "test")
+    monkeypatch.setattr("seoul_opendata.seoul_openapi.client.DB", controller)
+    openData = SeoulOpenData()
+    openData.api.session.mount(OpenApiPrefix, FixtureAdapter(generateOpenApiPages(20, 5)))
+    openData.api.limiter = TokenBucket(0)
+    openData.api.attempts = 1
+    return openData
+
+
+def test_prefetch_does_not_write(openData: SeoulOpenData, database: MemoryDatabase) -> None:
+    openData.prefetch()
+    assert openData.version == 1
+    assert len(openData.data) == 20 and len(openData.events) == 5
+    assert not database.reference().get()
+
+
+def test_failed_api_call_keeps_previous_data(openData: SeoulOpenData) -> None:
+    openData.ingest(write=False)
+    data, events = openData.data, openData.events
+
+    adapter = openData.api.session.get_adapter(OpenApiPrefix)
+    del adapter.pages[OpenDataAPICallers[0]]       # this api now answers 404.
+    with pytest.raises(StageFailed) as failure:
+        openData.ingest(write=False)
+    assert failure.value.stage == "fetch"
+    assert openData.version == 1
+    assert openData.data is data and openData.events is events
@@ -0,0 +1,22 @@
+from seoul_opendata.utils.ratelimit import TokenBucket
+
+
+def test_bucket_spaces_calls_by_rate() -> None:
+    bucket = TokenBucket(10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 <= bucket.reserve() <= 0.1
+    assert 0.19 <= bucket.reserve() <= 0.2
+
+
+def test_pause_delays_every_caller_and_drops_tokens() -> None:
+    bucket = TokenBucket(10, capacity=5)
+    bucket.pause(0.5)
+    assert 0.49 <= bucket.reserve() <= 0.6     # no burst after the pause.
+    assert bucket.reserve() >= 0.55
+
+
+def test_unlimited_bucket() -> None:
+    bucket = TokenBucket(0)
+    bucket.pause(10)
+    assert bucket.reserve() == 0
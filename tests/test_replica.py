@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from typing import Any, Callable, cast
+
+from firebase_admin import db
+
+from benchmarks.memorydb import MemoryDatabase
+from seoul_opendata.firebase.replica import LocalReplica, Miss
+from seoul_opendata.firebase.versions import SubtreeVersions
+
+
+class Stream:
+    """Reference whose `listen` hands the callback to the test, which sends the change stream events."""
+
+    def __init__(self) -> None:
+        self.callbacks: dict[str, Callable[[Any], None]] = {}
+
+    def child(self, path: str) -> "Stream":
+        self.path = path
+        return self
+
+    def listen(self, callback: Callable[[Any], None]) -> SimpleNamespace:
+        self.callbacks[self.path] = callback
+        return SimpleNamespace(close=lambda: None)
+
+    def send(self, subtree: str, eventType: str, path: str, data: Any) -> None:
+        self.callbacks[subtree](SimpleNamespace(event_type=eventType, path=path, data=data))
+
+
+def replica() -> tuple[LocalReplica, Stream]:
+    stream = Stream()
+    versions = SubtreeVersions(cast(db.Reference, MemoryDatabase().reference("versions")), syncInterval=0)
+    replica = LocalReplica(cast(db.Reference, stream), versions, ["childschool"])
+    replica.start()
+    return replica, stream
+
+
+def test_reads_miss_until_the_snapshot_arrives() -> None:
+    local, stream = replica()
+    assert local.get("childschool/s1") is Miss
+    stream.send("childschool", "put", "/", {"s1": {"name": "A"}})
+    assert local.get("childschool/s1") == {"name": "A"}
+    assert local.get("articles") is Miss        # not replicated.
+
+
+def test_put_patch_and_delete_events() -> None:
+    local, stream = replica()
+    stream.send("childschool", "put", "/", {"s1": {"name": "A", "tel": "1"}})
+    stream.send("childschool", "put", "/s2", {"name": "B"})
+    stream.send("childschool", "patch", "/s1", {"name": "A2", "tel": None})
+    assert local.get("childschool") == {"s1": {"name": "A2"}, "s2": {"name": "B"}}
+    stream.send("childschool", "put", "/s1/name", None)     # removing the last child removes the entry.
+    assert local.get("childschool") == {"s2": {"name": "B"}}
+    local.apply({"childschool/s3": {"name": "C"}, "articles/x": 1})
+    assert local.get("childschool/s3") == {"name": "C"}
+
+
+def test_served_data_is_a_copy() -> None:
+    local, stream = replica()
+    stream.send("childschool", "put", "/", {"s1": {"name": "A"}})
+    local.get("childschool/s1")["name"] = "changed"
+    assert local.get("childschool/s1") == {"name": "A"}
+
+
+def test_broken_event_stops_serving_the_subtree() -> None:
+    local, stream = replica()
+    stream.send("childschool", "put", "/", {"s1": {"name": "A"}})
+    stream.send("childschool", "patch", "/", ["not", "a", "dict"])
+    assert local.get("childschool/s1") is Miss
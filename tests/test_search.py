@@ -0,0 +1,53 @@
+from typing import cast
+
+from firebase_admin import db
+
+from benchmarks.memorydb import MemoryDatabase
+from seoul_opendata.firebase.controller import FirebaseController
+from seoul_opendata.search import SearchIndex, tokenize
+
+
+def test_tokenize_korean_bigrams_and_words() -> None:
+    assert tokenize("서울특별시 용산구 회나무로13가길") == [
+        "서울", "울특", "특별", "별시", "용산", "산구", "회나", "나무", "무로", "13", "가길"
+    ]
+    assert tokenize("Happy 유치원!") == ["happy", "유치", "치원"]
+    assert tokenize("숲") == ["숲"]
+
+
+def school(code: str, name: str) -> dict:
+    return {"code": code, "name": name, "representerName": "대표", "address": "서울특별시 강남구", "location": "강남구", "establishType": "사립"}
+
+
+def test_index_follows_writes_of_this_and_other_workers(controller: FirebaseController, database: MemoryDatabase) -> None:
+    controller.childSchool.store("s1", None, school("s1", "햇살유치원"))
+    index = SearchIndex(controller)
+    assert index.search("햇살")["total"] == 1      # the first search waits for the build.
+
+    # writes of this worker are applied without rebuilding.
+    controller.childSchool.store("s2", None, school("s2", "햇살숲유치원"))
+    assert index.search("햇살")["total"] == 2
+    assert index.seen == {"childschool": 0, "articles": 0}
+
+    # writes of another worker are noticed through the version counters, and rebuilt in background.
+    other = FirebaseController(cast(db.Reference, database.reference()))
+    other.childSchool.store("s3", None, school("s3", "햇살달유치원"))
+    index.search("햇살")        # served from the current index, while the rebuild starts.
+    assert index.start().wait(5)
+    assert index.search("햇살")["total"] == 3
+    assert index.seen["childschool"] == 1
+    other.close()
+
+
+def test_one_syllable_query_matches_bigrams(controller: FirebaseController) -> None:
+    controller.childSchool.store("s1", None, school("s1", "햇살유치원"))
+    controller.childSchool.store("s2", None, school("s2", "숲 유치원"))
+    index = SearchIndex(controller)
+    assert index.search("햇")["total"] == 1
+    assert index.search("숲")["total"] == 1
+    assert index.search("원")["total"] == 2
+    assert index.search("원 햇")["total"] == 1
+
+    controller.childSchool.store("s1", school("s1", "햇살유치원"), None)
+    assert index.search("햇")["total"] == 0
+    assert "햇" not in index.syllables
@@ -0,0 +1,24 @@
+from datetime import date, datetime
+
+from seoul_opendata.utils.uuidutils import is_uuid7, uuid7, uuid7_bound
+
+
+def test_uuid7_sorts_in_creation_order() -> None:
+    ids: list[str] = [str(uuid7()) for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_uuid7_of_a_day_is_within_its_bounds() -> None:
+    day = date(2023, 5, 17)
+    lower, upper = uuid7_bound(day), uuid7_bound(day, upper=True)
+    for at in (datetime(2023, 5, 17), datetime(2023, 5, 17, 12, 30), datetime(2023, 5, 17, 23, 59, 59, 999000)):
+        assert lower <= str(uuid7(at)) <= upper
+    assert str(uuid7(datetime(2023, 5, 16, 23, 59, 59))) < lower
+    assert str(uuid7(datetime(2023, 5, 18))) > upper
+
+
+def test_is_uuid7() -> None:
+    assert is_uuid7(str(uuid7()))
+    assert not is_uuid7("1ecec08c-f932-4044-a053-0a32095ab044")
+    assert not is_uuid7("not-a-uuid")
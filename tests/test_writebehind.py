@@ -0,0 +1,66 @@
+from threading import Event
+from typing import Any
+
+import pytest
+
+from seoul_opendata.firebase.writebehind import WriteBehindQueue
+
+
+class Recorder:
+    """Commit function recording multi-path updates, failing while `failing` is set."""
+
+    def __init__(self) -> None:
+        self.updates: list[dict[str, Any]] = []
+        self.failing: bool = False
+        self.release: Event = Event()
+        self.release.set()
+
+    def __call__(self, updates: dict[str, Any], touch: list[str]) -> None:
+        self.release.wait(5)
+        if self.failing:
+            raise OSError("unavailable")
+        self.updates.append(dict(updates))
+
+
+def test_writes_of_a_window_are_coalesced_in_order() -> None:
+    commit = Recorder()
+    queue = WriteBehindQueue(commit, window=10)
+    committed: list[int] = []
+    queue.submit({"children/a": 1}, onCommit=lambda: committed.append(1))
+    queue.submit({"children/a": 2, "children/b": 1}, onCommit=lambda: committed.append(2))
+    queue.submit({"children": {"c": 1}}, onCommit=lambda: committed.append(3))      # overlaps pending paths: next batch.
+    queue.flush(5)
+    assert commit.updates == [{"children/a": 2, "children/b": 1}, {"children": {"c": 1}}]
+    assert committed == [1, 2, 3]
+    assert (queue.committed, queue.batches, queue.failed) == (3, 2, 0)
+    queue.close()
+
+
+def test_failed_commit_fails_its_futures() -> None:
+    commit = Recorder()
+    commit.failing = True
+    queue = WriteBehindQueue(commit, window=0.01)
+    called: list[bool] = []
+    future = queue.submit({"children/a": 1}, onCommit=lambda: called.append(True))
+    with pytest.raises(OSError):
+        future.result(5)
+    assert called == []
+    assert queue.failed == 1
+    queue.close()
+
+
+def test_overlay_applies_pending_writes_on_the_node_its_ancestors_and_descendants() -> None:
+    commit = Recorder()
+    commit.release.clear()          # hold the commits, so that the writes stay pending.
+    queue = WriteBehindQueue(commit, window=0)
+    stored: dict[str, Any] = {"a": {"name": "A"}, "b": {"name": "B"}}
+    queue.submit({"children/c": {"name": "C"}, "children/a": None})
+    assert queue.overlay("children", lambda: stored) == {"b": {"name": "B"}, "c": {"name": "C"}}
+    assert stored == {"a": {"name": "A"}, "b": {"name": "B"}}      # the committed data is left as is.
+    queue.submit({"children": {"z": {"name": "Z"}}})
+    queue.submit({"children/z/name": "Z2"})
+    assert queue.overlay("children", lambda: pytest.fail("replaced by a pending write")) == {"z": {"name": "Z2"}}
+    assert queue.overlay("children/z/name", lambda: None) == "Z2"
+    assert queue.overlay("users", lambda: "committed") == "committed"
+    commit.release.set()
+    queue.close(5)